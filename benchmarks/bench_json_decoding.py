@@ -0,0 +1,45 @@
+"""
+Benchmark JSON decoders on the recorded /{region}/{item_ids} responses.
+
+Run from the repository root::
+
+    $ python benchmarks/bench_json_decoding.py
+"""
+
+import timeit
+from pathlib import Path
+
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils.decoding import JSON_DECODERS, get_json_decoder
+
+
+FIXTURES = Path('.') / 'tests' / 'mb_data_data'
+
+
+def main(repeat: int = 5, number: int = 20) -> None:
+    bodies = [path.read_bytes() for path in sorted(FIXTURES.glob('*.json'))]
+    total_bytes = sum(map(len, bodies))
+    print(f"{len(bodies)} responses, {total_bytes / 1e6:.1f} MB total")
+
+    timings: dict[str, float] = {}
+    for name in JSON_DECODERS:
+        try:
+            decode = get_json_decoder(name)
+        except UniversalisError:
+            print(f"{name:>8}: not installed")
+            continue
+
+        def _decode_all() -> None:
+            for body in bodies:
+                decode(body)
+
+        timings[name] = min(timeit.repeat(_decode_all, repeat=repeat,
+                                          number=number)) / number
+
+    for name, best in timings.items():
+        print(f"{name:>8}: {best * 1e3:8.2f} ms/pass  "
+              f"{total_bytes / best / 1e6:8.1f} MB/s  "
+              f"{timings['json'] / best:5.2f}x stdlib")
+
+if __name__ == '__main__':
+    main()
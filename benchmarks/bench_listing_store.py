@@ -0,0 +1,60 @@
+"""
+Benchmark filtering listings as dicts against a ``ListingStore``.
+
+Every listing in the recorded /{region}/{item_ids} responses is filtered for HQ
+listings below the median price, first with a list comprehension over the dicts and
+then with a ``ListingStore`` (built once, NumPy-backed if installed, and with
+:mod:`array` columns).
+
+Run from the repository root::
+
+    $ python benchmarks/bench_listing_store.py
+"""
+
+import json
+import statistics
+import timeit
+from pathlib import Path
+
+from universalisapi.api_objects.listing_store import HAS_NUMPY, ListingStore
+
+
+FIXTURES = Path('.') / 'tests' / 'mb_data_data'
+
+
+def main(repeat: int = 5, number: int = 20) -> None:
+    listings = []
+    for path in sorted(FIXTURES.glob('*.json')):
+        data = json.loads(path.read_bytes())
+        for item in data['items'].values() if 'items' in data else [data]:
+            listings.extend(item['listings'])
+    price = statistics.median(l['pricePerUnit'] for l in listings)
+    print(f"{len(listings)} listings")
+
+    def _dicts() -> None:
+        [l for l in listings if l['pricePerUnit'] < price and l['hq']]
+
+    timings = {'dicts': min(timeit.repeat(_dicts, repeat=repeat,
+                                          number=number)) / number}
+    for label, use_numpy in (('array', False), ('numpy', True)):
+        if use_numpy and not HAS_NUMPY:
+            print(f"{label:>6}: NumPy is not installed")
+            continue
+        build = min(timeit.repeat(lambda: ListingStore(listings, use_numpy=use_numpy),
+                                  repeat=repeat, number=1))
+        store = ListingStore(listings, use_numpy=use_numpy)
+
+        def _store() -> None:
+            store.filter(max_price=price, hq=True)
+
+        timings[label] = min(timeit.repeat(_store, repeat=repeat,
+                                           number=number)) / number
+        print(f"{label:>6}: built in {build * 1e3:.1f} ms")
+
+    for label, best in timings.items():
+        print(f"{label:>6}: {best * 1e3:8.3f} ms/filter  "
+              f"{timings['dicts'] / best:6.2f}x dicts")
+
+
+if __name__ == '__main__':
+    main()
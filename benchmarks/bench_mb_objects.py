@@ -0,0 +1,90 @@
+"""
+Benchmark creating ``MBDataResponseItem`` objects from the recorded
+/{region}/{item_ids} responses.
+
+Reports creation throughput, memory retained per item (including the decoded JSON,
+for as long as the item keeps it alive) and how many loggers the live items have
+registered, then the cost of a single ``best_price`` lookup on each multi-item
+``MBDataResponse`` with eager and lazy items.
+
+Run from the repository root::
+
+    $ python benchmarks/bench_mb_objects.py
+"""
+
+import gc
+import json
+import logging
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from universalisapi.api_objects.mb_data import MBDataResponse, MBDataResponseItem
+
+
+FIXTURES = Path('.') / 'tests' / 'mb_data_data'
+
+
+def _items(body: bytes) -> list[dict]:
+    data = json.loads(body)
+    return list(data['items'].values()) if 'items' in data else [data]
+
+
+def _retained(bodies: list[bytes], **kwargs) -> tuple[int, int, int]:
+    """Return (n_items, bytes retained, loggers registered) for live items."""
+    gc.collect()
+    n_loggers = len(logging.Logger.manager.loggerDict)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [MBDataResponseItem(item, **kwargs)
+            for body in bodies for item in _items(body)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (len(objs), after - before,
+            len(logging.Logger.manager.loggerDict) - n_loggers)
+
+
+def main(repeat: int = 5, number: int = 20) -> None:
+    bodies = [path.read_bytes() for path in sorted(FIXTURES.glob('*.json'))]
+    items = [item for body in bodies for item in _items(body)]
+    print(f"{len(items)} items")
+
+    for label, kwargs in (('dict', {}), ('typed', {'typed': True})):
+        try:
+            MBDataResponseItem(items[0], **kwargs)
+        except TypeError:
+            print(f"{label:>6}: not supported")
+            continue
+
+        def _create_all() -> None:
+            for item in items:
+                MBDataResponseItem(item, **kwargs)
+
+        best = min(timeit.repeat(_create_all, repeat=repeat, number=number)) / number
+        n_items, retained, n_loggers = _retained(bodies, **kwargs)
+        print(f"{label:>6}: {len(items) / best:10.0f} items/s  "
+              f"{retained / n_items:8.0f} B/item retained  "
+              f"{n_loggers:6d} loggers registered")
+
+    responses = [data for data in map(json.loads, bodies) if 'items' in data]
+    print(f"{len(responses)} multi-item responses, one best_price lookup each")
+    for label, kwargs in (('eager', {}), ('lazy', {'lazy': True})):
+        try:
+            MBDataResponse(responses[0], {}, **kwargs)
+        except TypeError:
+            print(f"{label:>6}: not supported")
+            continue
+
+        def _check_one_price() -> None:
+            for data in responses:
+                resp = MBDataResponse(data, {}, **kwargs)
+                resp.items[data['itemIDs'][0]].best_price
+
+        best = min(timeit.repeat(_check_one_price, repeat=repeat,
+                                 number=number)) / number
+        print(f"{label:>6}: {best / len(responses) * 1e6:10.1f} us/response")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark snapshot files against JSON on the recorded /{region}/{item_ids} responses.
+
+For each format, this times loading every response, looking up one item in each
+(the lazy case snapshots are built for), and decoding every response in full.
+
+Run from the repository root::
+
+    $ python benchmarks/bench_snapshot.py
+"""
+
+import json
+import tempfile
+import timeit
+from pathlib import Path
+
+from universalisapi.api_objects.mb_data import MBDataResponse
+
+
+FIXTURES = Path('.') / 'tests' / 'mb_data_data'
+
+
+def main(repeat: int = 5, number: int = 5) -> None:
+    json_paths = sorted(FIXTURES.glob('*.json'))
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_paths = []
+        for i, path in enumerate(json_paths):
+            snapshot_path = Path(tmp) / f'{i}.snap'
+            MBDataResponse(json.loads(path.read_bytes()), {}).save(snapshot_path)
+            snapshot_paths.append(snapshot_path)
+        json_bytes = sum(path.stat().st_size for path in json_paths)
+        snapshot_bytes = sum(path.stat().st_size for path in snapshot_paths)
+        print(f"{len(json_paths)} responses: {json_bytes / 1e6:.2f} MB as JSON, "
+              f"{snapshot_bytes / 1e6:.2f} MB as snapshots "
+              f"({snapshot_bytes / json_bytes:.0%})")
+
+        def _json(first_only: bool) -> None:
+            for path in json_paths:
+                response = MBDataResponse(json.loads(path.read_bytes()), {},
+                                          lazy=first_only)
+                if first_only:
+                    response.items[next(iter(response.items))].best_price
+                else:
+                    response.data
+
+        def _snapshot(first_only: bool) -> None:
+            for path in snapshot_paths:
+                response = MBDataResponse.load(path, lazy=first_only)
+                if first_only:
+                    response.items[next(iter(response.items))].best_price
+                else:
+                    response.data
+
+        for name, run in (('json', _json), ('snapshot', _snapshot)):
+            for label, first_only in (('one item', True), ('full decode', False)):
+                best = min(timeit.repeat(lambda: run(first_only), repeat=repeat,
+                                         number=number)) / number
+                print(f"{name:>8}, {label:<11}: {best * 1e3:8.2f} ms/pass")
+
+
+if __name__ == '__main__':
+    main()
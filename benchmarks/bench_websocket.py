@@ -0,0 +1,56 @@
+"""
+Load test ``UniversalisWebSocket`` against a local ``ReplayServer``.
+
+Every listing in the recorded /{region}/{item_ids} responses is replayed as a
+``listings/add`` event, several times over, and read back through a subscription,
+with one event per frame (like Universalis) and with events batched into frames.
+
+Run from the repository root::
+
+    $ python benchmarks/bench_websocket.py
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from universalisapi.utils.replay import ReplayServer
+from universalisapi.websocket import UniversalisWebSocket
+
+
+FIXTURES = Path('.') / 'tests' / 'mb_data_data'
+
+
+async def _replay(events: list[dict], batch_size: int) -> float:
+    async with ReplayServer(events, batch_size=batch_size) as server, \
+            UniversalisWebSocket(server.url) as ws:
+        subscription = await ws.subscribe('listings/add')
+        start = time.perf_counter()
+        received = 0
+        async for _ in subscription:
+            received += 1
+            if received == len(events):
+                break
+        return time.perf_counter() - start
+
+
+async def main(copies: int = 5) -> None:
+    events = []
+    for path in sorted(FIXTURES.glob('*.json')):
+        data = json.loads(path.read_bytes())
+        for item in data['items'].values() if 'items' in data else [data]:
+            events.extend({'event': 'listings/add', 'item': item['itemID'],
+                           'world': listing.get('worldID', 0),
+                           'listings': [listing]}
+                          for listing in item['listings'])
+    events *= copies
+    print(f"{len(events)} events")
+    for batch_size in (1, 10, 100):
+        elapsed = await _replay(events, batch_size)
+        print(f"{batch_size:>4} per frame: {elapsed:6.2f} s  "
+              f"{len(events) / elapsed:9.0f} events/s")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,2 +1,4 @@
 from universalisapi.client import UniversalisAPIClient
-from universalisapi.exceptions import UniversalisError
+from universalisapi.exceptions import UniversalisError, UniversalisHTTPError
+
+__all__ = ['UniversalisAPIClient', 'UniversalisError', 'UniversalisHTTPError']
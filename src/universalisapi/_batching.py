@@ -0,0 +1,139 @@
+"""Micro-batching of single-item market board lookups."""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from .api_objects.mb_data import MBDataResponse, MBDataResponseItem
+from .exceptions import UniversalisError
+from .utils.types import APIRegion
+
+if TYPE_CHECKING:
+    from ._wrapper import UniversalisAPIWrapper
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class MBDataBatcher:
+    """
+    Collects single-item lookups for one region and set of params into one request.
+
+    Lookups are held for up to `window` seconds, or until `max_batch` distinct
+    item IDs are waiting, and are then sent as a single /``region``/``item_ids``
+    request. Each caller receives the ``MBDataResponseItem`` for its own item.
+
+    Parameters
+    ----------
+    client : UniversalisAPIWrapper
+        The client to send batched requests through.
+    region : APIRegion
+    params : dict
+        Keyword arguments for ``UniversalisAPIWrapper._get_mb_current_data`` (e.g.
+        ``listings`` or ``hq``), shared by every lookup in this batcher.
+    window : float, optional
+        Seconds to wait for more lookups after the first one arrives. Defaults to
+        0.005.
+    max_batch : int, optional
+        Number of distinct item IDs that triggers an immediate request. Defaults to
+        ``UniversalisAPIWrapper.max_items_per_request``.
+    on_idle : Callable[[], object] or None, optional
+        Called whenever a batch has been fetched and no lookups are waiting, e.g. to
+        discard the batcher. Defaults to ``None``.
+    """
+
+    _MBDataBatcher_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, client: 'UniversalisAPIWrapper', region: APIRegion,
+                 params: dict, *, window: float = 0.005,
+                 max_batch: int | None = None,
+                 on_idle: Callable[[], object] | None = None) -> None:
+        self.client = client
+        self.region = region
+        self.params = params
+        self.window = window
+        self.max_batch = (client.max_items_per_request if max_batch is None
+                          else max_batch)
+        self._pending: dict[int, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._on_idle = on_idle
+
+    @property
+    def idle(self) -> bool:
+        """Whether no lookups are waiting or being fetched."""
+        return not self._pending and not self._tasks
+
+    async def load(self, item_id: int) -> MBDataResponseItem:
+        """
+        Queue a lookup of `item_id` and wait for its batch to be fetched.
+
+        Parameters
+        ----------
+        item_id : int
+
+        Returns
+        -------
+        MBDataResponseItem
+
+        Raises
+        ------
+        UniversalisError
+            If the batch request failed, or Universalis has no data for `item_id`.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(item_id, []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self.dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.dispatch)
+        return await future
+
+    def dispatch(self) -> None:
+        """Send the lookups collected so far without waiting for the window."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._MBDataBatcher_logger.debug("Dispatching batch",
+                                         extra={'region': self.region,
+                                                'n_items': len(batch)})
+        task = asyncio.ensure_future(self._fetch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._fetched)
+
+    def _fetched(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._on_idle is not None and self.idle:
+            self._on_idle()
+
+    async def _fetch(self, batch: dict[int, list[asyncio.Future]]) -> None:
+        """Fetch `batch` and resolve each of its futures."""
+        item_ids = list(batch)
+        try:
+            data = await self.client._get_mb_current_data(
+                item_ids, self.region, **self.params)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        params = {'item_ids': item_ids, 'region': self.region} | self.params
+        resp = MBDataResponse(data, params, client=self.client)
+        for item_id, futures in batch.items():
+            item = resp.items.get(item_id)
+            for future in futures:
+                if future.done():
+                    # the caller gave up waiting
+                    continue
+                if item is None:
+                    future.set_exception(UniversalisError(
+                        f"No market board data for item {item_id} in "
+                        f"{self.region}"))
+                else:
+                    future.set_result(item)
@@ -1,10 +1,18 @@
+import asyncio
 import logging
-from typing import cast
+import time
+from types import TracebackType
+from collections.abc import Coroutine
+from typing import Any, Self, cast
 
 import aiohttp
 
-from .exceptions import UniversalisError
+from .exceptions import UniversalisError, UniversalisHTTPError
 from universalisapi.utils.enums import Region, DataCenter, World
+from .utils.cache import DiskCache, ResponseCache, canonical_request_key
+from .utils.decoding import JSONDecoder, get_json_decoder
+from .utils.rate_limit import RateLimiter
+from .utils.retry import RetryPolicy, RetryStats, parse_retry_after
 from .utils.types import APIRegion
 
 
@@ -12,6 +20,16 @@ from .utils.types import APIRegion
 module_logger = logging.getLogger(__name__)
 
 
+class _InFlightRequest:
+    """A request shared by every caller waiting on the same canonical key."""
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
 class UniversalisAPIWrapper:
     """
     Wrapper class for UniversalisAPI Objects.
@@ -19,22 +37,77 @@ class UniversalisAPIWrapper:
     Generally deals with raw JSON responses rather than more abstracted objects.
     Also handles management of :any:`aiohttp.ClientSession` objects.
 
+    The wrapper owns a single long-lived ``ClientSession`` backed by a pooled
+    :any:`aiohttp.TCPConnector`, so connections (and their TLS handshakes) are reused
+    across requests. The session is closed by :meth:`close`, or on exit when the
+    wrapper is used as an async context manager.
+
     Parameters
     ----------
     session : aiohttp.ClientSession or None, optional
-        A `ClientSession` object to use for handling requests.
+        A `ClientSession` object to use for handling requests. A session passed in
+        here is never closed by the wrapper, and the connection pool options below
+        are ignored.
+    connection_limit : int, optional
+        Total number of simultaneous connections in the pool. Defaults to 100.
+    connection_limit_per_host : int, optional
+        Number of simultaneous connections to a single host. ``0`` means no per-host
+        limit. Defaults to 8, Universalis' limit of simultaneous connections per IP.
+    keepalive_timeout : float, optional
+        Seconds an idle connection is kept open for reuse. Defaults to 30.
+    dns_cache_ttl : int or None, optional
+        Seconds to cache DNS lookups for. ``None`` caches forever. Defaults to 300.
+    warm_up_connections : int, optional
+        Number of connections to open ahead of time in :meth:`start`. Defaults to 0.
+    max_concurrent_requests : int, optional
+        Maximum number of chunk requests a single multi-chunk call (e.g.
+        ``_get_mb_current_data`` with more than 100 IDs) keeps in flight. Defaults
+        to 8.
+    requests_per_second : float or None, optional
+        Sustained request rate allowed by the client-wide rate limiter. ``None``
+        disables rate limiting. Defaults to 25, Universalis' published limit.
+    burst : int, optional
+        Number of requests the rate limiter lets through at once after a quiet
+        period. Defaults to 50, Universalis' published burst limit.
+    retry_policy : RetryPolicy or None, optional
+        How to retry failed requests (e.g. 429, 502 or 503 responses, or connection
+        errors). ``None`` disables retrying. Defaults to ``RetryPolicy()``.
+    cache : ResponseCache or None, optional
+        An in-memory cache of responses from ``get_endpoint``. Defaults to ``None``
+        (no caching).
+    disk_cache : DiskCache or None, optional
+        A persistent cache checked after `cache` and before sending a request.
+        Defaults to ``None``.
+    json_decoder : str or JSONDecoder, optional
+        The function used to decode response bodies, or the name of one for
+        ``get_json_decoder``. Defaults to ``'auto'``, which uses orjson or msgspec
+        if either is installed and the standard library otherwise.
 
     Attributes
     ----------
     base_url : str
         The base URL for UniversalisAPI.app
+    max_items_per_request : int
+        The maximum number of item IDs Universalis accepts in a single request
     valid_fields : list[str]
         A list of valid fields to pass to ``UniversalisAPIClient.get_mb_current_data``
     valid_regions : list[str]
         A list of valid regions to request data for
+    rate_limiter : RateLimiter or None
+        The token bucket every request through ``get_endpoint`` waits on. May be
+        replaced to share one limiter between several clients.
+    retry_stats : RetryStats
+        Per-status counts of retried and given-up requests.
+    cache : ResponseCache or None
+        The in-memory response cache, if any.
+    disk_cache : DiskCache or None
+        The persistent response cache, if any.
+    json_loads : JSONDecoder
+        The function used to decode response bodies.
     """
 
     base_url = "https://universalis.app/api/v2"
+    max_items_per_request = 100
     valid_fields = [
         'itemID',
         'lastUploadTime',
@@ -74,8 +147,42 @@ class UniversalisAPIWrapper:
     ]
     _UniversalisAPIWrapper_logger = module_logger.getChild(__qualname__)
 
-    def __init__(self, *, session: aiohttp.ClientSession | None = None) -> None:
+    def __init__(self, *, session: aiohttp.ClientSession | None = None,
+                 connection_limit: int = 100,
+                 connection_limit_per_host: int = 8,
+                 keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int | None = 300,
+                 warm_up_connections: int = 0,
+                 max_concurrent_requests: int = 8,
+                 requests_per_second: float | None = 25.0,
+                 burst: int = 50,
+                 retry_policy: RetryPolicy | None = RetryPolicy(),
+                 cache: ResponseCache | None = None,
+                 disk_cache: DiskCache | None = None,
+                 json_decoder: str | JSONDecoder = 'auto') -> None:
         self._session = session
+        # sessions handed to us belong to the caller, so never close them
+        self._owns_session = session is None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.warm_up_connections = warm_up_connections
+        self.max_concurrent_requests = max_concurrent_requests
+        self.rate_limiter: RateLimiter | None = None
+        if requests_per_second is not None:
+            self.rate_limiter = RateLimiter(requests_per_second, burst)
+        self.retry_policy = retry_policy
+        self.retry_stats = RetryStats()
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.json_loads = (get_json_decoder(json_decoder)
+                           if isinstance(json_decoder, str) else json_decoder)
+        # background stale-while-revalidate refreshes, keyed on request key
+        self._revalidations: dict[str, asyncio.Task] = {}
+        # single-flight requests, keyed on request key
+        self._in_flight: dict[str, _InFlightRequest] = {}
         # instance logger
         self._instance_logger = self._UniversalisAPIWrapper_logger.getChild(
             str(id(self)))
@@ -85,15 +192,84 @@ class UniversalisAPIWrapper:
         """
         Retrieve the ``aiohttp.ClientSession`` object for this Wrapper.
 
+        The session is created on first use and then reused for every request. A
+        session that was closed, or that belongs to an event loop other than the
+        running one, is replaced.
+
         Returns
         -------
         session : aiohttp.ClientSession
         """
-        if self._session is None or self._session.closed:
+        if not self._owns_session and self._session is not None:
+            return self._session
+        loop = asyncio.get_running_loop()
+        if (self._session is None or self._session.closed
+                or self._session_loop is not loop):
+            if self._session is not None and not self._session.closed:
+                # the session's loop is gone, so it can't be closed normally
+                self._session.detach()
             self._instance_logger.debug("Creating new aiohttp ClientSession object")
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
         return self._session
 
+    async def start(self) -> None:
+        """
+        Create the connection pool and open ``warm_up_connections`` connections.
+
+        Warm-up requests are fire-and-forget: their status codes are ignored, and
+        failures are logged rather than raised.
+        """
+        session = self.session
+        if self.warm_up_connections <= 0:
+            return
+        self._instance_logger.debug("Warming up connection pool",
+                                    extra={'connections': self.warm_up_connections})
+        results = await asyncio.gather(
+            *(self._warm_up_connection(session)
+              for _ in range(self.warm_up_connections)),
+            return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self._instance_logger.warning("Connection warm-up failed",
+                                              extra={'error': result})
+
+    async def _warm_up_connection(self, session: aiohttp.ClientSession) -> None:
+        """Open a single pooled connection to `base_url`."""
+        async with session.head(self.base_url + '/data-centers'):
+            pass
+
+    async def close(self) -> None:
+        """
+        Close this wrapper's ``ClientSession`` if the wrapper created it.
+
+        Background cache refreshes that are still running are cancelled.
+        """
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        self._revalidations.clear()
+        if self._owns_session and self._session is not None:
+            if not self._session.closed:
+                self._instance_logger.debug("Closing aiohttp ClientSession object")
+                await self._session.close()
+            self._session = None
+            self._session_loop = None
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None,
+                        exc: BaseException | None,
+                        tb: TracebackType | None) -> None:
+        await self.close()
+
     async def _process_response(self, response: aiohttp.ClientResponse) -> None:
         """
         Raise an error if response code is not 200.
@@ -105,68 +281,228 @@ class UniversalisAPIWrapper:
 
         Raises
         ------
-        UniversalisError
+        UniversalisHTTPError
             If a non-200 code is received.
         """
         if response.status == 400:
             self._instance_logger.warning("Error code 400")
-            raise UniversalisError(f"Invalid parameters (code 400): {response.url}")
+            raise UniversalisHTTPError(
+                f"Invalid parameters (code 400): {response.url}", status=400)
         elif response.status == 404:
             self._instance_logger.warning("Error code 404")
-            raise UniversalisError(
+            raise UniversalisHTTPError(
                 f"World/DC/Region or requested item is invalid (code 404): "
-                f"{response.url}")
+                f"{response.url}", status=404)
         elif response.status != 200:
             self._instance_logger.warning("Non-200 response code received",
                                           extra={'response_code': response.status})
-            raise UniversalisError(f"{response.status} code received: {response.url}")
+            raise UniversalisHTTPError(
+                f"{response.status} code received: {response.url}",
+                status=response.status,
+                retry_after=parse_retry_after(response.headers.get('Retry-After')))
         else:
             self._instance_logger.info("200 code received, processing complete")
             return
 
     async def get_endpoint(self, endpoint: str, *,
-                           params: dict | None = None) -> dict | list[dict]:
+                           params: dict | None = None,
+                           raw: bool = False) -> dict | list[dict] | bytes:
         """
         Retrieve data from the given Universalis API endpoint as JSON.
 
+        If a ``cache`` is set, fresh cached responses are returned without a
+        request; stale ones within the cache's ``stale_while_revalidate`` window are
+        returned immediately while a fresh copy is fetched in the background.
+        Next, a fresh response in ``disk_cache`` (if set) is used. Otherwise, waits
+        on ``rate_limiter`` (if set) before each attempt, and
+        retries failed attempts according to ``retry_policy``.
+
+        Concurrent calls for the same canonical request share a single request:
+        only the first sends it, and the rest await its response.
+
         Parameters
         ----------
         endpoint : str
             The endpoint (relative to `base_url`) to get
         params : dict[str, str], optional
             A dictionary of parameters to be passed to the `get` request
+        raw : bool, optional
+            Return the undecoded response body, so decoding can be deferred,
+            offloaded or skipped. Defaults to False.
 
         Returns
         -------
-        response_data : dict or list
-            The JSON from the endpoint (as a dict or list)
+        response_data : dict or list or bytes
+            The JSON from the endpoint (as a dict or list), or its raw body if `raw`
 
         Raises
         ------
         UniversalisError
-            If response object could not be read as JSON
+            If response object could not be read as JSON, or a non-200 code was
+            received on the last attempt.
         """
         #generate full url
         url = self.base_url + endpoint
         if params is None:
             params = {}
-        self._instance_logger.debug("Sending endpoint request",
-                                    extra={'url': url, 'params': params})
-        async with self.session as session:
-            async with session.get(url, params=params) as response:
-                self._instance_logger.debug("Response created, processing object")
-                await self._process_response(response)
-                # try to get the data
-                try:
-                    data = await response.json()
-                except aiohttp.ContentTypeError as e:
-                    self._instance_logger.warning(
-                        "JSON data expected, but not received",
-                        extra={'content-type': response.content_type,
-                               'error': e})
-                    raise UniversalisError(e)
-                else:
-                    return data
+        key = canonical_request_key(endpoint, params)
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._instance_logger.debug("Using cached response",
+                                            extra={'key': key, 'fresh': entry.fresh})
+                if not entry.fresh:
+                    self._revalidate(key, endpoint, url, params)
+                return entry.body if raw else self._decode(entry.body)
+        body = await self._shared_request(key, endpoint, url, params)
+        return body if raw else self._decode(body)
+
+    async def _shared_request(self, key: str, endpoint: str, url: str,
+                              params: dict) -> bytes:
+        """
+        Fetch `url`, joining an identical request that is already in flight.
+
+        The request runs in its own task, so a caller that is cancelled doesn't
+        cancel it for the others. It is only cancelled once every caller has given
+        up on it.
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            self._instance_logger.debug("Sending endpoint request",
+                                        extra={'url': url, 'params': params})
+            in_flight = _InFlightRequest(asyncio.ensure_future(
+                self._fetch_and_store(key, endpoint, url, params)))
+            self._in_flight[key] = in_flight
+
+            def _done(_: asyncio.Task) -> None:
+                if self._in_flight.get(key) is in_flight:
+                    del self._in_flight[key]
+
+            in_flight.task.add_done_callback(_done)
+        else:
+            self._instance_logger.debug("Joining in-flight request",
+                                        extra={'key': key})
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                in_flight.task.cancel()
+                # don't let a new caller join a request that is being cancelled
+                if self._in_flight.get(key) is in_flight:
+                    del self._in_flight[key]
+
+    async def _fetch_and_store(self, key: str, endpoint: str, url: str,
+                               params: dict) -> bytes:
+        """Fetch `url` from ``disk_cache`` or the API, and cache the body."""
+        if self.disk_cache is not None:
+            entry = await asyncio.to_thread(self.disk_cache.get, key, endpoint)
+            if entry is not None:
+                self._instance_logger.debug("Using response from disk cache",
+                                            extra={'key': key})
+                if self.cache is not None:
+                    self.cache.set(key, entry.body, endpoint, age=entry.age)
+                return entry.body
+        body = await self._request_with_retries(url, params)
+        if self.cache is not None:
+            self.cache.set(key, body, endpoint)
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self.disk_cache.set, key, body)
+        return body
+
+    def _decode(self, body: bytes) -> dict | list[dict]:
+        """
+        Decode a JSON response body.
+
+        Raises
+        ------
+        UniversalisError
+            If `body` is not valid JSON.
+        """
+        try:
+            return self.json_loads(body)
+        except ValueError as e:
+            self._instance_logger.warning("Could not decode JSON response",
+                                          extra={'error': e})
+            raise UniversalisError(e)
+
+    def _revalidate(self, key: str, endpoint: str, url: str, params: dict) -> None:
+        """Refresh the cached response for `key` in the background."""
+        if key in self._revalidations:
+            return
+
+        async def _refresh() -> None:
+            try:
+                await self._shared_request(key, endpoint, url, params)
+            except Exception as e:
+                self._instance_logger.warning("Background revalidation failed",
+                                              extra={'key': key, 'error': e})
+            finally:
+                self._revalidations.pop(key, None)
+
+        self._revalidations[key] = asyncio.ensure_future(_refresh())
+
+    def _retry_delay(self, error: Exception, attempt: int,
+                     started: float) -> float | None:
+        """
+        Return how long to wait before retrying after `error`, or ``None``.
+
+        Also records the retry (or the decision to give up) in ``retry_stats``.
+        """
+        if isinstance(error, UniversalisHTTPError):
+            key: int | str = error.status
+            retryable = (self.retry_policy is not None
+                         and error.status in self.retry_policy.retry_statuses)
+            retry_after = error.retry_after
+        else:
+            key = type(error).__name__
+            retryable = (self.retry_policy is not None
+                         and self.retry_policy.retry_connection_errors)
+            retry_after = None
+        if not retryable:
+            return None
+        delay = cast(RetryPolicy, self.retry_policy).next_delay(
+            attempt, time.monotonic() - started, retry_after=retry_after)
+        if delay is None:
+            self.retry_stats.exhausted[key] += 1
+        else:
+            self.retry_stats.retries[key] += 1
+            self.retry_stats.total_delay += delay
+        return delay
+
+    async def _request_with_retries(self, url: str, params: dict) -> bytes:
+        """Send a GET to `url`, retrying according to ``retry_policy``."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await self._request(url, params)
+            except (UniversalisHTTPError, aiohttp.ClientConnectionError,
+                    TimeoutError) as e:
+                delay = self._retry_delay(e, attempt, started)
+                if delay is None:
+                    raise
+                self._instance_logger.info("Retrying request",
+                                           extra={'url': url, 'attempt': attempt,
+                                                  'delay': delay, 'error': e})
+                await asyncio.sleep(delay)
+
+    async def _request(self, url: str, params: dict) -> bytes:
+        """Send a single GET to `url` and return its JSON body."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        async with self.session.get(url, params=params) as response:
+            self._instance_logger.debug("Response created, processing object")
+            await self._process_response(response)
+            if 'json' not in response.content_type:
+                self._instance_logger.warning(
+                    "JSON data expected, but not received",
+                    extra={'content-type': response.content_type})
+                raise UniversalisError(
+                    f"Expected JSON, received {response.content_type}: {response.url}")
+            return await response.read()
 
     def _check_region_name(self, region: str) -> None:
         """
@@ -184,6 +520,124 @@ class UniversalisAPIWrapper:
         else:
             return
 
+    @classmethod
+    def _chunk_item_ids(cls, item_ids: list[int]) -> list[list[int]]:
+        """
+        Dedupe `item_ids` and split them into request-sized chunks.
+
+        Chunks are balanced (e.g. 101 IDs become chunks of 51 and 50) so that a
+        multi-item request never degrades into a single-item one, which Universalis
+        answers with a differently shaped response.
+
+        Parameters
+        ----------
+        item_ids : list[int]
+
+        Returns
+        -------
+        list[list[int]]
+            Chunks of at most ``max_items_per_request`` unique IDs, in their original
+            order.
+        """
+        unique_ids = list(dict.fromkeys(item_ids))
+        if not unique_ids:
+            return []
+        n_chunks = -(-len(unique_ids) // cls.max_items_per_request)
+        size, extra = divmod(len(unique_ids), n_chunks)
+        chunks = []
+        start = 0
+        for i in range(n_chunks):
+            end = start + size + (1 if i < extra else 0)
+            chunks.append(unique_ids[start:end])
+            start = end
+        return chunks
+
+    async def _gather_bounded[T](self, coros: list[Coroutine[Any, Any, T]]) -> list[T]:
+        """
+        Await `coros` concurrently, at most ``max_concurrent_requests`` at a time.
+
+        If any of them fails, the rest are cancelled and the error is re-raised.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def _bounded(coro: Coroutine[Any, Any, T]) -> T:
+            try:
+                async with semaphore:
+                    return await coro
+            finally:
+                # no-op once awaited; avoids never-awaited warnings on cancellation
+                coro.close()
+
+        tasks = [asyncio.ensure_future(_bounded(coro)) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @staticmethod
+    def _mb_data_params(*, listings: int | None = None,
+                        entries: int | None = None,
+                        hq: bool | None = None,
+                        stats_within: int | None = None,
+                        entries_within: int | None = None,
+                        fields: list[str] | None = None) -> dict[str, str | int]:
+        """Build the query parameters for a /``region``/``item_ids`` request."""
+        params: dict[str, str | int] = {}
+        if listings is not None:
+            params['listings'] = listings
+        if entries is not None:
+            params['entries'] = entries
+        if hq is not None:
+            params['hq'] = str(hq).lower()
+        if stats_within is not None:
+            params['statsWithin'] = stats_within
+        if entries_within is not None:
+            params['entriesWithin'] = entries_within
+        if fields is not None:
+            params['fields'] = ','.join(fields)
+        return params
+
+    @staticmethod
+    def _merge_mb_data(chunks: list[list[int]], responses: list[dict]) -> dict:
+        """
+        Merge several /``region``/``item_ids`` responses into one multi-item response.
+
+        Parameters
+        ----------
+        chunks : list[list[int]]
+            The item IDs requested for each response.
+        responses : list[dict]
+            The responses, in the same order as `chunks`.
+
+        Returns
+        -------
+        dict
+            A response in the multi-item format, with the ``items`` and
+            ``unresolvedItems`` of every chunk combined.
+        """
+        merged: dict = {}
+        items: dict[str, dict] = {}
+        unresolved: list[int] = []
+        for chunk, resp in zip(chunks, responses):
+            if 'items' in resp:
+                items.update(resp['items'])
+                unresolved.extend(resp.get('unresolvedItems') or [])
+                extra = {k: v for k, v in resp.items()
+                         if k not in ('itemIDs', 'items', 'unresolvedItems')}
+            else:
+                # single-item response: the item data is the response itself
+                items[str(resp.get('itemID', chunk[0]))] = resp
+                extra = {k: resp[k] for k in ('worldID', 'worldName', 'dcName',
+                                              'regionName') if k in resp}
+            for k, v in extra.items():
+                merged.setdefault(k, v)
+        merged['itemIDs'] = [item_id for chunk in chunks for item_id in chunk]
+        merged['items'] = items
+        merged['unresolvedItems'] = unresolved
+        return merged
+
     async def _get_mb_current_data(self,
                                    item_ids: list[int],
                                    region: APIRegion, *,
@@ -196,12 +650,15 @@ class UniversalisAPIWrapper:
         """
         Retrieve the data at /``region``/``item_ids``.
 
+        Duplicate IDs are dropped. Universalis' API disallows lists longer than 100
+        items, so longer lists are split into chunks that are fetched concurrently
+        (at most ``max_concurrent_requests`` at a time) and merged into a single
+        multi-item response.
+
         Parameters
         ----------
         item_ids : list[int]
             A list of item IDs for which to retrieve Market Board data.
-            Universalis' API disallows lists longer than 100 items, so this list
-            will be auot-sliced at item 100
         region : str
             An APIRegion
 
@@ -218,22 +675,55 @@ class UniversalisAPIWrapper:
         entries_within : int, optional
         fields : list[str], optional
         """
-        self._instance_logger.debug("Capping item_ids at 100")
-        item_ids = item_ids[:100]
-        endpoint = f'/{region}/{",".join(map(str, item_ids))}'
-        params: dict[str, str | int] = {}
-        if listings is not None:
-            params['listings'] = listings
-        if entries is not None:
-            params['entries'] = entries
-        if hq is not None:
-            params['hq'] = str(hq).lower()
-        if stats_within is not None:
-            params['statsWithin'] = stats_within
-        if entries_within is not None:
-            params['entriesWithin'] = entries_within
-        if fields is not None:
-            params['fields'] = ','.join(fields)
+        params = self._mb_data_params(
+            listings=listings, entries=entries, hq=hq, stats_within=stats_within,
+            entries_within=entries_within, fields=fields)
+        chunks = self._chunk_item_ids(item_ids)
+        if len(chunks) <= 1:
+            endpoint = f'/{region}/{",".join(map(str, chunks[0] if chunks else []))}'
+            resp = cast(dict, await self.get_endpoint(endpoint, params=params))
+            return resp
+
+        self._instance_logger.debug("Splitting item_ids into chunks",
+                                    extra={'n_items': sum(map(len, chunks)),
+                                           'n_chunks': len(chunks)})
+        responses = await self._gather_bounded([
+            self.get_endpoint(f'/{region}/{",".join(map(str, chunk))}', params=params)
+            for chunk in chunks
+        ])
+        return self._merge_mb_data(chunks, cast(list[dict], responses))
+
+    async def _get_aggregated_data(self, item_ids: list[int],
+                                   region: APIRegion) -> dict:
+        """
+        Retrieve the data at /aggregated/``region``/``item_ids``.
+
+        Like ``_get_mb_current_data``, duplicate IDs are dropped and lists longer
+        than 100 items are fetched in concurrent chunks, whose ``results`` and
+        ``failedItems`` are concatenated.
+
+        Parameters
+        ----------
+        item_ids : list[int]
+        region : str
+            An APIRegion
+
+        Returns
+        -------
+        dict
+        """
+        chunks = self._chunk_item_ids(item_ids)
+        endpoints = [f'/aggregated/{region}/{",".join(map(str, chunk))}'
+                     for chunk in chunks or [[]]]
+        if len(endpoints) == 1:
+            return cast(dict, await self.get_endpoint(endpoints[0]))
 
-        resp = cast(dict, await self.get_endpoint(endpoint, params=params))
-        return resp
+        self._instance_logger.debug("Splitting item_ids into chunks",
+                                    extra={'n_items': sum(map(len, chunks)),
+                                           'n_chunks': len(chunks)})
+        responses = cast(list[dict], await self._gather_bounded(
+            [self.get_endpoint(endpoint) for endpoint in endpoints]))
+        return {'results': [result for resp in responses
+                            for result in resp.get('results') or ()],
+                'failedItems': [item_id for resp in responses
+                                for item_id in resp.get('failedItems') or ()]}
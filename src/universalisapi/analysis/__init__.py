@@ -0,0 +1 @@
+"""Analyses built on market board data."""
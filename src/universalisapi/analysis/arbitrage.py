@@ -0,0 +1,265 @@
+"""Cross-world price comparison from a single DC- or region-level response."""
+
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby, repeat
+from operator import attrgetter, itemgetter
+from typing import cast
+
+from ..api_objects.mb_data import MBDataResponse
+from ..exceptions import UniversalisError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+module_logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class WorldQuote:
+    """
+    The listings for one item on one world.
+
+    Attributes
+    ----------
+    item_id : int
+    world_id : int
+    world_name : str or None
+    min_price : int
+        The lowest ``pricePerUnit``.
+    median_price : float
+        The median ``pricePerUnit`` over the listings.
+    depth : int
+        The number of units for sale.
+    listings : int
+        The number of listings.
+    upload_time : datetime or None
+        When the world's data was last uploaded, from the item's
+        ``world_upload_times``.
+    age : float or None
+        Seconds between `upload_time` and when the quote was made.
+    """
+
+    item_id: int
+    world_id: int
+    world_name: str | None
+    min_price: int
+    median_price: float
+    depth: int
+    listings: int
+    upload_time: datetime | None
+    age: float | None
+
+
+@dataclass(slots=True, frozen=True)
+class Spread:
+    """
+    The gap between the cheapest world and the most expensive world for an item.
+
+    Attributes
+    ----------
+    item_id : int
+    buy : WorldQuote
+        The world with the lowest ``min_price``.
+    sell : WorldQuote
+        The world with the highest ``min_price``.
+    """
+
+    item_id: int
+    buy: WorldQuote
+    sell: WorldQuote
+
+    @property
+    def spread(self) -> int:
+        """`sell`'s ``min_price`` minus `buy`'s."""
+        return self.sell.min_price - self.buy.min_price
+
+    @property
+    def ratio(self) -> float:
+        """`spread` as a fraction of `buy`'s ``min_price``."""
+        return self.spread / self.buy.min_price if self.buy.min_price else 0.0
+
+
+class ArbitrageEngine:
+    """
+    Per-world quotes and cross-world spreads for every item in a response.
+
+    Listings from a DC- or region-level request carry their world, so one request
+    is enough to compare every world in it. All listings of all items are grouped by
+    item and world in one pass; with NumPy installed this is a single sort and a few
+    vectorized reductions.
+
+    Parameters
+    ----------
+    response : MBDataResponse
+        A response for a data center or region, not a single world.
+    hq : bool or None, optional
+        Only quote HQ (``True``) or NQ (``False``) listings. Defaults to ``None``,
+        i.e. all listings.
+    use_numpy : bool or None, optional
+        Whether to group with NumPy. Defaults to ``None``, which uses NumPy if it is
+        installed.
+    now : float or None, optional
+        The time to measure each quote's ``age`` from, in seconds since the epoch.
+        Defaults to ``None``, i.e. the current time.
+
+    Attributes
+    ----------
+    quotes : dict[int, dict[int, WorldQuote]]
+        Mapping of item ID -> world ID -> quote. Items and worlds without listings
+        are left out.
+
+    Raises
+    ------
+    UniversalisError
+        If the response's listings have no world, i.e. it is for a single world, or
+        NumPy is requested but not installed.
+
+    Examples
+    --------
+    >>> engine = ArbitrageEngine(resp, hq=True)
+    >>> for spread in engine.spreads(min_depth=5, max_age=3600, limit=10):
+    ...     print(spread.item_id, spread.buy.world_name, spread.sell.world_name,
+    ...           spread.spread)
+    """
+
+    _ArbitrageEngine_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, response: MBDataResponse, *, hq: bool | None = None,
+                 use_numpy: bool | None = None, now: float | None = None) -> None:
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise UniversalisError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self.now = time.time() if now is None else now
+        self.quotes: dict[int, dict[int, WorldQuote]] = {}
+
+        self._world_names: dict[int, str | None] = {}
+        self._upload_times: dict[int, dict[int, datetime]] = {}
+        columns = self._columns(response, hq)
+        groups = self._group_numpy(*columns) if use_numpy else self._group(*columns)
+        self._add_quotes(groups)
+        self._ArbitrageEngine_logger.debug("Quoted items",
+                                           extra={'items': len(self.quotes),
+                                                  'listings': len(columns[0])})
+
+    def _columns(self, response: MBDataResponse,
+                 hq: bool | None) -> tuple[array, array, array, array]:
+        """Return the item ID, world ID, price and quantity of every listing."""
+        item_ids, world_ids, prices, quantities = (array('q') for _ in range(4))
+        for item_id, item in response.items.items():
+            self._upload_times[item_id] = item.world_upload_times
+            listings = item.listings or ()
+            if hq is not None:
+                listings = [listing for listing in listings if listing['hq'] == hq]
+            maybe_world_ids = [listing.get('worldID') for listing in listings]
+            if None in maybe_world_ids:
+                raise UniversalisError("Listings have no world; use a DC- or "
+                                       "region-level response")
+            item_world_ids = cast(list[int], maybe_world_ids)
+            for world_id in set(item_world_ids).difference(self._world_names):
+                listing = listings[item_world_ids.index(world_id)]
+                self._world_names[world_id] = listing.get('worldName')
+            item_ids.extend(repeat(item_id, len(item_world_ids)))
+            world_ids.extend(item_world_ids)
+            prices.extend(map(_get_price, listings))
+            quantities.extend(map(_get_quantity, listings))
+        return item_ids, world_ids, prices, quantities
+
+    @staticmethod
+    def _group(item_ids: array, world_ids: array, prices: array,
+               quantities: array) -> list[tuple]:
+        """
+        Group listings by item and world.
+
+        Returns (item ID, world ID, min price, median price, depth, count) per group.
+        """
+        rows = sorted(zip(item_ids, world_ids, prices, quantities))
+        groups = []
+        for (item_id, world_id), group in groupby(rows, key=itemgetter(0, 1)):
+            members = list(group)
+            n = len(members)
+            median = (members[(n - 1) // 2][2] + members[n // 2][2]) / 2
+            groups.append((item_id, world_id, members[0][2], median,
+                           sum(row[3] for row in members), n))
+        return groups
+
+    @staticmethod
+    def _group_numpy(item_ids: array, world_ids: array, prices: array,
+                     quantities: array) -> list[tuple]:
+        """``_group`` with NumPy."""
+        if not item_ids:
+            return []
+        items, worlds, unit_prices, units = (
+            np.frombuffer(column, dtype='int64')
+            for column in (item_ids, world_ids, prices, quantities))
+        order = np.lexsort((unit_prices, worlds, items))
+        items, worlds, unit_prices, units = (
+            column[order] for column in (items, worlds, unit_prices, units))
+
+        new_group = np.empty(len(order), dtype=bool)
+        new_group[0] = True
+        new_group[1:] = (items[1:] != items[:-1]) | (worlds[1:] != worlds[:-1])
+        starts = np.flatnonzero(new_group)
+        counts = np.diff(np.append(starts, len(order)))
+        lower = unit_prices[starts + (counts - 1) // 2]
+        medians = (lower + unit_prices[starts + counts // 2]) / 2
+        depths = np.add.reduceat(units, starts)
+        return list(zip(items[starts].tolist(), worlds[starts].tolist(),
+                        unit_prices[starts].tolist(), medians.tolist(),
+                        depths.tolist(), counts.tolist()))
+
+    def _add_quotes(self, groups: list[tuple]) -> None:
+        for item_id, world_id, min_price, median, depth, count in groups:
+            upload_time = self._upload_times[item_id].get(world_id)
+            age = None if upload_time is None else self.now - upload_time.timestamp()
+            self.quotes.setdefault(item_id, {})[world_id] = WorldQuote(
+                item_id=item_id, world_id=world_id,
+                world_name=self._world_names[world_id], min_price=min_price,
+                median_price=median, depth=depth, listings=count,
+                upload_time=upload_time, age=age)
+
+    def spreads(self, *, min_depth: int = 1, max_age: float | None = None,
+                limit: int | None = None) -> list[Spread]:
+        """
+        Rank items by the spread between their cheapest and most expensive world.
+
+        Parameters
+        ----------
+        min_depth : int, optional
+            Ignore worlds with fewer units than this for sale. Defaults to 1.
+        max_age : float or None, optional
+            Ignore worlds whose data is older than this many seconds, or of unknown
+            age. Defaults to ``None``, i.e. any age.
+        limit : int or None, optional
+            Return at most this many spreads. Defaults to ``None``, i.e. all.
+
+        Returns
+        -------
+        list[Spread]
+            Widest spread first. Items quoted on fewer than two worlds are left out.
+        """
+        spreads = []
+        for item_id, world_quotes in self.quotes.items():
+            eligible = [quote for quote in world_quotes.values()
+                        if quote.depth >= min_depth
+                        and (max_age is None
+                             or quote.age is not None and quote.age <= max_age)]
+            if len(eligible) < 2:
+                continue
+            spreads.append(Spread(item_id, min(eligible, key=_min_price),
+                                  max(eligible, key=_min_price)))
+        spreads.sort(key=lambda s: s.spread, reverse=True)
+        return spreads if limit is None else spreads[:limit]
+
+
+_get_price = itemgetter('pricePerUnit')
+_get_quantity = itemgetter('quantity')
+_min_price = attrgetter('min_price')
@@ -0,0 +1,261 @@
+"""Cheapest-purchase planning over an item's market board listings."""
+
+import heapq
+import logging
+from array import array
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..api_objects.mb_data import MBDataResponseItem
+from ..api_objects.price_index import PriceIndex
+from ..exceptions import UniversalisError
+
+
+module_logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PurchasePlan:
+    """
+    A set of listings to buy.
+
+    Listings can only be bought whole, so `quantity` may exceed what was asked for.
+
+    Attributes
+    ----------
+    listings : list
+        The listings to buy, cheapest per unit first.
+    requested : int
+        The number of units asked for.
+    quantity : int
+        The number of units bought.
+    cost : int
+        Total gil paid before tax (``pricePerUnit * quantity`` over `listings`).
+    tax : int
+        Total tax on `listings`.
+    """
+
+    listings: list = field(default_factory=list)
+    requested: int = 0
+    quantity: int = 0
+    cost: int = 0
+    tax: int = 0
+
+    @property
+    def fulfilled(self) -> bool:
+        """Whether the plan buys at least `requested` units."""
+        return self.quantity >= self.requested
+
+    @property
+    def total(self) -> int:
+        """`cost` plus `tax`."""
+        return self.cost + self.tax
+
+    @property
+    def by_world(self) -> dict[str | None, list]:
+        """The listings to buy, grouped by world name."""
+        worlds: dict[str | None, list] = {}
+        for listing in self.listings:
+            worlds.setdefault(listing.get('worldName'), []).append(listing)
+        return worlds
+
+
+class PurchasePlanner:
+    """
+    Finds the cheapest way to buy some number of units of one item.
+
+    The listings are indexed by price once, both overall and per world, so many
+    plans can be made against one snapshot cheaply: a greedy plan only walks the
+    cheapest listings it needs. Plans are made against the listings as they were
+    when the planner was created; make a new planner after updating a response.
+
+    Parameters
+    ----------
+    listings : MBDataResponseItem or Iterable[Mapping]
+        An item from a DC- or region-level response (its ``price_index`` is reused),
+        or its listings.
+
+    Examples
+    --------
+    >>> planner = PurchasePlanner(resp.items[5057])
+    >>> plan = planner.plan(99, hq=True, worlds=['Brynhildr', 'Coeurl'])
+    >>> plan.cost, plan.by_world
+    """
+
+    _PurchasePlanner_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, listings: MBDataResponseItem | Iterable[Mapping]) -> None:
+        if isinstance(listings, MBDataResponseItem):
+            self.index = listings.price_index
+        else:
+            self.index = PriceIndex(listings)
+        self._world_indexes: dict[Any, PriceIndex] | None = None
+        self._world_ids: dict[str, int] = {}
+
+    @property
+    def world_indexes(self) -> dict[Any, PriceIndex]:
+        """
+        A price index per world, keyed by world ID (or name if IDs are missing).
+
+        Returns
+        -------
+        dict[Any, PriceIndex]
+        """
+        if self._world_indexes is None:
+            by_world: dict[Any, list] = {}
+            for listing in self.index:
+                world_id = listing.get('worldID')
+                world_name = listing.get('worldName')
+                if world_id is not None and world_name is not None:
+                    self._world_ids[world_name.lower()] = world_id
+                key = world_id if world_id is not None else world_name
+                by_world.setdefault(key, []).append(listing)
+            self._world_indexes = {world: PriceIndex(world_listings)
+                                   for world, world_listings in by_world.items()}
+        return self._world_indexes
+
+    def _candidates(self, hq: bool | None,
+                    worlds: Iterable[int | str] | None) -> Iterable:
+        """Yield the eligible listings, cheapest per unit first."""
+        if worlds is None:
+            index = self.index
+            if hq is not None:
+                index = index.hq if hq else index.nq
+            return iter(index)
+
+        world_indexes = self.world_indexes
+        selected = []
+        for world in worlds:
+            key = (self._world_ids.get(world.lower(), world) if isinstance(world, str)
+                   else world)
+            world_index = world_indexes.get(key)
+            if world_index is None:
+                continue
+            if hq is not None:
+                world_index = world_index.hq if hq else world_index.nq
+            selected.append(world_index.listings)
+        return heapq.merge(*selected, key=_price)
+
+    def plan(self, quantity: int, *, hq: bool | None = None,
+             worlds: Iterable[int | str] | None = None,
+             exact: bool = False) -> PurchasePlan:
+        """
+        Plan the cheapest purchase of at least `quantity` units.
+
+        By default listings are taken cheapest per unit first until `quantity` is
+        reached, then any listing that is no longer needed is dropped, most expensive
+        first. This is usually, but not always, the cheapest plan, because listings
+        can only be bought whole. With `exact`, the cheapest plan is found with a
+        knapsack search over every listing that could be part of it, which takes
+        time proportional to `quantity` times the number of such listings.
+
+        Parameters
+        ----------
+        quantity : int
+            The number of units to buy.
+        hq : bool or None, optional
+            Only buy HQ (``True``) or NQ (``False``) listings. Defaults to ``None``,
+            i.e. either.
+        worlds : Iterable[int or str] or None, optional
+            Only buy on these worlds, by ID or name. Defaults to ``None``, i.e. any.
+        exact : bool, optional
+            Whether to search for the cheapest plan. Defaults to ``False``.
+
+        Returns
+        -------
+        PurchasePlan
+            If there aren't enough units for sale, every eligible listing is bought
+            and the plan is not ``fulfilled``.
+
+        Raises
+        ------
+        UniversalisError
+            If `quantity` is not positive.
+        """
+        if quantity <= 0:
+            raise UniversalisError("quantity must be positive")
+
+        chosen = []
+        bought = 0
+        candidates = self._candidates(hq, worlds)
+        for listing in candidates:
+            chosen.append(listing)
+            bought += listing['quantity']
+            if bought >= quantity:
+                break
+        else:
+            self._PurchasePlanner_logger.debug("Not enough units for sale",
+                                               extra={'requested': quantity,
+                                                      'available': bought})
+            return _make_plan(chosen, quantity)
+
+        # drop listings the others already cover, most expensive first
+        for i in range(len(chosen) - 1, -1, -1):
+            surplus = bought - quantity
+            if chosen[i]['quantity'] <= surplus:
+                bought -= chosen.pop(i)['quantity']
+
+        if exact:
+            greedy_cost = sum(map(_cost, chosen))
+            # no listing costing more than the greedy plan can be in a cheaper one
+            pool = [listing for listing in self._candidates(hq, worlds)
+                    if _cost(listing) <= greedy_cost]
+            chosen = _knapsack(pool, quantity, greedy_cost)
+        return _make_plan(chosen, quantity)
+
+
+def _price(listing: Mapping) -> int:
+    return listing['pricePerUnit']
+
+
+def _cost(listing: Mapping) -> int:
+    return listing['pricePerUnit'] * listing['quantity']
+
+
+def _make_plan(listings: list, requested: int) -> PurchasePlan:
+    return PurchasePlan(listings=listings,
+                        requested=requested,
+                        quantity=sum(listing['quantity'] for listing in listings),
+                        cost=sum(map(_cost, listings)),
+                        tax=sum(listing.get('tax') or 0 for listing in listings))
+
+
+def _knapsack(pool: list, quantity: int, bound: int) -> list:
+    """
+    Return the cheapest subset of `pool` with at least `quantity` units.
+
+    A 0/1 covering knapsack over units, capped at `quantity`. `bound` is the cost of
+    a known solution, so no better one can cost more.
+    """
+    unreachable = bound + 1
+    # best[u]: cheapest cost of exactly u units (u == quantity meaning "at least")
+    best = [unreachable] * (quantity + 1)
+    best[0] = 0
+    # came_from[i][u]: units before taking listing i, if it improved best[u]
+    came_from = []
+    for listing in pool:
+        units = listing['quantity']
+        cost = _cost(listing)
+        step = array('i', [-1]) * (quantity + 1)
+        for u in range(quantity, -1, -1):
+            if best[u] >= unreachable:
+                continue
+            target = min(u + units, quantity)
+            if best[u] + cost < best[target]:
+                best[target] = best[u] + cost
+                step[target] = u
+        came_from.append(step)
+
+    # walk back from the full quantity
+    chosen = []
+    u = quantity
+    for i in range(len(pool) - 1, -1, -1):
+        if u == 0:
+            break
+        prev = came_from[i][u]
+        if prev >= 0:
+            chosen.append(pool[i])
+            u = prev
+    chosen.reverse()
+    return chosen
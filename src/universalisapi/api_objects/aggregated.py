@@ -0,0 +1,203 @@
+"""Response object for /aggregated/``region``/``item_ids``."""
+
+import logging
+import math
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import cast
+
+from ..exceptions import UniversalisError
+from .records import AggregatedItemRecord, AggregatedStats
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class AggregatedResponse:
+    """
+    Aggregated market board data for many items in a region.
+
+    Each item's result is decoded into a compact ``AggregatedItemRecord`` the first
+    time it is looked up. A statistic can also be read for every item at once as a
+    column (``values``), straight from the response, and the HQ-or-NQ choice made by
+    ``select`` is applied to whole columns, with NumPy if it is installed.
+
+    Parameters
+    ----------
+    data : dict
+        The JSON response from Universalis, with ``results`` and ``failedItems``.
+    use_numpy : bool or None, optional
+        Whether to back columns with NumPy arrays. Defaults to ``None``, which uses
+        NumPy if it is installed.
+
+    Attributes
+    ----------
+    failed_items : list[int]
+        Item IDs Universalis has no data for.
+
+    Raises
+    ------
+    UniversalisError
+        If NumPy is requested but not installed.
+
+    Examples
+    --------
+    >>> resp = await client.aggregated_price_data('crystal', item_ids)
+    >>> resp[5057].hq.min_listing.best.price
+    >>> resp.select('minListing', hq=True)       # falls back to NQ per item
+    """
+
+    __slots__ = ('failed_items', 'use_numpy', '_results', '_records', '_columns')
+
+    _AggregatedResponse_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, data: dict, *, use_numpy: bool | None = None) -> None:
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise UniversalisError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self._results: dict[int, dict] = {result['itemId']: result
+                                          for result in data.get('results') or ()}
+        self._records: dict[int, AggregatedItemRecord] = {}
+        self.failed_items: list[int] = list(data.get('failedItems') or ())
+        self._columns: dict[tuple[str, bool], Sequence[float]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of items with results."""
+        return len(self._results)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the item IDs with results."""
+        return iter(self._results)
+
+    def __contains__(self, item_id: object) -> bool:
+        """Return whether there is a result for `item_id`."""
+        return item_id in self._results
+
+    def __getitem__(self, item_id: int) -> AggregatedItemRecord:
+        """Return the record for `item_id`, decoding it on first lookup."""
+        record = self._records.get(item_id)
+        if record is None:
+            record = AggregatedItemRecord.from_dict(self._results[item_id])
+            self._records[item_id] = record
+        return record
+
+    @property
+    def items(self) -> dict[int, AggregatedItemRecord]:
+        """Mapping of item ID -> record, in the order of the results."""
+        return {item_id: self[item_id] for item_id in self._results}
+
+    @property
+    def data(self) -> dict:
+        """The response in the API's format."""
+        return {'results': list(self._results.values()),
+                'failedItems': list(self.failed_items)}
+
+    def values(self, stat: str, *, hq: bool) -> Sequence[float]:
+        """
+        Return a statistic for every item, in the order of the results.
+
+        Each value is taken from the most specific tier (world, then DC, then
+        region) Universalis has data for, like
+        ``UniversalisAPIClient.parse_region_data``.
+
+        Parameters
+        ----------
+        stat : str
+            The statistic's API key: ``'minListing'``, ``'recentPurchase'``,
+            ``'averageSalePrice'`` or ``'dailySaleVelocity'``.
+        hq : bool
+            Whether to read the HQ or the NQ statistic.
+
+        Returns
+        -------
+        Sequence[float]
+            A NumPy array or an :class:`array.array`, with NaN for items without
+            data. Built on first use and reused afterwards; do not modify.
+
+        Raises
+        ------
+        KeyError
+            If `stat` is not a statistic.
+        """
+        key = (stat, hq)
+        column = self._columns.get(key)
+        if column is None:
+            if stat not in AggregatedStats._keys:
+                raise KeyError(stat)
+            quality = 'hq' if hq else 'nq'
+            values = [_best_value((result.get(quality) or {}).get(stat) or {})
+                      for result in self._results.values()]
+            built = (np.array(values, dtype='float64') if self.use_numpy
+                     else array('d', values))
+            column = self._columns[key] = cast(Sequence[float], built)
+        return column
+
+    def select(self, stat: str, *, hq: bool = True) -> dict[int, float | None]:
+        """
+        Return a statistic for every item, preferring HQ data if `hq` is set.
+
+        Items without HQ data (for example, gatherables, which cannot be HQ) fall
+        back to NQ data.
+
+        Parameters
+        ----------
+        stat : str
+            The statistic's API key, see ``values``.
+        hq : bool, optional
+            Whether to prefer HQ data. Defaults to ``True``.
+
+        Returns
+        -------
+        dict[int, float | None]
+            Mapping of item ID -> value, or ``None`` if there is no data at all.
+        """
+        nq_values = self.values(stat, hq=False)
+        if hq:
+            hq_values = self.values(stat, hq=True)
+            if self.use_numpy:
+                chosen = np.where(np.isnan(hq_values), nq_values, hq_values).tolist()
+            else:
+                chosen = [nq_value if math.isnan(hq_value) else hq_value
+                          for hq_value, nq_value in zip(hq_values, nq_values)]
+        else:
+            chosen = cast('np.ndarray | array[float]', nq_values).tolist()
+        return {item_id: None if math.isnan(value) else value
+                for item_id, value in zip(self._results, chosen)}
+
+    def average_sale_prices(self, *, hq: bool = True) -> dict[int, int]:
+        """
+        Return each item's average sale price, rounded to the nearest gil.
+
+        Parameters
+        ----------
+        hq : bool, optional
+            Whether to prefer HQ prices, falling back to NQ. Defaults to ``True``.
+
+        Returns
+        -------
+        dict[int, int]
+            Mapping of item ID -> average price, or -1 if there is no price data.
+        """
+        prices = self.select('averageSalePrice', hq=hq)
+        missing = [item_id for item_id, price in prices.items() if price is None]
+        if missing:
+            self._AggregatedResponse_logger.info("No average price data for items",
+                                                 extra={'items': missing})
+        return {item_id: -1 if price is None else round(price)
+                for item_id, price in prices.items()}
+
+
+def _best_value(stat: dict) -> float:
+    """Return the most specific tier's price or quantity, or NaN if there is none."""
+    tier = stat.get('world') or stat.get('dc') or stat.get('region')
+    if tier is None:
+        return math.nan
+    value = tier.get('price')
+    return tier.get('quantity', math.nan) if value is None else value
@@ -1,15 +1,148 @@
-import logging
-import asyncio
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .listing_store import ListingStore
 
-import aiohttp
 
 class UniversalisListing:
     """
+    A single market board listing, read from a ``ListingStore`` without copying.
+
+    A listing is only a row index into its store, so iterating over or slicing a
+    store of thousands of listings doesn't build thousands of dicts. Values can be
+    read through the typed properties below, or with the API's keys (e.g.
+    ``listing['pricePerUnit']``).
 
+    Parameters
+    ----------
+    store : ListingStore
+        The store holding the listing.
+    row : int
+        The index of the listing in `store`.
+
+    Examples
+    --------
+    >>> for listing in item.listing_store.hq_only():
+    ...     print(listing.world_name, listing.price_per_unit)
+    Brynhildr 62838
     """
 
-    def __init__(self, listing: dict):
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store: 'ListingStore', row: int) -> None:
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401 (type depends on key)
+        """Return the value for API key `key`."""
+        return self.store.value(key, self.row)
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Return the value for API key `key`, or `default` if there isn't one."""
+        if key not in self.store:
+            return default
+        return self.store.value(key, self.row)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare listings by value."""
+        if isinstance(other, UniversalisListing):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the listing's ID, quantity and unit price."""
+        return (f"<{self.__class__.__name__} {self.listing_id} "
+                f"{self.quantity}x{self.price_per_unit}>")
+
+    def to_dict(self) -> dict:
         """
+        Return this listing as a ``dict`` in the API's format.
 
-        :param listing:
+        Returns
+        -------
+        dict
         """
+        return self.store.row(self.row)
+
+    @property
+    def listing_id(self) -> str:
+        """The listing's ID."""
+        return self['listingID']
+
+    @property
+    def price_per_unit(self) -> int:
+        """The price of one unit, before tax."""
+        return self['pricePerUnit']
+
+    @property
+    def quantity(self) -> int:
+        """The number of units."""
+        return self['quantity']
+
+    @property
+    def total(self) -> int:
+        """The price of every unit, before tax."""
+        return self['total']
+
+    @property
+    def tax(self) -> int:
+        """The tax on `total`."""
+        return self['tax']
+
+    @property
+    def hq(self) -> bool:
+        """Whether the item is high quality."""
+        return self['hq']
+
+    @property
+    def is_crafted(self) -> bool:
+        """Whether the item was crafted."""
+        return self['isCrafted']
+
+    @property
+    def on_mannequin(self) -> bool:
+        """Whether the listing is on a mannequin."""
+        return self['onMannequin']
+
+    @property
+    def world_id(self) -> int | None:
+        """The world the listing is on, or ``None`` for a single-world request."""
+        return self.get('worldID')
+
+    @property
+    def world_name(self) -> str | None:
+        """The name of `world_id`, or ``None`` for a single-world request."""
+        return self.get('worldName')
+
+    @property
+    def retainer_id(self) -> str:
+        """The ID of the selling retainer."""
+        return self['retainerID']
+
+    @property
+    def retainer_name(self) -> str:
+        """The name of the selling retainer."""
+        return self['retainerName']
+
+    @property
+    def retainer_city(self) -> int:
+        """The ID of the city the retainer is in."""
+        return self['retainerCity']
+
+    @property
+    def creator_name(self) -> str:
+        """The name of the crafter, if any."""
+        return self['creatorName']
+
+    @property
+    def last_review_timestamp(self) -> int:
+        """When the listing was last reviewed, in seconds since the epoch."""
+        return self['lastReviewTime']
+
+    @property
+    def last_review_time(self) -> datetime:
+        """When the listing was last reviewed, as a datetime."""
+        return datetime.fromtimestamp(self.last_review_timestamp)
@@ -0,0 +1,437 @@
+"""
+Column-oriented storage for market board listings and sales.
+
+A store keeps one typed column per field instead of one ``dict`` per row, so
+filters such as "cheaper than X" or "HQ only" run over contiguous arrays. When NumPy
+is installed columns are NumPy arrays and filters are vectorized; otherwise they are
+:mod:`array` arrays (or lists, for strings) and filters fall back to plain Python.
+"""
+
+import operator
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import compress, repeat
+from typing import Any, ClassVar, Self, cast, overload
+
+from ..exceptions import UniversalisError
+from .listing import UniversalisListing
+from .records import ListingRecord, SaleRecord
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+HAS_NUMPY = np is not None
+"""Whether NumPy is installed, and stores use it by default."""
+
+_NUMPY_DTYPES = {'q': 'int64', 'd': 'float64', 'b': 'bool'}
+
+_COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+}
+
+
+class ColumnStore:
+    """
+    A fixed set of rows stored column-wise.
+
+    Numeric columns are typed arrays, so values missing from a row are stored as 0
+    (or ``False``). Keys that don't appear in any row get no column, and are left out
+    of ``to_dicts``.
+
+    Filtering returns a store that shares this one's columns and only records which
+    rows it holds; a filtered column is copied out the first time it is read.
+
+    Parameters
+    ----------
+    rows : Iterable[Mapping or ListingRecord or SaleRecord]
+        The rows, e.g. listings from an API response.
+    use_numpy : bool or None, optional
+        Whether to back columns with NumPy arrays. Defaults to ``None``, which uses
+        NumPy if it is installed.
+
+    Attributes
+    ----------
+    row_ids : Sequence[int]
+        The position of each row in the original `rows`, kept through filtering.
+    """
+
+    __slots__ = ('_base', '_columns', 'row_ids', 'use_numpy', '_full')
+
+    _types: ClassVar[dict[str, str]] = {}
+    """Mapping of API key -> array typecode ('q', 'd' or 'b'), or 'O' for objects."""
+
+    def __init__(self, rows: Iterable[Mapping | ListingRecord | SaleRecord], *,
+                 use_numpy: bool | None = None) -> None:
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY
+        elif use_numpy and not HAS_NUMPY:
+            raise UniversalisError("NumPy is not installed")
+        self.use_numpy = use_numpy
+
+        rows = list(rows)
+        self._base: dict[str, Any] = {}
+        for key, typecode in self._types.items():
+            if not any(key in row for row in rows):
+                continue
+            self._base[key] = self._make_column([row.get(key) for row in rows],
+                                                typecode)
+        # the full store reads its columns directly
+        self._columns = self._base
+        self._full = True
+        self.row_ids = self._make_column(range(len(rows)), 'q')
+
+    def _select(self, row_ids: Sequence[int]) -> Self:
+        """Return a store over the rows of the original `rows` at `row_ids`."""
+        store = self.__class__.__new__(self.__class__)
+        store._base = self._base
+        store._columns = {}
+        store._full = False
+        store.row_ids = row_ids
+        store.use_numpy = self.use_numpy
+        return store
+
+    def _make_column(self, values: Iterable, typecode: str) -> Any:  # noqa: ANN401
+        # a NumPy array, an array.array or a list, depending on use_numpy and typecode
+        if typecode == 'O':
+            values = list(values)
+            if self.use_numpy:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+                return column
+            return values
+        values = [v or 0 for v in values]
+        if self.use_numpy:
+            return np.array(values, dtype=_NUMPY_DTYPES[typecode])
+        return array(typecode, values)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.row_ids)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the store has a column for API key `key`."""
+        return key in self._base
+
+    @property
+    def keys(self) -> list[str]:
+        """The API keys this store has columns for."""
+        return list(self._base)
+
+    def column(self, key: str) -> Sequence:
+        """
+        Return the column for API key `key`.
+
+        Columns of an unfiltered store are returned without copying.
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        Sequence
+            A NumPy array, an :class:`array.array` or a list.
+
+        Raises
+        ------
+        KeyError
+            If the store has no column for `key`.
+        """
+        column = self._columns.get(key)
+        if column is None:
+            base = self._base[key]
+            if self.use_numpy:
+                column = base[self.row_ids]
+            elif isinstance(base, array):
+                column = array(base.typecode, map(base.__getitem__, self.row_ids))
+            else:
+                column = list(map(base.__getitem__, self.row_ids))
+            self._columns[key] = column
+        return column
+
+    def values(self, key: str) -> list:
+        """
+        Return the values in column `key` as a list of Python objects.
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        list
+        """
+        column = self.column(key)
+        if self.use_numpy:
+            return cast('np.ndarray', column).tolist()
+        if self._types[key] == 'b':
+            return [bool(v) for v in column]
+        return list(column)
+
+    def value(self, key: str, i: int) -> Any:  # noqa: ANN401 (type depends on key)
+        """
+        Return the value of `key` in row `i` as a Python object.
+
+        Parameters
+        ----------
+        key : str
+        i : int
+
+        Returns
+        -------
+        Any
+        """
+        value = self._base[key][self.row_ids[i]]
+        if self.use_numpy and self._types[key] != 'O':
+            return value.item()
+        if self._types[key] == 'b':
+            return bool(value)
+        return value
+
+    def row(self, i: int) -> dict:
+        """
+        Return row `i` as a ``dict`` in the API's format.
+
+        Parameters
+        ----------
+        i : int
+
+        Returns
+        -------
+        dict
+        """
+        return {key: self.value(key, i) for key in self._base}
+
+    def to_dicts(self) -> list[dict]:
+        """
+        Return every row as a ``dict`` in the API's format.
+
+        Returns
+        -------
+        list[dict]
+        """
+        keys = list(self._base)
+        columns = [self.values(key) for key in keys]
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def take(self, indices: Sequence[int]) -> Self:
+        """
+        Return a store holding rows `indices` of this one, in that order.
+
+        Parameters
+        ----------
+        indices : Sequence[int]
+
+        Returns
+        -------
+        ColumnStore
+        """
+        if self.use_numpy:
+            return self._select(self.row_ids[np.asarray(indices, dtype='int64')])
+        return self._select(array('q', map(self.row_ids.__getitem__, indices)))
+
+    def where(self, mask: Sequence[bool]) -> Self:
+        """
+        Return a store holding the rows where `mask` is true.
+
+        Parameters
+        ----------
+        mask : Sequence[bool]
+            One value per row, e.g. a NumPy boolean array.
+
+        Returns
+        -------
+        ColumnStore
+        """
+        if self.use_numpy:
+            return self._select(self.row_ids[np.asarray(mask, dtype=bool)])
+        return self._select(array('q', compress(self.row_ids, mask)))
+
+    def _compare(self, key: str, op: str, other: float | str) -> Sequence[bool]:
+        """Return a mask of `key` compared to `other` with `op` ('<', '==', ...)."""
+        compare = _COMPARISONS[op]
+        if key not in self._base:
+            return self._and(False)
+        column = self.column(key)
+        if self.use_numpy:
+            return cast(Sequence[bool], compare(cast('np.ndarray', column), other))
+        return list(map(compare, column, repeat(other)))
+
+    def _and(self, *masks: Sequence[bool] | bool) -> Sequence[bool]:
+        """Return the element-wise AND of `masks`; a ``bool`` applies to every row."""
+        n = len(self)
+        if self.use_numpy:
+            combined = np.ones(n, dtype=bool)
+            for mask in masks:
+                combined &= mask
+            return cast(Sequence[bool], combined)
+        result = [True] * n
+        for mask in masks:
+            row_mask = [mask] * n if isinstance(mask, bool) else mask
+            result = list(map(operator.and_, result, row_mask))
+        return result
+
+
+class ListingStore(ColumnStore):
+    """
+    Market board listings stored column-wise.
+
+    Indexing or iterating a store gives ``UniversalisListing`` views onto it, and
+    slicing gives another store. See ``ColumnStore`` for the parameters.
+
+    Examples
+    --------
+    >>> store = ListingStore(item.listings)
+    >>> cheap_hq = store.filter(max_price=1000, hq=True)
+    >>> cheap_hq.values('listingID')
+    ['5f0d...', ...]
+    """
+
+    __slots__ = ()
+
+    _types = {
+        'listingID': 'O',
+        'pricePerUnit': 'q',
+        'quantity': 'q',
+        'total': 'q',
+        'tax': 'q',
+        'hq': 'b',
+        'isCrafted': 'b',
+        'onMannequin': 'b',
+        'lastReviewTime': 'q',
+        'worldID': 'q',
+        'worldName': 'O',
+        'retainerID': 'O',
+        'retainerName': 'O',
+        'retainerCity': 'q',
+        'creatorID': 'O',
+        'creatorName': 'O',
+        'sellerID': 'O',
+        'stainID': 'q',
+        'materia': 'O',
+    }
+
+    @overload
+    def __getitem__(self, index: int) -> UniversalisListing: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Self: ...
+
+    def __getitem__(self, index: int | slice) -> UniversalisListing | Self:
+        """
+        Return a view of one listing, or a store of a slice of the listings.
+
+        Neither copies any listing data.
+        """
+        if isinstance(index, slice):
+            return self._select(self.row_ids[index])
+        n = len(self)
+        if not -n <= index < n:
+            raise IndexError(index)
+        return UniversalisListing(self, index % n)
+
+    def __iter__(self) -> Iterator[UniversalisListing]:
+        """Iterate over views of the listings."""
+        for i in range(len(self)):
+            yield UniversalisListing(self, i)
+
+    def filter(self, *, max_price: int | None = None, hq: bool | None = None,
+               world: int | str | None = None) -> Self:
+        """
+        Return the listings matching every given condition.
+
+        Parameters
+        ----------
+        max_price : int, optional
+            Keep listings with a ``pricePerUnit`` strictly below this.
+        hq : bool, optional
+            Keep only HQ (``True``) or only NQ (``False``) listings.
+        world : int or str, optional
+            Keep listings on this world, by ID or name.
+
+        Returns
+        -------
+        ListingStore
+        """
+        masks = []
+        if max_price is not None:
+            masks.append(self._compare('pricePerUnit', '<', max_price))
+        if hq is not None:
+            masks.append(self._compare('hq', '==', hq))
+        if world is not None:
+            key = 'worldName' if isinstance(world, str) else 'worldID'
+            masks.append(self._compare(key, '==', world))
+        if not masks:
+            return self
+        return self.where(self._and(*masks))
+
+    def cheaper_than(self, price: int) -> Self:
+        """Return the listings with a ``pricePerUnit`` below `price`."""
+        return self.filter(max_price=price)
+
+    def hq_only(self) -> Self:
+        """Return the HQ listings."""
+        return self.filter(hq=True)
+
+    def on_world(self, world: int | str) -> Self:
+        """Return the listings on `world`, given by ID or name."""
+        return self.filter(world=world)
+
+
+class SaleStore(ColumnStore):
+    """
+    Sales from an item's recent history stored column-wise.
+
+    See ``ColumnStore`` for the parameters.
+    """
+
+    __slots__ = ()
+
+    _types = {
+        'pricePerUnit': 'q',
+        'quantity': 'q',
+        'total': 'q',
+        'hq': 'b',
+        'onMannequin': 'b',
+        'timestamp': 'q',
+        'worldID': 'q',
+        'worldName': 'O',
+        'buyerName': 'O',
+    }
+
+    def filter(self, *, hq: bool | None = None, world: int | str | None = None,
+               since: int | None = None) -> Self:
+        """
+        Return the sales matching every given condition.
+
+        Parameters
+        ----------
+        hq : bool, optional
+            Keep only HQ (``True``) or only NQ (``False``) sales.
+        world : int or str, optional
+            Keep sales on this world, by ID or name.
+        since : int, optional
+            Keep sales with a ``timestamp`` (in seconds) at or after this.
+
+        Returns
+        -------
+        SaleStore
+        """
+        masks = []
+        if hq is not None:
+            masks.append(self._compare('hq', '==', hq))
+        if world is not None:
+            key = 'worldName' if isinstance(world, str) else 'worldID'
+            masks.append(self._compare(key, '==', world))
+        if since is not None:
+            masks.append(self._compare('timestamp', '>=', since))
+        if not masks:
+            return self
+        return self.where(self._and(*masks))
@@ -1,25 +1,47 @@
 import logging
+from collections import ChainMap
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
 from datetime import datetime
-from functools import cached_property
-from typing import cast
+from pathlib import Path
+from types import MappingProxyType, TracebackType
+from typing import Any, Self, cast
 
-import aiohttp
 from .._wrapper import UniversalisAPIWrapper
 from ..exceptions import UniversalisError
+from .listing_store import ListingStore, SaleStore
+from .price_index import PriceIndex
+from .records import ListingRecord, MBItemRecord, SaleRecord
+from .snapshot import MBDataSnapshot, write_snapshot
 
 
 module_logger = logging.getLogger(__name__)
 
+_UNSET = object()
+"""Marks a lazily computed attribute that may legitimately be ``None``."""
 
-class MBDataResponseItem(UniversalisAPIWrapper):
+
+class MBDataResponseItem:
     """
     A representation of a specifc item from a Universalis API response.
 
+    Items are plain value objects: they hold no session, and log through a single
+    class-level logger. Attributes are read from the underlying data on access, and
+    derived ones (datetimes, `histograms`, `prices`, ...) are computed on first
+    access and cached, so an item used only for `best_price` costs next to nothing.
+
     Parameters
     ----------
-    item_data : dict
+    item_data : dict or MBItemRecord
         The data representing a Universalis MB Data response for a specific item. This
         is expected to conform to the schema provided by the public Universalis API.
+    typed : bool, optional
+        If ``True``, decode `item_data` into a compact ``MBItemRecord`` and read every
+        field from it; listings and sales become ``ListingRecord`` and ``SaleRecord``
+        objects (which can still be indexed like the API's dicts). Implied when
+        `item_data` is already an ``MBItemRecord``. Defaults to ``False``.
+    keep_raw : bool, optional
+        In typed mode, keep `item_data` as well as the record. Defaults to ``False``,
+        i.e. the raw dict is dropped.
 
     Attributes
     ----------
@@ -28,10 +50,10 @@ class MBDataResponseItem(UniversalisAPIWrapper):
     last_upload_time : datetime
         The last upload time for this item on Universalis, as a datetime
         (for raw response in MS, see `last_upload_time_ms`)
-    listings : list[dict]
+    listings : Sequence[dict or ListingRecord]
         A list of listings representing entries for this item on the MB in the region.
     listings_count : int
-    recent_history : list[dict]
+    recent_history : Sequence[dict or SaleRecord]
         The currently shown sales of this item.
     recent_history_count : int
     units_for_sale : int
@@ -41,72 +63,169 @@ class MBDataResponseItem(UniversalisAPIWrapper):
     world_upload_times : dict[int, datetime]
         If the request that generated this object was for a specific world, this will be
         an empty dict. Otherwise, this is a mapping from worldIDs to datetimes.
+    record : MBItemRecord or None
+        The typed record backing this item, or ``None`` if not in typed mode.
     """
 
+    __slots__ = ('record', '_data', '_source', '_last_upload_time',
+                 '_world_upload_times', '_histograms', '_region_info', '_prices',
+                 '_listing_store', '_sale_store', '_price_index')
+
     _MBDataResponseItem_logger = module_logger.getChild(__qualname__)
 
-    def __init__(self, item_data: dict, *,
-                 session: aiohttp.ClientSession | None = None) -> None:
-        super().__init__(session=session)
-        self._instance_logger = self._MBDataResponseItem_logger.getChild(str(id(self)))
-
-        self._data: dict = item_data
-        self.item_id: int = self._data['itemID']
-        self._last_upload_time_ms: int = cast(int, self._data.get('lastUploadTime'))
-        self.last_upload_time: datetime = datetime.fromtimestamp(
-            round(self._last_upload_time_ms / 1000, 4))
-        self.listings: list[dict] = self._data['listings']
-        self.listings_count: int = self._data['listingsCount']
-        self.recent_history: list[dict] = self._data['recentHistory']
-        self.recent_history_count: int = self._data['recentHistoryCount']
-        self.units_for_sale: int = self._data['unitsForSale']
-        self.units_sold: int = self._data['unitsSold']
-
-        # get world_upload_times if it exists
-        self._world_upload_times = self._data.get('worldUploadTimes')
-        self.world_upload_times: dict[int, datetime]
-        if self._world_upload_times is not None:
-            self.world_upload_times = dict(
-                zip(self._world_upload_times.keys(),
-                    map(lambda x: datetime.fromtimestamp(round(x/1000)),
-                        self._world_upload_times.values()))
-            )
+    def __init__(self, item_data: dict | MBItemRecord, *,
+                 typed: bool = False,
+                 keep_raw: bool = False) -> None:
+        # in typed mode, fields are read from a compact record instead of the dict
+        self.record: MBItemRecord | None
+        self._data: dict | None
+        self._source: dict | MBItemRecord
+        if typed or isinstance(item_data, MBItemRecord):
+            if isinstance(item_data, MBItemRecord):
+                self.record = item_data
+                self._data = None
+            else:
+                self.record = MBItemRecord.from_dict(item_data)
+                self._data = item_data if keep_raw else None
+            self._source = self.record
         else:
-            self.world_upload_times = {}
+            self.record = None
+            self._data = item_data
+            self._source = item_data
+
+        # derived attributes are computed on first access
+        self._last_upload_time: datetime | None = None
+        self._world_upload_times: dict[int, datetime] | None = None
+        self._histograms: dict[str, dict[str, int]] | None = None
+        self._region_info: str | None | object = _UNSET
+        self._prices: dict[str, dict[str, int | float]] | None = None
+        self._listing_store: ListingStore | None = None
+        self._sale_store: SaleStore | None = None
+        self._price_index: PriceIndex | None = None
 
-        self.histograms = {
-            'default': self._data['stackSizeHistogram'],
-            'nq': self._data['stackSizeHistogramNQ'],
-            'hq': self._data['stackSizeHistogramHQ']
-        }
+    @property
+    def item_id(self) -> int:
+        """The ID of the item."""
+        return self._source['itemID']
 
-        self.region_info: str | None
-        # get region info
-        if 'worldName' in self._data:
-            self.region_info = self._data['worldName']
-        elif 'dcName' in self._data:
-            self.region_info = self._data['dcName']
-        elif 'regionName' in self._data:
-            self.region_info = self._data['regionName']
-        else:
-            # warn if we can't get the region info
-            self._instance_logger.warning(
-                "Could not determine region information for item",
-                extra={'data': self._data})
-            self.region_info = None
+    @property
+    def world_id(self) -> int | None:
+        """The world the data is for, or ``None`` if it is for a DC or region."""
+        return self._source.get('worldID')
+
+    @property
+    def _last_upload_time_ms(self) -> int:
+        return cast(int, self._source.get('lastUploadTime'))
+
+    @property
+    def last_upload_time(self) -> datetime:
+        """When the item was last uploaded, as a local datetime."""
+        if self._last_upload_time is None:
+            self._last_upload_time = datetime.fromtimestamp(
+                round(self._last_upload_time_ms / 1000, 4))
+        return self._last_upload_time
+
+    @property
+    def last_upload_timestamp(self) -> int:
+        """When the item was last uploaded, in milliseconds since the epoch."""
+        return self._last_upload_time_ms
+
+    @property
+    def sale_velocity(self) -> float:
+        """The average number of sales per day, from ``regularSaleVelocity``."""
+        return self._source.get('regularSaleVelocity') or 0.0
+
+    @property
+    def listings(self) -> Sequence[dict | ListingRecord]:
+        """The item's listings on the market board."""
+        return self._source['listings']
+
+    @property
+    def listings_count(self) -> int:
+        """The number of listings."""
+        return self._source['listingsCount']
+
+    @property
+    def recent_history(self) -> Sequence[dict | SaleRecord]:
+        """The item's currently shown sales."""
+        return self._source['recentHistory']
+
+    @property
+    def recent_history_count(self) -> int:
+        """The number of sales in `recent_history`."""
+        return self._source['recentHistoryCount']
+
+    @property
+    def units_for_sale(self) -> int:
+        """The number of units (not listings) up for sale."""
+        return self._source['unitsForSale']
+
+    @property
+    def units_sold(self) -> int:
+        """The number of units (not sales) sold over `recent_history`."""
+        return self._source['unitsSold']
+
+    @property
+    def world_upload_times(self) -> dict[int, datetime]:
+        """Mapping of world ID -> last upload time; empty for a single world."""
+        if self._world_upload_times is None:
+            # only present if the request wasn't for a specific world
+            upload_times = self._source.get('worldUploadTimes') or {}
+            # JSON object keys are strings, but these are world IDs
+            self._world_upload_times = {
+                int(world_id): datetime.fromtimestamp(round(ms / 1000))
+                for world_id, ms in upload_times.items()
+            }
+        return self._world_upload_times
+
+    @property
+    def histograms(self) -> dict[str, dict[str, int]]:
+        """Stack size histograms, keyed on ``'default'``, ``'nq'`` and ``'hq'``."""
+        if self._histograms is None:
+            self._histograms = {
+                'default': self._source['stackSizeHistogram'],
+                'nq': self._source['stackSizeHistogramNQ'],
+                'hq': self._source['stackSizeHistogramHQ']
+            }
+        return self._histograms
+
+    @property
+    def region_info(self) -> str | None:
+        """The world, DC or region the data is for, or ``None`` if unknown."""
+        if self._region_info is _UNSET:
+            source = self._source
+            self._region_info = (source.get('worldName')
+                                 or source.get('dcName')
+                                 or source.get('regionName'))
+            if self._region_info is None:
+                # warn if we can't get the region info
+                self._MBDataResponseItem_logger.warning(
+                    "Could not determine region information for item",
+                    extra={'item_id': self.item_id})
+        return cast(str | None, self._region_info)
 
     @property
     def data(self) -> dict:
+        """
+        The data for this item, in the API's format.
+
+        In typed mode without `keep_raw`, this is rebuilt from ``record`` on each
+        access.
+        """
+        if self._data is None:
+            return cast(MBItemRecord, self.record).to_dict()
         return self._data
 
     @data.setter
-    def data(self, _) -> None:
+    def data(self, _: object) -> None:
         raise UniversalisError("Cannot set data for MBDataResponseItem object")
 
     @property
     def prices(self) -> dict[str, dict[str, int | float]]:
         """
-        Generate a dict of the price data for this MB Item.
+        A dict of the price data for this MB Item.
+
+        Built on first access and reused afterwards.
 
         Returns
         -------
@@ -120,40 +239,46 @@ class MBDataResponseItem(UniversalisAPIWrapper):
         >>> item.prices['current']
         {'default': 151210.5, 'nq': 151210.5, 'hq': 0}
         """
-        price_dict = {
+        if self._prices is not None:
+            return self._prices
+        source = self._source
+        self._prices = {
             'current': {
-                'default': self._data['currentAveragePrice'],
-                'nq': self._data['currentAveragePriceNQ'],
-                'hq': self._data['currentAveragePriceHQ']
+                'default': source['currentAveragePrice'],
+                'nq': source['currentAveragePriceNQ'],
+                'hq': source['currentAveragePriceHQ']
             },
             'average': {
-                'default': self._data['averagePrice'],
-                'nq': self._data['averagePriceNQ'],
-                'hq': self._data['averagePriceHQ']
+                'default': source['averagePrice'],
+                'nq': source['averagePriceNQ'],
+                'hq': source['averagePriceHQ']
             },
             'min': {
-                'default': self._data['minPrice'],
-                'nq': self._data['minPriceNQ'],
-                'hq': self._data['minPriceHQ']
+                'default': source['minPrice'],
+                'nq': source['minPriceNQ'],
+                'hq': source['minPriceHQ']
             },
             'max': {
-                'default': self._data['maxPrice'],
-                'nq': self._data['maxPriceNQ'],
-                'hq': self._data['maxPriceHQ']
+                'default': source['maxPrice'],
+                'nq': source['maxPriceNQ'],
+                'hq': source['maxPriceHQ']
             }
         }
-        return price_dict
+        return self._prices
 
     @property
     def best_price(self) -> int:
         """
-        Get the best total price for this item.
+        The best total price for this item.
 
         Returns
         -------
         price : int
         """
-        return cast(int, self.prices['min']['default'])
+        if self.record is not None:
+            # an attribute read, rather than a lookup by API key
+            return self.record.min_price
+        return cast(int, self._source['minPrice'])
 
     @property
     def listing_ids(self) -> list[str]:
@@ -164,22 +289,143 @@ class MBDataResponseItem(UniversalisAPIWrapper):
         -------
         listing_ids : list[str]
         """
-        listing_ids = []
-        for listing in self.listings:
-            listing_ids.append(listing['listingID'])
-        return listing_ids
+        if 'listingID' not in self.listing_store:
+            return []
+        return self.listing_store.values('listingID')
 
-    def get_better_listings(self, price: int) -> list[dict]:
+    def get_better_listings(self, price: int) -> list[dict | ListingRecord]:
         """Return list of listing info whose prices are better than the given price."""
-        better_listings = []
-        for listing in self.listings:
-            if listing['pricePerUnit'] < price:
-                better_listings.append(listing)
+        return self.price_index.better_than(price)
+
+    @property
+    def price_index(self) -> PriceIndex:
+        """
+        The item's listings sorted by price, for repeated threshold queries.
+
+        Built on first access and reused afterwards. Updating the response this item
+        belongs to replaces the item, so the index never goes stale.
+
+        Returns
+        -------
+        PriceIndex
+        """
+        if self._price_index is None:
+            self._price_index = PriceIndex(self._source.get('listings') or ())
+        return self._price_index
+
+    @property
+    def listing_store(self) -> ListingStore:
+        """
+        The item's listings stored column-wise, for fast filtering.
+
+        Built on first access and reused afterwards. Its ``row_ids`` index into
+        `listings`.
+
+        Returns
+        -------
+        ListingStore
+        """
+        if self._listing_store is None:
+            self._listing_store = ListingStore(self.listings)
+        return self._listing_store
+
+    @property
+    def sale_store(self) -> SaleStore:
+        """
+        The item's recent history stored column-wise, for fast filtering.
+
+        Built on first access and reused afterwards.
+
+        Returns
+        -------
+        SaleStore
+        """
+        if self._sale_store is None:
+            self._sale_store = SaleStore(self.recent_history)
+        return self._sale_store
+
+    def save(self, path: str | Path) -> int:
+        """
+        Write this item to a snapshot file (see ``MBDataResponse.save``).
+
+        Parameters
+        ----------
+        path : str or Path
+
+        Returns
+        -------
+        int
+            The size of the file, in bytes.
+        """
+        return write_snapshot(path, self.data)
+
+    @classmethod
+    def load(cls, path: str | Path, item_id: int | None = None, *,
+             typed: bool = False) -> Self:
+        """
+        Read an item from a snapshot file.
+
+        Parameters
+        ----------
+        path : str or Path
+        item_id : int or None, optional
+            The item to read. May be omitted if the snapshot holds a single item.
+        typed : bool, optional
+            See ``MBDataResponseItem``. Defaults to ``False``.
 
-        return better_listings
+        Returns
+        -------
+        MBDataResponseItem
+
+        Raises
+        ------
+        UniversalisError
+            If the file is not a snapshot, or doesn't hold the item.
+        """
+        with MBDataSnapshot(path) as snapshot:
+            if item_id is None:
+                if len(snapshot) != 1:
+                    raise UniversalisError(
+                        f"Snapshot holds {len(snapshot)} items; pass item_id")
+                item_id = next(iter(snapshot.items))
+            elif item_id not in snapshot.items:
+                raise UniversalisError(f"Item {item_id} is not in the snapshot")
+            return cls(snapshot.item(item_id), typed=typed)
+
+
+class _LazyItems(Mapping[int, MBDataResponseItem]):
+    """A mapping of item ID -> ``MBDataResponseItem`` that builds items on lookup."""
+
+    __slots__ = ('_raw', '_built', '_item_kwargs')
+
+    def __init__(self, raw: MutableMapping[int, dict], item_kwargs: dict) -> None:
+        self._raw = raw
+        self._built: dict[int, MBDataResponseItem] = {}
+        self._item_kwargs = item_kwargs
+
+    def __getitem__(self, item_id: int) -> MBDataResponseItem:
+        item = self._built.get(item_id)
+        if item is None:
+            item = MBDataResponseItem(self._raw[item_id], **self._item_kwargs)
+            self._built[item_id] = item
+        return item
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._raw)
 
+    def __len__(self) -> int:
+        return len(self._raw)
 
-class MBDataResponse(UniversalisAPIWrapper):
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._raw
+
+    def _set(self, item_id: int, item_info: dict) -> None:
+        """Replace the data for `item_id`, discarding any item already built."""
+        self._raw[item_id] = item_info
+        self._built.pop(item_id, None)
+
+
+class MBDataResponse:
     """
     An abstract representation of a Universalis API response for market board data.
 
@@ -190,58 +436,141 @@ class MBDataResponse(UniversalisAPIWrapper):
         conform to the schema provided by the public Universalis API.
     params : dict
         The params that were passed along with the request that generated `mb_data`.
+    client : UniversalisAPIWrapper or None, optional
+        The client that generated this response. Follow-up requests (e.g.
+        ``get_price_changes``) are sent through its connection pool. If not given,
+        each follow-up request opens (and closes) a temporary client.
+    typed : bool, optional
+        Decode each item into a compact ``MBItemRecord`` (see ``MBDataResponseItem``).
+        Defaults to ``False``.
+    keep_raw : bool, optional
+        In typed mode, keep `mb_data` as well as the records. Defaults to ``False``.
+    lazy : bool, optional
+        Defer building each ``MBDataResponseItem`` until it is looked up in `items`,
+        so a large response used for a few lookups costs almost nothing. Defaults to
+        ``False``.
     """
 
+    __slots__ = ('_client', '_typed', '_keep_raw', '_lazy', '_data', '_params',
+                 '_items', '_multi_item', '_meta', '_snapshot', 'unresolved_items')
+
     _MBDataResponse_logger = module_logger.getChild(__qualname__)
 
     def __init__(self, mb_data: dict, params: dict, *,
-                 session: aiohttp.ClientSession | None = None) -> None:
-        super().__init__(session=session)
-        self._instance_logger = self._MBDataResponse_logger.getChild(str(id(self)))
+                 client: UniversalisAPIWrapper | None = None,
+                 typed: bool = False,
+                 keep_raw: bool = False,
+                 lazy: bool = False) -> None:
+        self._client = client
+        self._typed = typed
+        self._keep_raw = keep_raw
+        self._lazy = lazy
 
         # store the raw data privately
-        self._data = mb_data
+        self._data: dict | None = mb_data
         self._params = params
+        # the file behind a lazily loaded response, kept open until closed
+        self._snapshot: MBDataSnapshot | None = None
 
         # initialize the private vars
-        self._items: dict[int, MBDataResponseItem]
+        self._items: Mapping[int, MBDataResponseItem]
         self.unresolved_items: list[int] | None
         self._reset()
 
     def _reset(self) -> None:
         """Reset this object using its new data."""
-        # response comes in two forms, so handle both
-        if 'items' in self._data:
-            # it's a list of items, create a dict of ID -> MBDataResponseItem
-            items_list = self._data['items'].values()
-            self._items = {item_info['itemID']: MBDataResponseItem(item_info)
-                           for item_info in items_list}
-        elif 'itemID' in self._data:
-            # otherwise, create a dict with the existing data as an MBDataResponseItem
-            self._items = {self._data['itemID']: MBDataResponseItem(self._data)}
+        data = cast(dict, self._data)
+        self._multi_item = 'items' in data
+        raw_items = self._raw_items(data)
+        if self._lazy:
+            self._items = _LazyItems(raw_items, self._item_kwargs)
         else:
-            # finally, if no valid items are found for some reason, iniate empty dict
-            self._items = {}
+            self._items = {item_id: MBDataResponseItem(item_info, **self._item_kwargs)
+                           for item_id, item_info in raw_items.items()}
 
         # store a list of the unresolved item IDs if there were any
-        self.unresolved_items = self._data.get('unresovledItems')
+        self.unresolved_items = data.get('unresolvedItems')
+
+        if self._typed and not self._keep_raw:
+            # the items hold everything else, so only keep the top-level fields
+            self._meta = {key: value for key, value in data.items()
+                          if key != 'items'} if self._multi_item else {}
+            self._data = None
+
+    @staticmethod
+    def _raw_items(data: dict) -> dict[int, dict]:
+        """Map item ID -> item info for either form of response."""
+        # response comes in two forms, so handle both
+        if 'items' in data:
+            # it's a list of items
+            return {item_info['itemID']: item_info
+                    for item_info in data['items'].values()}
+        elif 'itemID' in data:
+            # otherwise, the data is the item
+            return {data['itemID']: data}
+        # finally, if no valid items are found for some reason, use an empty dict
+        return {}
+
+    @property
+    def _item_kwargs(self) -> dict:
+        return {'typed': self._typed, 'keep_raw': self._keep_raw}
+
+    def _set_item(self, item_id: int, item_info: dict) -> None:
+        """Replace the item for `item_id` (and its data) in place."""
+        if isinstance(self._items, _LazyItems):
+            self._items._set(item_id, item_info)
+        else:
+            cast(dict, self._items)[item_id] = MBDataResponseItem(item_info,
+                                                                  **self._item_kwargs)
+        if self._data is not None:
+            if self._multi_item:
+                self._data['items'][str(item_id)] = item_info
+            else:
+                self._data = item_info
 
     @property
     def data(self) -> dict:
+        """
+        The response, in the API's format.
+
+        In typed mode without `keep_raw`, this is rebuilt from the items' records on
+        each access.
+        """
+        if self._data is None:
+            if not self._multi_item:
+                return next((item.data for item in self._items.values()), {})
+            return self._meta | {'items': {str(item_id): item.data for item_id, item
+                                           in self._items.items()}}
         return self._data
 
     @data.setter
-    def data(self, _) -> None:
+    def data(self, _: object) -> None:
         raise UniversalisError("Cannot set data of MBDataResponse object")
 
     @property
-    def items(self) -> dict[int, MBDataResponseItem]:
+    def items(self) -> Mapping[int, MBDataResponseItem]:
+        """
+        Mapping of item IDs to ``MBDataResponseItem`` objects.
+
+        With `lazy`, this is a read-only mapping that builds each item the first
+        time it is looked up.
+        """
         return self._items
 
     @items.setter
-    def items(self, _) -> None:
+    def items(self, _: object) -> None:
         raise UniversalisError("Cannot set items for MBDataResponse object")
 
+    @property
+    def params(self) -> Mapping[str, Any]:
+        """A read-only view of the params of the request behind this response."""
+        return MappingProxyType(self._params)
+
+    @property
+    def multi_item(self) -> bool:
+        """Whether the response is for several items, i.e. has an ``items`` key."""
+        return self._multi_item
+
     @property
     def best_prices(self) -> dict[int, int]:
         """
@@ -269,27 +598,103 @@ class MBDataResponse(UniversalisAPIWrapper):
             listing_ids.extend(item.listing_ids)
         return listing_ids
 
-    async def get_price_changes(self) -> dict[int, dict]:
+    def __enter__(self) -> Self:
+        """Return the response, which is closed on exit."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Close the response."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the snapshot file behind a response from ``load`` with `lazy`.
+
+        Items already looked up stay usable; looking up any others raises
+        ``UniversalisError``. Does nothing for other responses.
         """
-        Rerun this response's initial search and check for changes.
+        if self._snapshot is not None:
+            self._snapshot.close()
 
-        This function changes the data stored in this object. Any existing items will
-        become inaccessible.
+    def save(self, path: str | Path) -> int:
+        """
+        Write this response to a snapshot file.
+
+        Snapshots are column-oriented binary files, a fraction of the size of the
+        JSON response. Loading one lazily is much faster than parsing the JSON when
+        only some items are looked up, but decoding a whole snapshot is around 1.5x
+        slower, as its rows are built in Python rather than by the C JSON decoder; see
+        ``universalisapi.api_objects.snapshot``.
+
+        Parameters
+        ----------
+        path : str or Path
 
         Returns
         -------
-        price_changes : dict[int, dict]
-            A dictionary of all items whose best prices have changed, where keys are
-            item_ids, and where the values are a dict of the following format:
-                'item_id': `int`, the ID of the item
-                'old_price': `int`, the previous best price
-                'new_price': `int`, the current best price
-                'listings': `list[dict]`, the listings that are prices than the
-                old price
+        int
+            The size of the file, in bytes.
         """
-        # fetch new data
-        self._instance_logger.info("Passing params to wrapper call")
-        new_data = await self._get_mb_current_data(
+        return write_snapshot(path, self.data, self._params)
+
+    @classmethod
+    def load(cls, path: str | Path, *,
+             client: UniversalisAPIWrapper | None = None,
+             typed: bool = False,
+             keep_raw: bool = False,
+             lazy: bool = True) -> Self:
+        """
+        Read a response written by ``save``.
+
+        Parameters
+        ----------
+        path : str or Path
+        client : UniversalisAPIWrapper or None, optional
+            See ``MBDataResponse``.
+        typed : bool, optional
+            See ``MBDataResponse``. Defaults to ``False``.
+        keep_raw : bool, optional
+            See ``MBDataResponse``. Defaults to ``False``.
+        lazy : bool, optional
+            Keep the file memory-mapped and decode each item the first time it is
+            looked up in `items`, so only the header is read up front. The file
+            stays mapped until the response is closed, with ``close`` or a ``with``
+            block, or garbage collected. Otherwise, decode the whole file and close
+            it. Defaults to ``True``.
+
+        Returns
+        -------
+        MBDataResponse
+
+        Raises
+        ------
+        UniversalisError
+            If the file is not a snapshot.
+        """
+        snapshot = MBDataSnapshot(path)
+        if not lazy:
+            with snapshot:
+                return cls(snapshot.data, snapshot.params, client=client,
+                           typed=typed, keep_raw=keep_raw)
+        response = cls({}, snapshot.params, client=client, typed=typed,
+                       keep_raw=keep_raw, lazy=True)
+        response._snapshot = snapshot
+        response._multi_item = snapshot.multi_item
+        response._meta = snapshot.meta
+        # rebuilt from the items on access, like in typed mode
+        response._data = None
+        # replaced items go in the front map, leaving the file untouched; ChainMap
+        # only writes to its first map, so the read-only snapshot items are safe
+        items = cast(MutableMapping[int, dict], snapshot.items)
+        response._items = _LazyItems(ChainMap({}, items), response._item_kwargs)
+        response.unresolved_items = snapshot.meta.get('unresolvedItems')
+        return response
+
+    async def _fetch(self, client: UniversalisAPIWrapper) -> dict:
+        """Rerun this response's initial search through `client`."""
+        return await client._get_mb_current_data(
             self._params['item_ids'],
             self._params['region'],
             listings=self._params['listings'],
@@ -300,28 +705,110 @@ class MBDataResponse(UniversalisAPIWrapper):
             fields=self._params['fields']
         )
 
-        # setup a dummy MBDataResponse
-        # TODO find a better way of doing this?
-        self._instance_logger.info("Creating new response object for comparison")
-        new_resp_obj = MBDataResponse(new_data, self._params.copy())
+    def update(self, new_data: dict) -> dict[int, dict]:
+        """
+        Apply a fresh response for the same request to this object, in place.
 
-        price_changes: dict[int, dict] = {}
-        item_comp_dict: dict[int, tuple[MBDataResponseItem, MBDataResponseItem]] = {
-            item_id: item_comp_info
-            for item_id, item_comp_info in
-            zip(self.items.keys(),
-                zip(self.items.values(),
-                    new_resp_obj.items.values()
-                    )
-                )
-        }
+        Items are matched on item ID, and their listings on listing ID, in a single
+        pass. Items whose ``lastUploadTime`` hasn't changed are skipped; every other
+        item is replaced by its new version (previously fetched ``MBDataResponseItem``
+        objects for those items are left untouched).
 
-        for item_id, (old_item, new_item) in item_comp_dict.items():
-            price_changes[item_id] = {
-                'item_id': item_id,
-                'old_price': old_item.best_price,
-                'new_price': new_item.best_price,
-                'listings': new_item.get_better_listings(old_item.best_price)
-            }
+        Parameters
+        ----------
+        new_data : dict
+            A response to the same request as this one, e.g. from
+            ``UniversalisAPIWrapper._get_mb_current_data``.
 
+        Returns
+        -------
+        price_changes : dict[int, dict]
+            A dictionary of every item that was re-uploaded, where keys are item_ids,
+            and where the values are a dict of the following format:
+                'item_id': `int`, the ID of the item
+                'old_price': `int` or `None`, the previous best price (`None` if the
+                item is new to this response)
+                'new_price': `int`, the current best price
+                'listings': `list[dict]`, the listings that are priced lower than the
+                old price
+                'added': `list[dict]`, listings that are new
+                'removed': `list[dict]`, listings that are gone
+                'repriced': `list[tuple[dict, dict]]`, (old, new) pairs of listings
+                whose price per unit changed
+        """
+        if self._data is not None and self._multi_item:
+            # don't modify the dict this object was created from
+            self._data = self._data | {'items': dict(self._data['items'])}
+
+        price_changes: dict[int, dict] = {}
+        for item_id, item_info in self._raw_items(new_data).items():
+            old_item = self._items.get(item_id)
+            if old_item is not None:
+                old_upload_time = old_item._last_upload_time_ms
+                if (old_upload_time is not None
+                        and old_upload_time == item_info.get('lastUploadTime')):
+                    continue
+            self._set_item(item_id, item_info)
+            price_changes[item_id] = _diff_items(item_id, old_item,
+                                                 self._items[item_id])
+
+        self.unresolved_items = new_data.get('unresolvedItems')
+        self._MBDataResponse_logger.debug("Applied update",
+                                          extra={'n_changed': len(price_changes)})
         return price_changes
+
+    async def get_price_changes(self) -> dict[int, dict]:
+        """
+        Rerun this response's initial search and apply the changes in place.
+
+        See ``update`` for how changes are found.
+
+        Returns
+        -------
+        price_changes : dict[int, dict]
+            See ``update``.
+        """
+        # fetch new data
+        self._MBDataResponse_logger.info("Passing params to wrapper call")
+        if self._client is not None:
+            new_data = await self._fetch(self._client)
+        else:
+            async with UniversalisAPIWrapper() as client:
+                new_data = await self._fetch(client)
+        return self.update(new_data)
+
+
+def _listings_by_id(item: MBDataResponseItem | None) -> dict[str, dict | ListingRecord]:
+    """Map listing ID -> listing for `item`, if it has listings."""
+    if item is None or 'listings' not in item._source:
+        return {}
+    return {listing['listingID']: listing for listing in item.listings}
+
+
+def _diff_items(item_id: int, old_item: MBDataResponseItem | None,
+                new_item: MBDataResponseItem) -> dict:
+    """Compare two versions of an item; see ``MBDataResponse.update``."""
+    old_listings = _listings_by_id(old_item)
+    new_listings = _listings_by_id(new_item)
+    added = []
+    repriced = []
+    for listing_id, listing in new_listings.items():
+        old_listing = old_listings.get(listing_id)
+        if old_listing is None:
+            added.append(listing)
+        elif old_listing['pricePerUnit'] != listing['pricePerUnit']:
+            repriced.append((old_listing, listing))
+    removed = [listing for listing_id, listing in old_listings.items()
+               if listing_id not in new_listings]
+
+    old_price = None if old_item is None else old_item.best_price
+    return {
+        'item_id': item_id,
+        'old_price': old_price,
+        'new_price': new_item.best_price,
+        'listings': ([] if old_price is None
+                     else new_item.get_better_listings(old_price)),
+        'added': added,
+        'removed': removed,
+        'repriced': repriced,
+    }
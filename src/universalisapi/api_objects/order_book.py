@@ -0,0 +1,525 @@
+"""Incrementally updated order books of market board listings."""
+
+import logging
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import groupby
+from typing import TYPE_CHECKING
+
+from ..exceptions import UniversalisError
+from .mb_data import MBDataResponse, MBDataResponseItem
+from .records import ListingRecord
+
+if TYPE_CHECKING:
+    from ..websocket import MarketEvent
+
+
+module_logger = logging.getLogger(__name__)
+
+# a listing is kept as one int: its price, quantity and HQ flag packed together
+_QUANTITY_BITS = 20
+_MAX_QUANTITY = (1 << _QUANTITY_BITS) - 1
+
+
+class _PriceLevels:
+    """
+    Distinct prices in ascending order, with the units and listings at each.
+
+    Prices are found with a binary search, but adding or removing a level shifts
+    the levels above it, so those updates take time linear in the number of
+    levels. Books rarely have more than a few hundred, and shifting a flat array
+    that size is cheaper than maintaining a tree in Python.
+    """
+
+    __slots__ = ('prices', 'quantities', 'counts')
+
+    def __init__(self) -> None:
+        self.prices = array('q')
+        self.quantities = array('q')
+        self.counts = array('l')
+
+    def __len__(self) -> int:
+        """Return the number of distinct prices."""
+        return len(self.prices)
+
+    def add(self, price: int, quantity: int) -> None:
+        prices = self.prices
+        i = bisect_left(prices, price)
+        if i < len(prices) and prices[i] == price:
+            self.quantities[i] += quantity
+            self.counts[i] += 1
+        else:
+            prices.insert(i, price)
+            self.quantities.insert(i, quantity)
+            self.counts.insert(i, 1)
+
+    def remove(self, price: int, quantity: int) -> None:
+        i = bisect_left(self.prices, price)
+        if self.counts[i] == 1:
+            del self.prices[i]
+            del self.quantities[i]
+            del self.counts[i]
+        else:
+            self.quantities[i] -= quantity
+            self.counts[i] -= 1
+
+    def quantity_at(self, price: int) -> int:
+        i = bisect_left(self.prices, price)
+        if i < len(self.prices) and self.prices[i] == price:
+            return self.quantities[i]
+        return 0
+
+    def top(self, k: int) -> Iterator[tuple[int, int]]:
+        return zip(self.prices[:k], self.quantities[:k])
+
+
+class OrderBook:
+    """
+    The listings for one item on one world, kept as price levels.
+
+    Each quality (NQ and HQ) has its own levels: the distinct prices in ascending
+    order, with the units and number of listings at each price, kept sorted with
+    binary searches as listings are added, removed and repriced. The best price is
+    the first level, the units at a price are a binary search away, and the top `k`
+    levels are a slice; queries across both qualities merge the two. A listing at
+    a new price (or the last one at a price) inserts (or deletes) a level, which
+    is linear in the number of levels.
+
+    To keep memory down, the listings themselves aren't kept, only their IDs,
+    prices, quantities and qualities, packed into one int each.
+
+    Parameters
+    ----------
+    item_id : int
+    world_id : int
+    listings : Iterable[Mapping], optional
+        The listings to start with, as dicts from the API or anything else
+        indexable with their keys (e.g. ``ListingRecord``). Each needs
+        ``listingID``, ``pricePerUnit``, ``quantity`` and ``hq``.
+
+    Examples
+    --------
+    >>> book = OrderBook(5057, 73, item.listings)
+    >>> book.best_price(hq=True)
+    >>> book.top(5)                 # [(price, units), ...] for the 5 best prices
+    >>> book.reprice('1234', 900)
+    """
+
+    __slots__ = ('item_id', 'world_id', '_listings', '_nq', '_hq')
+
+    def __init__(self, item_id: int, world_id: int,
+                 listings: Iterable[Mapping] = ()) -> None:
+        self.item_id = item_id
+        self.world_id = world_id
+        self._listings: dict[int | str, int] = {}
+        self._nq = _PriceLevels()
+        self._hq = _PriceLevels()
+        packed = {}
+        for listing in listings:
+            packed[_listing_key(listing['listingID'])] = _pack(listing)
+        self._seed(packed)
+
+    def _seed(self, packed: dict[int | str, int]) -> None:
+        # levels are built in one pass over the sorted listings, not one at a time
+        self._listings.update(packed)
+        for key, group in groupby(sorted(packed.values(), key=_level), key=_level):
+            price, hq = key
+            quantities = [_quantity(listing) for listing in group]
+            levels = self._hq if hq else self._nq
+            levels.prices.append(price)
+            levels.quantities.append(sum(quantities))
+            levels.counts.append(len(quantities))
+
+    def __repr__(self) -> str:
+        """Return the book's item, world and number of listings."""
+        return (f'{type(self).__name__}(item_id={self.item_id}, '
+                f'world_id={self.world_id}, listings={len(self)})')
+
+    def __len__(self) -> int:
+        """Return the number of listings."""
+        return len(self._listings)
+
+    def __contains__(self, listing_id: object) -> bool:
+        """Return whether there is a listing with ID `listing_id`."""
+        if not isinstance(listing_id, (int, str)):
+            return False
+        return _listing_key(listing_id) in self._listings
+
+    def _levels(self, hq: bool | None) -> tuple[_PriceLevels, ...]:
+        if hq is None:
+            return self._nq, self._hq
+        return (self._hq,) if hq else (self._nq,)
+
+    @property
+    def units(self) -> int:
+        """The number of units for sale."""
+        return sum(self._hq.quantities) + sum(self._nq.quantities)
+
+    def best_price(self, hq: bool | None = None) -> int | None:
+        """
+        Return the lowest ``pricePerUnit``.
+
+        Parameters
+        ----------
+        hq : bool or None, optional
+            Only consider HQ (``True``) or NQ (``False``) listings. Defaults to
+            ``None``, i.e. all listings.
+
+        Returns
+        -------
+        int or None
+            ``None`` if there are no listings.
+        """
+        return min((levels.prices[0] for levels in self._levels(hq) if levels),
+                   default=None)
+
+    def depth_at(self, price: int, hq: bool | None = None) -> int:
+        """
+        Return the number of units for sale at exactly `price` per unit.
+
+        Parameters
+        ----------
+        price : int
+        hq : bool or None, optional
+            Only count HQ (``True``) or NQ (``False``) listings. Defaults to
+            ``None``, i.e. all listings.
+
+        Returns
+        -------
+        int
+        """
+        return sum(levels.quantity_at(price) for levels in self._levels(hq))
+
+    def top(self, k: int, hq: bool | None = None) -> list[tuple[int, int]]:
+        """
+        Return the `k` lowest prices, with the number of units for sale at each.
+
+        Parameters
+        ----------
+        k : int
+        hq : bool or None, optional
+            Only consider HQ (``True``) or NQ (``False``) listings. Defaults to
+            ``None``, i.e. all listings, with both qualities' units counted
+            together at prices they share.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            (price, units) pairs, cheapest first.
+        """
+        if hq is not None:
+            return list(self._levels(hq)[0].top(k))
+        top: list[tuple[int, int]] = []
+        # each side's first k levels are enough, even if none are shared
+        for price, quantity in sorted([*self._nq.top(k), *self._hq.top(k)]):
+            if top and top[-1][0] == price:
+                top[-1] = (price, top[-1][1] + quantity)
+            elif len(top) == k:
+                break
+            else:
+                top.append((price, quantity))
+        return top
+
+    def add(self, listing: Mapping) -> None:
+        """
+        Add `listing`, replacing any listing with the same ``listingID``.
+
+        Parameters
+        ----------
+        listing : Mapping
+
+        Raises
+        ------
+        UniversalisError
+            If the listing's price is negative, or its quantity is negative or
+            implausibly large.
+        """
+        key = _listing_key(listing['listingID'])
+        packed = _pack(listing)
+        old = self._listings.get(key)
+        if old is not None:
+            self._remove_packed(old)
+        self._listings[key] = packed
+        price, hq = _level(packed)
+        (self._hq if hq else self._nq).add(price, _quantity(packed))
+
+    def remove(self, listing_id: int | str) -> bool:
+        """
+        Remove the listing with ID `listing_id`.
+
+        Parameters
+        ----------
+        listing_id : int or str
+
+        Returns
+        -------
+        bool
+            Whether there was such a listing.
+        """
+        packed = self._listings.pop(_listing_key(listing_id), None)
+        if packed is None:
+            return False
+        self._remove_packed(packed)
+        return True
+
+    def reprice(self, listing_id: int | str, price: int) -> bool:
+        """
+        Change the ``pricePerUnit`` of the listing with ID `listing_id`.
+
+        Parameters
+        ----------
+        listing_id : int or str
+        price : int
+
+        Returns
+        -------
+        bool
+            Whether there was such a listing.
+        """
+        key = _listing_key(listing_id)
+        packed = self._listings.get(key)
+        if packed is None:
+            return False
+        self._remove_packed(packed)
+        quantity, hq = _quantity(packed), packed & 1
+        self._listings[key] = _pack_values(price, quantity, hq)
+        (self._hq if hq else self._nq).add(price, quantity)
+        return True
+
+    def _remove_packed(self, packed: int) -> None:
+        price, hq = _level(packed)
+        (self._hq if hq else self._nq).remove(price, _quantity(packed))
+
+
+class OrderBooks(Mapping[tuple[int, int], OrderBook]):
+    """
+    Order books for many items and worlds, e.g. every marketable item on a DC.
+
+    Books are keyed on (item ID, world ID), and only exist for pairs that have had
+    listings; a book that empties is dropped. They are seeded from
+    ``MBDataResponse`` objects, which only replace the books for the worlds they
+    cover, and then kept up to date by listing deltas, for example
+    ``listings/add`` and ``listings/remove`` events from a ``UniversalisWebSocket``.
+
+    Examples
+    --------
+    >>> books = OrderBooks.from_response(await client.mb_current_data(item_ids,
+    ...                                                               'crystal'))
+    >>> async for event in await ws.subscribe('listings/add'):
+    ...     books.apply(event)
+    ...     print(books[event.item_id, event.world_id].best_price())
+    """
+
+    __slots__ = ('_books', '_worlds')
+
+    def __init__(self) -> None:
+        self._books: dict[tuple[int, int], OrderBook] = {}
+        # item ID -> the worlds it has books on, so seeding needn't scan every book
+        self._worlds: dict[int, set[int]] = {}
+
+    @classmethod
+    def from_response(cls, response: MBDataResponse) -> 'OrderBooks':
+        """
+        Create order books from a response's listings.
+
+        Parameters
+        ----------
+        response : MBDataResponse
+
+        Returns
+        -------
+        OrderBooks
+
+        Raises
+        ------
+        UniversalisError
+            If a listing's world can't be told (region-level responses include each
+            listing's ``worldID``, and world-level responses the item's).
+        """
+        books = cls()
+        books.seed(response)
+        return books
+
+    def __getitem__(self, key: tuple[int, int]) -> OrderBook:
+        """Return the book for (item ID, world ID) `key`."""
+        return self._books[key]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Iterate over the (item ID, world ID) pairs with books."""
+        return iter(self._books)
+
+    def __len__(self) -> int:
+        """Return the number of books."""
+        return len(self._books)
+
+    def seed(self, response: MBDataResponse | MBDataResponseItem) -> None:
+        """
+        Replace the books for the items and worlds in `response` with its listings.
+
+        The worlds replaced are the response's world, or for a DC or region, the
+        worlds in its ``worldUploadTimes`` and listings. Books for other worlds
+        are kept, so responses for different worlds or DCs can be seeded in turn.
+
+        Parameters
+        ----------
+        response : MBDataResponse or MBDataResponseItem
+
+        Raises
+        ------
+        UniversalisError
+            If a listing's world can't be told.
+        """
+        items = ([response] if isinstance(response, MBDataResponseItem)
+                 else response.items.values())
+        for item in items:
+            item_id = item.item_id
+            item_world_id = item.world_id
+            by_world: dict[int, dict[int | str, int]] = {}
+            for listing in item.listings:
+                world_id = listing.get('worldID') or item_world_id
+                if world_id is None:
+                    raise UniversalisError(f"Listing for item {item_id} has no world")
+                by_world.setdefault(world_id, {})[
+                    _listing_key(listing['listingID'])] = _pack(listing)
+            covered = set(by_world)
+            if item_world_id is not None:
+                covered.add(item_world_id)
+            covered.update(item.world_upload_times)
+            for world_id in covered - by_world.keys():
+                self._drop(item_id, world_id)
+            for world_id, packed in by_world.items():
+                book = OrderBook(item_id, world_id)
+                book._seed(packed)
+                self._books[item_id, world_id] = book
+                self._worlds.setdefault(item_id, set()).add(world_id)
+
+    def book(self, item_id: int, world_id: int) -> OrderBook:
+        """
+        Return the book for (`item_id`, `world_id`), creating it if need be.
+
+        Parameters
+        ----------
+        item_id : int
+        world_id : int
+
+        Returns
+        -------
+        OrderBook
+        """
+        book = self._books.get((item_id, world_id))
+        if book is None:
+            book = self._books[item_id, world_id] = OrderBook(item_id, world_id)
+            self._worlds.setdefault(item_id, set()).add(world_id)
+        return book
+
+    def add(self, item_id: int, world_id: int, listing: Mapping) -> None:
+        """
+        Add (or replace) a listing.
+
+        Parameters
+        ----------
+        item_id : int
+        world_id : int
+        listing : Mapping
+        """
+        self.book(item_id, world_id).add(listing)
+
+    def remove(self, item_id: int, world_id: int, listing_id: int | str) -> bool:
+        """
+        Remove a listing.
+
+        Parameters
+        ----------
+        item_id : int
+        world_id : int
+        listing_id : int or str
+
+        Returns
+        -------
+        bool
+            Whether there was such a listing.
+        """
+        book = self._books.get((item_id, world_id))
+        if book is None or not book.remove(listing_id):
+            return False
+        if not book:
+            self._drop(item_id, world_id)
+        return True
+
+    def reprice(self, item_id: int, world_id: int, listing_id: int | str,
+                price: int) -> bool:
+        """
+        Change a listing's ``pricePerUnit``.
+
+        Parameters
+        ----------
+        item_id : int
+        world_id : int
+        listing_id : int or str
+        price : int
+
+        Returns
+        -------
+        bool
+            Whether there was such a listing.
+        """
+        book = self._books.get((item_id, world_id))
+        return book is not None and book.reprice(listing_id, price)
+
+    def _drop(self, item_id: int, world_id: int) -> None:
+        if self._books.pop((item_id, world_id), None) is not None:
+            worlds = self._worlds[item_id]
+            worlds.discard(world_id)
+            if not worlds:
+                del self._worlds[item_id]
+
+    def apply(self, event: 'MarketEvent') -> None:
+        """
+        Apply a ``listings/add`` or ``listings/remove`` event.
+
+        Other events are ignored. Universalis sends a repriced listing as a
+        ``listings/add`` event for the same ``listingID``, which replaces it.
+
+        Parameters
+        ----------
+        event : MarketEvent
+        """
+        if event.event == 'listings/add':
+            for listing in event.listings:
+                self.add(event.item_id, event.world_id, listing)
+        elif event.event == 'listings/remove':
+            for listing in event.listings:
+                self.remove(event.item_id, event.world_id, listing['listingID'])
+
+
+def _listing_key(listing_id: int | str) -> int | str:
+    """Return a compact dict key for a listing ID."""
+    # Universalis' IDs are decimal strings, which take half the memory as ints;
+    # leading zeros would be lost, so those are kept as strings
+    if isinstance(listing_id, str) and listing_id.isdecimal() and (
+            listing_id[0] != '0' or listing_id == '0'):
+        return int(listing_id)
+    return listing_id
+
+
+def _pack(listing: Mapping | ListingRecord) -> int:
+    return _pack_values(listing['pricePerUnit'], listing['quantity'],
+                        1 if listing['hq'] else 0)
+
+
+def _pack_values(price: int, quantity: int, hq: int) -> int:
+    if not 0 <= quantity <= _MAX_QUANTITY:
+        raise UniversalisError(f"Invalid listing quantity: {quantity}")
+    if price < 0:
+        raise UniversalisError(f"Invalid listing price: {price}")
+    return (price << (_QUANTITY_BITS + 1)) | (quantity << 1) | hq
+
+
+def _level(packed: int) -> tuple[int, int]:
+    """Return the price and HQ flag of a packed listing."""
+    return packed >> (_QUANTITY_BITS + 1), packed & 1
+
+
+def _quantity(packed: int) -> int:
+    return (packed >> 1) & _MAX_QUANTITY
@@ -0,0 +1,234 @@
+"""A price-sorted index of market board listings."""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import accumulate
+from typing import Any
+
+
+class PriceIndex:
+    """
+    Listings kept sorted by ``pricePerUnit``, for repeated threshold queries.
+
+    Threshold queries are binary searches, the K cheapest listings are a slice, and
+    the quantity available under a price comes from prefix sums. Listings can be
+    added and removed one at a time (e.g. from a live feed) without re-sorting;
+    prefix sums are rebuilt on the next quantity query.
+
+    Parameters
+    ----------
+    listings : Iterable[Mapping], optional
+        The listings to index, as dicts from the API or anything else indexable
+        with its keys (e.g. ``ListingRecord``). Each needs ``listingID``,
+        ``pricePerUnit``, ``quantity`` and ``hq``.
+    hq : bool or None, optional
+        Only index HQ (``True``) or NQ (``False``) listings, including those added
+        later. Defaults to ``None``, i.e. all listings.
+
+    Examples
+    --------
+    >>> index = PriceIndex(item.listings)
+    >>> index.better_than(1000)           # listings cheaper than 1000 gil each
+    >>> index.hq.cheapest(5)              # the five cheapest HQ listings
+    >>> index.quantity_below(1000)        # units available under 1000 gil each
+    """
+
+    __slots__ = ('_prices', '_listings', '_prices_by_id', '_cumulative', '_hq', '_nq',
+                 '_filter')
+
+    def __init__(self, listings: Iterable[Mapping] = (), *,
+                 hq: bool | None = None) -> None:
+        self._filter = hq
+        if hq is not None:
+            listings = (listing for listing in listings if listing['hq'] == hq)
+        ordered = sorted(listings, key=_price)
+        self._listings: list[Any] = ordered
+        self._prices: list[int] = [listing['pricePerUnit'] for listing in ordered]
+        self._prices_by_id: dict[str, int] = {listing['listingID']: price for
+                                              listing, price in zip(ordered,
+                                                                    self._prices)}
+        self._cumulative: list[int] | None = None
+        self._hq: PriceIndex | None = None
+        self._nq: PriceIndex | None = None
+
+    def __len__(self) -> int:
+        """Return the number of listings."""
+        return len(self._listings)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the listings, cheapest first."""
+        return iter(self._listings)
+
+    def __contains__(self, listing_id: object) -> bool:
+        """Return whether there is a listing with ID `listing_id`."""
+        return listing_id in self._prices_by_id
+
+    @property
+    def listings(self) -> list:
+        """Every listing, cheapest first. Do not modify."""
+        return self._listings
+
+    @property
+    def hq(self) -> 'PriceIndex':
+        """An index of the HQ listings only, kept up to date with this one."""
+        if self._hq is None:
+            self._hq = self._sub_index(True)
+        return self._hq
+
+    @property
+    def nq(self) -> 'PriceIndex':
+        """An index of the NQ listings only, kept up to date with this one."""
+        if self._nq is None:
+            self._nq = self._sub_index(False)
+        return self._nq
+
+    def _sub_index(self, hq: bool) -> 'PriceIndex':
+        if self._filter is not None and self._filter != hq:
+            # can never hold anything, but filters what is added to it all the same
+            return PriceIndex(hq=hq)
+        # already sorted, so sorting again is linear
+        return PriceIndex(self._listings, hq=hq)
+
+    def better_than(self, price: int) -> list:
+        """
+        Return the listings with a ``pricePerUnit`` below `price`, cheapest first.
+
+        Parameters
+        ----------
+        price : int
+
+        Returns
+        -------
+        list
+        """
+        return self._listings[:bisect_left(self._prices, price)]
+
+    def at_most(self, price: int) -> list:
+        """
+        Return the listings with a ``pricePerUnit`` of at most `price`, cheapest first.
+
+        Parameters
+        ----------
+        price : int
+
+        Returns
+        -------
+        list
+        """
+        return self._listings[:bisect_right(self._prices, price)]
+
+    def cheapest(self, k: int) -> list:
+        """
+        Return the `k` cheapest listings, cheapest first.
+
+        Parameters
+        ----------
+        k : int
+
+        Returns
+        -------
+        list
+        """
+        return self._listings[:k]
+
+    @property
+    def best_price(self) -> int | None:
+        """The lowest ``pricePerUnit``, or ``None`` if there are no listings."""
+        return self._prices[0] if self._prices else None
+
+    @property
+    def cumulative_quantities(self) -> list[int]:
+        """
+        Prefix sums of ``quantity``, cheapest first.
+
+        Element ``i`` is the number of units in the ``i`` cheapest listings, so the
+        first element is always 0.
+        """
+        if self._cumulative is None:
+            self._cumulative = list(accumulate(
+                (listing['quantity'] for listing in self._listings), initial=0))
+        return self._cumulative
+
+    def quantity_below(self, price: int) -> int:
+        """
+        Return the number of units for sale at a ``pricePerUnit`` below `price`.
+
+        Parameters
+        ----------
+        price : int
+
+        Returns
+        -------
+        int
+        """
+        return self.cumulative_quantities[bisect_left(self._prices, price)]
+
+    def quantity_at_most(self, price: int) -> int:
+        """
+        Return the number of units for sale at a ``pricePerUnit`` of at most `price`.
+
+        Parameters
+        ----------
+        price : int
+
+        Returns
+        -------
+        int
+        """
+        return self.cumulative_quantities[bisect_right(self._prices, price)]
+
+    def add(self, listing: Mapping) -> None:
+        """
+        Add `listing`, replacing any listing with the same ``listingID``.
+
+        Parameters
+        ----------
+        listing : Mapping
+        """
+        listing_id = listing['listingID']
+        if listing_id in self._prices_by_id:
+            self.remove(listing_id)
+        if self._filter is not None and listing['hq'] != self._filter:
+            return
+        for sub_index in (self._hq, self._nq):
+            if sub_index is not None:
+                sub_index.add(listing)
+        price = listing['pricePerUnit']
+        i = bisect_right(self._prices, price)
+        self._prices.insert(i, price)
+        self._listings.insert(i, listing)
+        self._prices_by_id[listing_id] = price
+        self._cumulative = None
+
+    def remove(self, listing_id: str) -> bool:
+        """
+        Remove the listing with ID `listing_id`.
+
+        Parameters
+        ----------
+        listing_id : str
+
+        Returns
+        -------
+        bool
+            Whether there was such a listing.
+        """
+        for sub_index in (self._hq, self._nq):
+            if sub_index is not None:
+                sub_index.remove(listing_id)
+        price = self._prices_by_id.pop(listing_id, None)
+        if price is None:
+            return False
+        # only listings at the same price need checking
+        for i in range(bisect_left(self._prices, price),
+                       bisect_right(self._prices, price)):
+            if self._listings[i]['listingID'] == listing_id:
+                del self._prices[i]
+                del self._listings[i]
+                break
+        self._cumulative = None
+        return True
+
+
+def _price(listing: Mapping) -> int:
+    return listing['pricePerUnit']
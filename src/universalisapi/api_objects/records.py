@@ -0,0 +1,515 @@
+"""
+Compact typed records for market board data.
+
+These mirror the ``CurrentlyShownView`` schema published by Universalis for
+/``region``/``item_ids`` responses, and the schema of /aggregated/``region``/
+``item_ids`` results, with ``snake_case`` attribute names. Records are slotted
+dataclasses, so each one costs a fraction of the ``dict`` it replaces.
+
+Records can still be indexed with the API's ``camelCase`` keys (e.g.
+``listing['pricePerUnit']``), so code written against raw dicts keeps working,
+and ``to_dict`` converts them back to the API's format.
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Self
+
+
+class _Record:
+    """Mapping-style access to a record using the API's key names."""
+
+    __slots__ = ()
+
+    _absent: frozenset[str] = frozenset()
+    """API keys missing from the data the record was made from."""
+    _keys: ClassVar[dict[str, str]]
+    """Mapping of API key -> attribute name."""
+    _optional_keys: ClassVar[frozenset[str]] = frozenset()
+    """API keys that are left out of ``to_dict`` when their value is ``None``."""
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401 (type depends on key)
+        try:
+            return getattr(self, self._keys[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        # keys left out of ``to_dict`` are missing
+        if key in self._absent:
+            return False
+        if key in self._optional_keys:
+            return getattr(self, self._keys[key]) is not None
+        return key in self._keys
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Return the value for API key `key`, or `default`."""
+        attr = self._keys.get(key)
+        if attr is None or key in self._absent:
+            return default
+        return getattr(self, attr)
+
+    @classmethod
+    def _values_from_dict(cls, data: dict) -> dict[str, Any]:
+        values: dict[str, Any] = {attr: data.get(key)
+                                  for key, attr in cls._keys.items()}
+        # missing keys are None on the record, but left out of ``to_dict`` (which
+        # already leaves out optional keys that are None)
+        absent = cls._keys.keys() - data.keys() - cls._optional_keys
+        if absent:
+            values['_absent'] = frozenset(absent)
+        return values
+
+    def to_dict(self) -> dict:
+        """
+        Convert this record back into the API's ``dict`` format.
+
+        Returns
+        -------
+        dict
+        """
+        data = {}
+        for key, attr in self._keys.items():
+            if key in self._absent:
+                continue
+            value = getattr(self, attr)
+            if value is None and key in self._optional_keys:
+                continue
+            data[key] = value
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class ListingRecord(_Record):
+    """A single market board listing."""
+
+    listing_id: str
+    price_per_unit: int
+    quantity: int
+    total: int
+    tax: int
+    hq: bool
+    is_crafted: bool
+    on_mannequin: bool
+    last_review_time: int
+    world_id: int | None
+    world_name: str | None
+    retainer_id: str
+    retainer_name: str
+    retainer_city: int
+    creator_id: str | None
+    creator_name: str
+    seller_id: str | None
+    stain_id: int
+    materia: tuple[tuple[int, int], ...]
+    _absent: frozenset[str] = field(default=frozenset(), repr=False)
+
+    _keys: ClassVar[dict[str, str]] = {
+        'listingID': 'listing_id',
+        'pricePerUnit': 'price_per_unit',
+        'quantity': 'quantity',
+        'total': 'total',
+        'tax': 'tax',
+        'hq': 'hq',
+        'isCrafted': 'is_crafted',
+        'onMannequin': 'on_mannequin',
+        'lastReviewTime': 'last_review_time',
+        'worldID': 'world_id',
+        'worldName': 'world_name',
+        'retainerID': 'retainer_id',
+        'retainerName': 'retainer_name',
+        'retainerCity': 'retainer_city',
+        'creatorID': 'creator_id',
+        'creatorName': 'creator_name',
+        'sellerID': 'seller_id',
+        'stainID': 'stain_id',
+        'materia': 'materia',
+    }
+    _optional_keys: ClassVar[frozenset[str]] = frozenset({'worldID', 'worldName'})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from a listing in an API response.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        ListingRecord
+        """
+        values = cls._values_from_dict(data)
+        values['materia'] = tuple((m['slotID'], m['materiaID'])
+                                  for m in data.get('materia') or ())
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        """
+        Convert this record back into the API's ``dict`` format.
+
+        Returns
+        -------
+        dict
+        """
+        data = _Record.to_dict(self)
+        if 'materia' in data:
+            data['materia'] = [{'slotID': slot_id, 'materiaID': materia_id}
+                               for slot_id, materia_id in self.materia]
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class SaleRecord(_Record):
+    """A single sale from an item's recent history."""
+
+    price_per_unit: int
+    quantity: int
+    total: int
+    hq: bool
+    on_mannequin: bool
+    timestamp: int
+    world_id: int | None
+    world_name: str | None
+    buyer_name: str | None
+    _absent: frozenset[str] = field(default=frozenset(), repr=False)
+
+    _keys: ClassVar[dict[str, str]] = {
+        'pricePerUnit': 'price_per_unit',
+        'quantity': 'quantity',
+        'total': 'total',
+        'hq': 'hq',
+        'onMannequin': 'on_mannequin',
+        'timestamp': 'timestamp',
+        'worldID': 'world_id',
+        'worldName': 'world_name',
+        'buyerName': 'buyer_name',
+    }
+    _optional_keys: ClassVar[frozenset[str]] = frozenset({'worldID', 'worldName'})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from a sale in an API response.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        SaleRecord
+        """
+        return cls(**cls._values_from_dict(data))
+
+
+@dataclass(slots=True, frozen=True)
+class MBItemRecord(_Record):
+    """Market board data for a single item in a region."""
+
+    item_id: int
+    last_upload_time: int
+    listings: tuple[ListingRecord, ...]
+    recent_history: tuple[SaleRecord, ...]
+    world_id: int | None
+    world_name: str | None
+    dc_name: str | None
+    region_name: str | None
+    current_average_price: float
+    current_average_price_nq: float
+    current_average_price_hq: float
+    regular_sale_velocity: float
+    nq_sale_velocity: float
+    hq_sale_velocity: float
+    average_price: float
+    average_price_nq: float
+    average_price_hq: float
+    min_price: int
+    min_price_nq: int
+    min_price_hq: int
+    max_price: int
+    max_price_nq: int
+    max_price_hq: int
+    stack_size_histogram: dict[str, int]
+    stack_size_histogram_nq: dict[str, int]
+    stack_size_histogram_hq: dict[str, int]
+    world_upload_times: dict[str, int] | None
+    listings_count: int
+    recent_history_count: int
+    units_for_sale: int
+    units_sold: int
+    has_data: bool
+    _absent: frozenset[str] = field(default=frozenset(), repr=False)
+
+    _keys: ClassVar[dict[str, str]] = {
+        'itemID': 'item_id',
+        'lastUploadTime': 'last_upload_time',
+        'listings': 'listings',
+        'recentHistory': 'recent_history',
+        'worldID': 'world_id',
+        'worldName': 'world_name',
+        'dcName': 'dc_name',
+        'regionName': 'region_name',
+        'currentAveragePrice': 'current_average_price',
+        'currentAveragePriceNQ': 'current_average_price_nq',
+        'currentAveragePriceHQ': 'current_average_price_hq',
+        'regularSaleVelocity': 'regular_sale_velocity',
+        'nqSaleVelocity': 'nq_sale_velocity',
+        'hqSaleVelocity': 'hq_sale_velocity',
+        'averagePrice': 'average_price',
+        'averagePriceNQ': 'average_price_nq',
+        'averagePriceHQ': 'average_price_hq',
+        'minPrice': 'min_price',
+        'minPriceNQ': 'min_price_nq',
+        'minPriceHQ': 'min_price_hq',
+        'maxPrice': 'max_price',
+        'maxPriceNQ': 'max_price_nq',
+        'maxPriceHQ': 'max_price_hq',
+        'stackSizeHistogram': 'stack_size_histogram',
+        'stackSizeHistogramNQ': 'stack_size_histogram_nq',
+        'stackSizeHistogramHQ': 'stack_size_histogram_hq',
+        'worldUploadTimes': 'world_upload_times',
+        'listingsCount': 'listings_count',
+        'recentHistoryCount': 'recent_history_count',
+        'unitsForSale': 'units_for_sale',
+        'unitsSold': 'units_sold',
+        'hasData': 'has_data',
+    }
+    _optional_keys: ClassVar[frozenset[str]] = frozenset(
+        {'worldID', 'worldName', 'dcName', 'regionName', 'worldUploadTimes'})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from a single item's data in an API response.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        MBItemRecord
+        """
+        values = cls._values_from_dict(data)
+        values['listings'] = tuple(map(ListingRecord.from_dict,
+                                       data.get('listings') or ()))
+        values['recent_history'] = tuple(map(SaleRecord.from_dict,
+                                             data.get('recentHistory') or ()))
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        """
+        Convert this record back into the API's ``dict`` format.
+
+        Returns
+        -------
+        dict
+        """
+        data = _Record.to_dict(self)
+        if 'listings' in data:
+            data['listings'] = [listing.to_dict() for listing in self.listings]
+        if 'recentHistory' in data:
+            data['recentHistory'] = [sale.to_dict() for sale in self.recent_history]
+        return data
+
+    @property
+    def region_info(self) -> str | None:
+        """The most specific of world, DC or region name for this data."""
+        return self.world_name or self.dc_name or self.region_name
+
+
+@dataclass(slots=True, frozen=True)
+class AggregatedValue(_Record):
+    """One tier (world, DC or region) of an aggregated statistic."""
+
+    price: float | None
+    quantity: float | None
+    world_id: int | None
+    timestamp: int | None
+
+    _keys: ClassVar[dict[str, str]] = {
+        'price': 'price',
+        'quantity': 'quantity',
+        'worldId': 'world_id',
+        'timestamp': 'timestamp',
+    }
+    _optional_keys: ClassVar[frozenset[str]] = frozenset(_keys)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from one tier of an aggregated statistic.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        AggregatedValue
+        """
+        return cls(**cls._values_from_dict(data))
+
+    @property
+    def value(self) -> float | None:
+        """The ``price``, or the ``quantity`` for statistics without a price."""
+        return self.quantity if self.price is None else self.price
+
+
+@dataclass(slots=True, frozen=True)
+class AggregatedStat(_Record):
+    """An aggregated statistic, for each tier Universalis has data for."""
+
+    world: AggregatedValue | None
+    dc: AggregatedValue | None
+    region: AggregatedValue | None
+
+    _keys: ClassVar[dict[str, str]] = {'world': 'world', 'dc': 'dc', 'region': 'region'}
+    _optional_keys: ClassVar[frozenset[str]] = frozenset(_keys)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from an aggregated statistic.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        AggregatedStat
+        """
+        return cls(**{attr: AggregatedValue.from_dict(data[key]) if key in data
+                      else None for key, attr in cls._keys.items()})
+
+    def to_dict(self) -> dict:
+        """
+        Convert this record back into the API's ``dict`` format.
+
+        Returns
+        -------
+        dict
+        """
+        return {key: value.to_dict() for key, value in
+                (('world', self.world), ('dc', self.dc), ('region', self.region))
+                if value is not None}
+
+    @property
+    def best(self) -> AggregatedValue | None:
+        """The most specific of the world, DC or region tier, if there are any."""
+        return self.world or self.dc or self.region
+
+
+@dataclass(slots=True, frozen=True)
+class AggregatedStats(_Record):
+    """The aggregated statistics for one quality (NQ or HQ) of an item."""
+
+    min_listing: AggregatedStat
+    recent_purchase: AggregatedStat
+    average_sale_price: AggregatedStat
+    daily_sale_velocity: AggregatedStat
+
+    _keys: ClassVar[dict[str, str]] = {
+        'minListing': 'min_listing',
+        'recentPurchase': 'recent_purchase',
+        'averageSalePrice': 'average_sale_price',
+        'dailySaleVelocity': 'daily_sale_velocity',
+    }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from the statistics for one quality of an item.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        AggregatedStats
+        """
+        return cls(**{attr: AggregatedStat.from_dict(data.get(key) or {})
+                      for key, attr in cls._keys.items()})
+
+    def to_dict(self) -> dict:
+        """
+        Convert this record back into the API's ``dict`` format.
+
+        Returns
+        -------
+        dict
+        """
+        return {key: getattr(self, attr).to_dict() for key, attr in self._keys.items()}
+
+
+@dataclass(slots=True, frozen=True)
+class AggregatedItemRecord(_Record):
+    """Aggregated market board data for a single item."""
+
+    item_id: int
+    nq: AggregatedStats
+    hq: AggregatedStats
+    world_upload_times: tuple[tuple[int, int], ...] | None
+    """Pairs of (world ID, upload time in milliseconds since the epoch)."""
+
+    _keys: ClassVar[dict[str, str]] = {
+        'itemId': 'item_id',
+        'nq': 'nq',
+        'hq': 'hq',
+        'worldUploadTimes': 'world_upload_times',
+    }
+    _optional_keys: ClassVar[frozenset[str]] = frozenset({'worldUploadTimes'})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """
+        Create a record from a single result of an /aggregated response.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        AggregatedItemRecord
+        """
+        upload_times = data.get('worldUploadTimes')
+        if upload_times is not None:
+            upload_times = tuple((upload['worldId'], upload['timestamp'])
+                                 for upload in upload_times)
+        return cls(item_id=data['itemId'],
+                   nq=AggregatedStats.from_dict(data.get('nq') or {}),
+                   hq=AggregatedStats.from_dict(data.get('hq') or {}),
+                   world_upload_times=upload_times)
+
+    def to_dict(self) -> dict:
+        """
+        Convert this record back into the API's ``dict`` format.
+
+        Returns
+        -------
+        dict
+        """
+        data = {'itemId': self.item_id, 'nq': self.nq.to_dict(),
+                'hq': self.hq.to_dict()}
+        if self.world_upload_times is not None:
+            data['worldUploadTimes'] = [{'worldId': world_id, 'timestamp': timestamp}
+                                        for world_id, timestamp
+                                        in self.world_upload_times]
+        return data
+
+
+def _check_keys(record_cls: type[_Record]) -> None:
+    """Make sure every dataclass field of `record_cls` has an API key."""
+    attrs = {f.name for f in fields(record_cls)  # type: ignore[arg-type]
+             if f.name != '_absent'}
+    if attrs != set(record_cls._keys.values()):
+        raise TypeError(f"{record_cls.__name__} keys and fields differ")
+
+
+for _cls in (ListingRecord, SaleRecord, MBItemRecord, AggregatedValue, AggregatedStat,
+             AggregatedStats, AggregatedItemRecord):
+    _check_keys(_cls)
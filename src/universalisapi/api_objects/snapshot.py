@@ -0,0 +1,608 @@
+"""
+A compact, column-oriented binary file format for /``region``/``item_ids`` responses.
+
+A snapshot holds three tables (items, listings and sales) with one column per API
+key. Numbers and booleans are stored in fixed-width columns, and strings (and any
+nested values, as JSON) in a shared dictionary that each distinct string is written
+to once, so repeated world, retainer and materia values cost a 4-byte reference.
+Values that don't fit a column's type, ``None``, and missing keys are recorded per
+cell, so responses round-trip exactly.
+
+Snapshots are read through :mod:`mmap`: opening one only reads its header, and
+each item, listing or sale is decoded the first time it is asked for.
+
+Layout (little-endian)::
+
+    magic (8 bytes) | header length (uint32) | header (JSON) | padding
+    column data, each column 8-byte aligned
+"""
+
+import json
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from ..exceptions import UniversalisError
+
+
+module_logger = logging.getLogger(__name__)
+
+MAGIC = b'UNIVSNP1'
+_HEADER_SIZE = struct.Struct('<I')
+
+# per-cell tags, stored only for columns where some cell isn't a plain value
+_MISSING = 0
+_NONE = 1
+_VALUE = 2
+_JSON = 3
+
+# column kinds: fixed-width values, or references into the string dictionary
+_INT = 'q'
+_FLOAT = 'd'
+_BOOL = 'B'
+_STR = 's'
+_NESTED = 'j'
+_TYPECODES = {_INT: 'q', _FLOAT: 'd', _BOOL: 'B', _STR: 'i', _NESTED: 'i'}
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+_ABSENT = object()
+
+
+def write_snapshot(path: str | Path, data: dict, params: dict | None = None) -> int:
+    """
+    Write a /``region``/``item_ids`` response to a snapshot file.
+
+    Parameters
+    ----------
+    path : str or Path
+    data : dict
+        The response in the API's format, for one item or many.
+    params : dict or None, optional
+        The request's parameters, stored alongside (must be JSON-serializable).
+
+    Returns
+    -------
+    int
+        The size of the file, in bytes.
+    """
+    if sys.byteorder != 'little':
+        raise UniversalisError("Snapshots can only be written on little-endian hosts")
+    multi_item = 'items' in data
+    item_infos = list(data['items'].values()) if multi_item else [data] if data else []
+    meta = {key: value for key, value in data.items() if key != 'items'} \
+        if multi_item else {}
+
+    strings = _StringTable()
+    chunks: list[bytes] = []
+    offset = 0
+
+    def _add(values: array) -> int:
+        nonlocal offset
+        start = offset
+        raw = values.tobytes()
+        raw += b'\x00' * (-len(raw) % 8)
+        chunks.append(raw)
+        offset += len(raw)
+        return start
+
+    tables: dict[str, Any] = {}
+    items: list[dict] = []
+    listings: list[dict] = []
+    sales: list[dict] = []
+    listing_offsets = array('q', [0])
+    sale_offsets = array('q', [0])
+    for item_info in item_infos:
+        items.append({key: value for key, value in item_info.items()
+                      if key not in ('listings', 'recentHistory')})
+        listings.extend(item_info.get('listings') or ())
+        sales.extend(item_info.get('recentHistory') or ())
+        listing_offsets.append(len(listings))
+        sale_offsets.append(len(sales))
+    for name, rows in (('items', items), ('listings', listings), ('sales', sales)):
+        tables[name] = {'rows': len(rows),
+                        'columns': _write_table(rows, strings, _add)}
+    # which items have the key at all, so missing and empty lists are told apart
+    has_listings = array('B', ('listings' in info for info in item_infos))
+    has_sales = array('B', ('recentHistory' in info for info in item_infos))
+    tables['items']['listings'] = [_add(listing_offsets), _add(has_listings)]
+    tables['items']['sales'] = [_add(sale_offsets), _add(has_sales)]
+    string_offsets, string_data = strings.encode()
+    header = {'version': 1, 'multi_item': multi_item, 'meta': meta,
+              'params': params or {}, 'tables': tables,
+              'strings': [len(string_offsets) - 1, _add(string_offsets),
+                          _add(array('B', string_data))]}
+
+    encoded_header = _dumps(header).encode()
+    prefix = MAGIC + _HEADER_SIZE.pack(len(encoded_header)) + encoded_header
+    prefix += b'\x00' * (-len(prefix) % 8)
+    with open(path, 'wb') as f:
+        f.write(prefix)
+        for chunk in chunks:
+            f.write(chunk)
+    return len(prefix) + offset
+
+
+def _write_table(rows: list[dict], strings: '_StringTable',
+                 add: Callable[[array], int]) -> dict[str, list]:
+    """Write one column per key in `rows`; return each column's kind and offsets."""
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+    columns = {}
+    for key in keys:
+        cells = [row.get(key, _ABSENT) for row in rows]
+        kind = _column_kind(cells)
+        values = array(_TYPECODES[kind], [0]) * len(cells)
+        tags = array('B', [_VALUE]) * len(cells)
+        for i, cell in enumerate(cells):
+            if cell is _ABSENT:
+                tags[i] = _MISSING
+            elif cell is None:
+                tags[i] = _NONE
+            elif kind == _NESTED:
+                values[i] = strings.add(_dumps(cell))
+            elif _cell_kind(cell) == kind:
+                values[i] = strings.add(cell) if kind == _STR else cell
+            else:
+                # stored by reference, whatever the column's type
+                values[i] = strings.add(_dumps(cell))
+                tags[i] = _JSON
+        plain = tags.count(_VALUE) == len(tags)
+        columns[key] = [kind, add(values), None if plain else add(tags)]
+    return columns
+
+
+def _dumps(value: object) -> str:
+    return json.dumps(value, separators=(',', ':'))
+
+
+def _cell_kind(value: object) -> str:
+    if type(value) is bool:
+        return _BOOL
+    if type(value) is int:
+        return _INT if _INT64_MIN <= value <= _INT64_MAX else _NESTED
+    if type(value) is float:
+        return _FLOAT
+    if type(value) is str:
+        return _STR
+    return _NESTED
+
+
+def _column_kind(cells: list[Any]) -> str:
+    """Return the most common kind of value in `cells`."""
+    counts: dict[str, int] = {}
+    for cell in cells:
+        if cell is not _ABSENT and cell is not None:
+            kind = _cell_kind(cell)
+            counts[kind] = counts.get(kind, 0) + 1
+    kind = max(counts, key=counts.__getitem__, default=_NESTED)
+    if kind == _BOOL and len(counts) > 1:
+        # a byte is too narrow to hold a reference
+        return _NESTED
+    return kind
+
+
+class _StringTable:
+    """Distinct strings, numbered in the order they are first added."""
+
+    __slots__ = ('_ids',)
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._ids)
+        return string_id
+
+    def encode(self) -> tuple[array, bytes]:
+        encoded = [value.encode() for value in self._ids]
+        offsets = array('q', [0])
+        total = 0
+        for value in encoded:
+            total += len(value)
+            offsets.append(total)
+        return offsets, b''.join(encoded)
+
+
+class _Column:
+    """A memory-mapped column, decoded one cell at a time."""
+
+    __slots__ = ('kind', 'values', 'tags', '_snapshot')
+
+    def __init__(self, snapshot: 'MBDataSnapshot', kind: str, values: memoryview,
+                 tags: memoryview | None) -> None:
+        self.kind = kind
+        self.values = values
+        self.tags = tags
+        self._snapshot = snapshot
+
+    def get(self, i: int) -> Any:  # noqa: ANN401 (type depends on the column)
+        """Return cell `i`, or ``_ABSENT`` if its row doesn't have the key."""
+        tag = _VALUE if self.tags is None else self.tags[i]
+        if tag == _VALUE:
+            kind = self.kind
+            if kind == _INT or kind == _FLOAT:
+                return self.values[i]
+            if kind == _BOOL:
+                return self.values[i] != 0
+            if kind == _STR:
+                return self._snapshot.string(self.values[i])
+            return json.loads(self._snapshot.string(self.values[i]))
+        if tag == _NONE:
+            return None
+        if tag == _JSON:
+            return json.loads(self._snapshot.string(int(self.values[i])))
+        return _ABSENT
+
+    def slice(self, start: int, stop: int) -> list[Any]:
+        """Return cells `start` to `stop`, decoded a column at a time."""
+        values = self.values[start:stop].tolist()
+        if self.tags is None:
+            return self._decode(values)
+        tags = self.tags[start:stop].tolist()
+        decoded = iter(self._decode(
+            [value for value, tag in zip(values, tags) if tag == _VALUE]))
+        string = self._snapshot.string
+        cells = []
+        for value, tag in zip(values, tags):
+            if tag == _VALUE:
+                cells.append(next(decoded))
+            elif tag == _NONE:
+                cells.append(None)
+            elif tag == _JSON:
+                cells.append(json.loads(string(int(value))))
+            else:
+                cells.append(_ABSENT)
+        return cells
+
+    def _decode(self, values: list) -> list:
+        """Decode plain cells of the column's kind in bulk."""
+        kind = self.kind
+        if kind == _INT or kind == _FLOAT:
+            return values
+        if kind == _BOOL:
+            return [value != 0 for value in values]
+        strings = self._snapshot._strings_for(values)
+        if kind == _STR:
+            return [strings[string_id] for string_id in values]
+        # one parse for the column, rather than one per cell, which also gives
+        # each cell its own copy of a repeated value
+        return json.loads(
+            '[' + ','.join([strings[string_id] for string_id in values]) + ']')
+
+
+class MBDataSnapshot:
+    """
+    A snapshot file, opened with :mod:`mmap`.
+
+    Opening a snapshot only reads its header and the item IDs; items, listings and
+    sales are decoded when they are looked up. Use ``MBDataResponse.load`` to get a
+    response object, or this class directly for rows and columns.
+
+    Parameters
+    ----------
+    path : str or Path
+
+    Attributes
+    ----------
+    multi_item : bool
+        Whether the response was for several items.
+    meta : dict
+        The response's top-level fields, other than ``items``.
+    params : dict
+        The request's parameters, as saved.
+
+    Raises
+    ------
+    UniversalisError
+        If the file is not a snapshot.
+
+    Examples
+    --------
+    >>> with MBDataSnapshot('crystal.snap') as snapshot:
+    ...     snapshot.items[5057]['minPrice']
+    ...     snapshot.listings(5057)[:5]
+    """
+
+    _MBDataSnapshot_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, path: str | Path) -> None:
+        if sys.byteorder != 'little':
+            raise UniversalisError("Snapshots can only be read on little-endian hosts")
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        self._strings: dict[int, str] = {}
+        try:
+            self._open()
+        except (KeyError, ValueError, TypeError, struct.error) as e:
+            self.close()
+            raise UniversalisError(f"Invalid snapshot: {path}") from e
+        except UniversalisError:
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        buffer = memoryview(self._mmap)
+        self._views.append(buffer)
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise UniversalisError("Not a snapshot file")
+        (size,) = _HEADER_SIZE.unpack_from(buffer, len(MAGIC))
+        start = len(MAGIC) + _HEADER_SIZE.size
+        header = json.loads(bytes(buffer[start:start + size]))
+        if header['version'] != 1:
+            raise UniversalisError(f"Unsupported snapshot version {header['version']}")
+        self._data_start = start + size + (-(start + size) % 8)
+        self._buffer = buffer
+
+        self.multi_item: bool = header['multi_item']
+        self.meta: dict = header['meta']
+        self.params: dict = header['params']
+        tables = header['tables']
+        self._n_rows = {name: table['rows'] for name, table in tables.items()}
+        self._columns = {name: {key: self._column(name, *column)
+                                for key, column in table['columns'].items()}
+                         for name, table in tables.items()}
+        n_items = self._n_rows['items']
+        self._listing_offsets = self._view(tables['items']['listings'][0], 'q',
+                                           n_items + 1)
+        self._has_listings = self._view(tables['items']['listings'][1], 'B', n_items)
+        self._sale_offsets = self._view(tables['items']['sales'][0], 'q', n_items + 1)
+        self._has_sales = self._view(tables['items']['sales'][1], 'B', n_items)
+        n_strings, string_offsets, string_data = header['strings']
+        self._string_offsets = self._view(string_offsets, 'q', n_strings + 1)
+        self._string_data = self._view(string_data, 'B',
+                                       self._string_offsets[n_strings])
+
+        item_ids = self._columns['items'].get('itemID')
+        self._rows_by_id: dict[int, int] = {} if item_ids is None else {
+            item_ids.get(i): i for i in range(n_items)}
+        self.items = _SnapshotItems(self)
+
+    def _view(self, offset: int, typecode: str, length: int) -> memoryview:
+        start = self._data_start + offset
+        width = array(typecode).itemsize
+        view = self._buffer[start:start + length * width]
+        if len(view) != length * width:
+            view.release()
+            raise ValueError("column overruns the file")
+        # typeshed only accepts literal formats
+        view = view.cast(typecode)  # type: ignore[call-overload]
+        self._views.append(view)
+        return view
+
+    def _column(self, table: str, kind: str, offset: int,
+                tags_offset: int | None) -> _Column:
+        n_rows = self._n_rows[table]
+        values = self._view(offset, _TYPECODES[kind], n_rows)
+        tags = None if tags_offset is None else self._view(tags_offset, 'B', n_rows)
+        return _Column(self, kind, values, tags)
+
+    def __enter__(self) -> Self:
+        """Return the snapshot, which is closed on exit."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Close the snapshot."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file. Rows decoded already stay usable."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the file has been unmapped."""
+        return self._mmap.closed
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return self._n_rows['items']
+
+    def string(self, string_id: int) -> str:
+        """
+        Return string `string_id` from the dictionary.
+
+        Parameters
+        ----------
+        string_id : int
+
+        Returns
+        -------
+        str
+        """
+        value = self._strings.get(string_id)
+        if value is None:
+            offsets = self._string_offsets
+            value = str(self._string_data[offsets[string_id]:offsets[string_id + 1]],
+                        'utf-8')
+            # worlds, retainers and the like repeat, so each is decoded once
+            self._strings[string_id] = value
+        return value
+
+    def _strings_for(self, string_ids: list[int]) -> dict[int, str]:
+        """Return the strings in `string_ids`, decoding each distinct one once."""
+        strings = self._strings
+        offsets = self._string_offsets
+        data = self._string_data
+        for string_id in set(string_ids).difference(strings):
+            strings[string_id] = str(data[offsets[string_id]:offsets[string_id + 1]],
+                                     'utf-8')
+        return strings
+
+    def column(self, table: str, key: str) -> memoryview:
+        """
+        Return a table's column for an API key, without decoding it.
+
+        Numeric columns can be wrapped without copying, e.g. with
+        ``numpy.frombuffer``. Cells that are ``None``, missing or of another type
+        than the column hold meaningless values.
+
+        Parameters
+        ----------
+        table : str
+            ``'items'``, ``'listings'`` or ``'sales'``.
+        key : str
+            E.g. ``'pricePerUnit'``.
+
+        Returns
+        -------
+        memoryview
+            Typed ``'q'`` (int), ``'d'`` (float) or ``'B'`` (bool); string columns
+            are ``'i'``, and hold references into ``string``.
+
+        Raises
+        ------
+        KeyError
+            If the table has no such column.
+        """
+        return self._columns[table][key].values
+
+    def row(self, table: str, i: int) -> dict:
+        """
+        Decode row `i` of a table.
+
+        Parameters
+        ----------
+        table : str
+            ``'items'``, ``'listings'`` or ``'sales'``. Item rows don't include
+            their listings and sales.
+        i : int
+
+        Returns
+        -------
+        dict
+        """
+        if not 0 <= i < self._n_rows[table]:
+            raise IndexError(i)
+        row = {}
+        for key, column in self._columns[table].items():
+            value = column.get(i)
+            if value is not _ABSENT:
+                row[key] = value
+        return row
+
+    def _rows(self, table: str, start: int, stop: int) -> list[dict]:
+        columns = self._columns[table]
+        # columns every row has are zipped into the rows in one go
+        keys = [key for key, column in columns.items() if column.tags is None]
+        rows: list[dict]
+        if keys:
+            rows = [dict(zip(keys, cells)) for cells in zip(
+                *[columns[key].slice(start, stop) for key in keys])]
+        else:
+            rows = [{} for _ in range(start, stop)]
+        for key, column in columns.items():
+            if column.tags is not None:
+                for row, value in zip(rows, column.slice(start, stop)):
+                    if value is not _ABSENT:
+                        row[key] = value
+        return rows
+
+    def listings(self, item_id: int) -> list[dict]:
+        """
+        Decode an item's listings only.
+
+        Parameters
+        ----------
+        item_id : int
+
+        Returns
+        -------
+        list[dict]
+        """
+        i = self._rows_by_id[item_id]
+        return self._rows('listings', self._listing_offsets[i],
+                          self._listing_offsets[i + 1])
+
+    def sales(self, item_id: int) -> list[dict]:
+        """
+        Decode an item's recent history only.
+
+        Parameters
+        ----------
+        item_id : int
+
+        Returns
+        -------
+        list[dict]
+        """
+        i = self._rows_by_id[item_id]
+        return self._rows('sales', self._sale_offsets[i], self._sale_offsets[i + 1])
+
+    def item(self, item_id: int) -> dict:
+        """
+        Decode an item, with its listings and sales, in the API's format.
+
+        Parameters
+        ----------
+        item_id : int
+
+        Returns
+        -------
+        dict
+        """
+        i = self._rows_by_id[item_id]
+        item = self.row('items', i)
+        if self._has_listings[i]:
+            item['listings'] = self._rows('listings', self._listing_offsets[i],
+                                          self._listing_offsets[i + 1])
+        if self._has_sales[i]:
+            item['recentHistory'] = self._rows('sales', self._sale_offsets[i],
+                                               self._sale_offsets[i + 1])
+        return item
+
+    @property
+    def data(self) -> dict:
+        """The whole response in the API's format, decoded."""
+        # a table at a time, rather than an item at a time
+        items = self._rows('items', 0, self._n_rows['items'])
+        listings = self._rows('listings', 0, self._n_rows['listings'])
+        sales = self._rows('sales', 0, self._n_rows['sales'])
+        for i, item in enumerate(items):
+            if self._has_listings[i]:
+                item['listings'] = listings[self._listing_offsets[i]:
+                                            self._listing_offsets[i + 1]]
+            if self._has_sales[i]:
+                item['recentHistory'] = sales[self._sale_offsets[i]:
+                                              self._sale_offsets[i + 1]]
+        if not self.multi_item:
+            return items[0] if items else {}
+        return self.meta | {'items': {str(item['itemID']): item for item in items}}
+
+
+class _SnapshotItems(Mapping[int, dict]):
+    """Mapping of item ID -> item data, decoded on lookup."""
+
+    __slots__ = ('_snapshot',)
+
+    def __init__(self, snapshot: MBDataSnapshot) -> None:
+        self._snapshot = snapshot
+
+    def __getitem__(self, item_id: int) -> dict:
+        if self._snapshot.closed:
+            raise UniversalisError(f"Item {item_id} wasn't read before the snapshot "
+                                   "was closed")
+        return self._snapshot.item(item_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._snapshot._rows_by_id)
+
+    def __len__(self) -> int:
+        return len(self._snapshot._rows_by_id)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._snapshot._rows_by_id
@@ -1,15 +1,23 @@
 """Python client for interacting with Universalis.app."""
 
+import asyncio
 import logging
-from typing import cast
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from functools import partial
+from typing import Any, cast
 
 import aiohttp
 import async_property
 
-from .api_objects.mb_data import MBDataResponse
+from .api_objects.aggregated import AggregatedResponse
+from .api_objects.mb_data import MBDataResponse, MBDataResponseItem
+from ._batching import MBDataBatcher
 from ._wrapper import UniversalisAPIWrapper
 from .exceptions import UniversalisError
 from universalisapi.utils.enums import DataCenter, World
+from universalisapi.utils.cache import DiskCache, ResponseCache
+from universalisapi.utils.decoding import JSONDecoder
+from universalisapi.utils.retry import RetryPolicy
 from universalisapi.utils.types import APIRegion
 
 
@@ -17,13 +25,78 @@ module_logger = logging.getLogger(__name__)
 
 
 class UniversalisAPIClient(UniversalisAPIWrapper):
-    """Asynchronous client for accessing Universalis.app's API endpoints."""
+    """
+    Asynchronous client for accessing Universalis.app's API endpoints.
+
+    The client owns a pooled connection that is shared by every request it makes,
+    including those made by the ``MBDataResponse`` objects it creates. Use it as an
+    async context manager to make sure the pool is closed:
+
+    >>> async with UniversalisAPIClient(warm_up_connections=4) as client:
+    ...     data = await client.mb_current_data([5354], 'crystal')
+
+    Parameters
+    ----------
+    api_key : str, optional
+    session : aiohttp.ClientSession or None, optional
+        See ``UniversalisAPIWrapper``.
+
+    Other Parameters
+    ----------------
+    connection_limit : int, optional
+    connection_limit_per_host : int, optional
+    keepalive_timeout : float, optional
+    dns_cache_ttl : int or None, optional
+    warm_up_connections : int, optional
+        Connection pool options, see ``UniversalisAPIWrapper``.
+    max_concurrent_requests : int, optional
+        Chunk requests kept in flight per bulk call, see ``UniversalisAPIWrapper``.
+    requests_per_second : float or None, optional
+    burst : int, optional
+        Client-wide rate limit, see ``UniversalisAPIWrapper``.
+    retry_policy : RetryPolicy or None, optional
+        How to retry failed requests, see ``UniversalisAPIWrapper``.
+    cache : ResponseCache or None, optional
+        In-memory response cache, see ``UniversalisAPIWrapper``.
+    disk_cache : DiskCache or None, optional
+        Persistent response cache, see ``UniversalisAPIWrapper``.
+    json_decoder : str or JSONDecoder, optional
+        Response body decoder, see ``UniversalisAPIWrapper``.
+    batch_window : float, optional
+        Seconds ``mb_item_data`` waits to collect more lookups into the same
+        request. Defaults to 0.005.
+    """
 
     _UniversalisAPIClient_logger = module_logger.getChild(__qualname__)
 
     def __init__(self, *, api_key: str = '',
-                 session: aiohttp.ClientSession | None = None) -> None:
-        super().__init__(session=session)
+                 session: aiohttp.ClientSession | None = None,
+                 connection_limit: int = 100,
+                 connection_limit_per_host: int = 8,
+                 keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int | None = 300,
+                 warm_up_connections: int = 0,
+                 max_concurrent_requests: int = 8,
+                 requests_per_second: float | None = 25.0,
+                 burst: int = 50,
+                 retry_policy: RetryPolicy | None = RetryPolicy(),
+                 cache: ResponseCache | None = None,
+                 disk_cache: DiskCache | None = None,
+                 json_decoder: str | JSONDecoder = 'auto',
+                 batch_window: float = 0.005) -> None:
+        super().__init__(session=session,
+                         connection_limit=connection_limit,
+                         connection_limit_per_host=connection_limit_per_host,
+                         keepalive_timeout=keepalive_timeout,
+                         dns_cache_ttl=dns_cache_ttl,
+                         warm_up_connections=warm_up_connections,
+                         max_concurrent_requests=max_concurrent_requests,
+                         requests_per_second=requests_per_second,
+                         burst=burst,
+                         retry_policy=retry_policy,
+                         cache=cache,
+                         disk_cache=disk_cache,
+                         json_decoder=json_decoder)
         self._instance_logger = self._UniversalisAPIClient_logger.getChild(
             str(id(self)))
         self.api_key = api_key
@@ -31,6 +104,9 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
         self._worlds: list[dict] = []
         self._dcs: list[dict] = []
 
+        self.batch_window = batch_window
+        self._batchers: dict[tuple, MBDataBatcher] = {}
+
     @async_property.async_cached_property
     async def data_centers(self) -> list[dict]:
         """
@@ -113,7 +189,8 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
         Get aggregated market board data for the given items in the given region.
 
         Returns a list of results for each item searched, as well as a list of items
-        that resulted in a failed search.
+        that resulted in a failed search. Any number of item IDs may be requested;
+        lists longer than 100 are fetched in concurrent chunks and merged.
 
         Parameters
         ----------
@@ -132,11 +209,34 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
         """
         self._instance_logger.info("Checking region")
         self._check_region_name(region)
-        self._instance_logger.debug("Capping item_id list at 100")
-        item_ids = item_ids[:100]
-        endpoint = f'/aggregated/{region}/{",".join(map(str,item_ids))}'
-        data = cast(dict, await self.get_endpoint(endpoint))
-        return data
+        return await self._get_aggregated_data(item_ids, region)
+
+    async def aggregated_price_data(self, region: APIRegion, item_ids: list[int], *,
+                                    use_numpy: bool | None = None
+                                    ) -> AggregatedResponse:
+        """
+        Return an ``AggregatedResponse`` from /aggregated/``region``/``item_ids``.
+
+        Any number of item IDs may be requested, as with ``current_item_price_data``.
+
+        Parameters
+        ----------
+        region : APIRegion
+            The region from which to retrieve prices
+        item_ids : list[int]
+            A list of item IDs for which to retrieve prices
+
+        Returns
+        -------
+        AggregatedResponse
+
+        Other Parameters
+        ----------------
+        use_numpy : bool or None, optional
+            See ``AggregatedResponse``.
+        """
+        data = await self.current_item_price_data(region, item_ids)
+        return AggregatedResponse(data, use_numpy=use_numpy)
 
     @staticmethod
     def parse_region_data[I](data: dict[str, I]) -> I:
@@ -196,31 +296,11 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
             A mapping of the provided item IDs to their average prices
         """
         self._instance_logger.info("Getting item price data")
-        item_data = await self.current_item_price_data(region, item_ids)
-        avg_prices = {}
-        failed_items = item_data['failedItems']
-        if failed_items:
+        resp = await self.aggregated_price_data(region, item_ids)
+        if resp.failed_items:
             self._instance_logger.info("Couldn't find information for all item ids",
-                                       extra={'failed_items': failed_items})
-
-        for item in item_data['results']:
-            asp_hq_info = item['hq']['averageSalePrice']
-            asp_nq_info = item['nq']['averageSalePrice']
-            if hq and asp_hq_info:
-                avg_price = self.parse_region_data(asp_hq_info)['price']
-                avg_prices[item['itemId']] = round(avg_price)
-            elif asp_nq_info:
-                avg_price = self.parse_region_data(asp_nq_info)
-                avg_price = avg_price['price']
-                avg_prices[item['itemId']] = round(avg_price)
-            else:
-                #TODO figure out a better way to represent no price data
-                self._instance_logger.info("No average price data for item",
-                                           extra={'item': item['itemId'],
-                                                  'item_data': item})
-                avg_prices[item['itemId']] = -1
-
-        return avg_prices
+                                       extra={'failed_items': resp.failed_items})
+        return resp.average_sale_prices(hq=hq)
 
     async def least_recent_items(self, world_or_dc: World | DataCenter,
                                  entries: int | None = None) -> list[dict]:
@@ -266,10 +346,16 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
                               hq: bool | None = None,
                               stats_within: int | None = None,
                               entries_within: int | None = None,
-                              fields: list[str] | None = None) -> MBDataResponse:
+                              fields: list[str] | None = None,
+                              typed: bool = False,
+                              keep_raw: bool = False,
+                              lazy: bool = False) -> MBDataResponse:
         """
         Return an ``MBDataResponse`` object from /``region``/``item_ids``.
 
+        Any number of item IDs may be requested; lists longer than 100 are fetched
+        in concurrent chunks and merged into a single response.
+
         Parameters
         ----------
         item_ids : list[int]
@@ -287,6 +373,14 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
         stats_within : int, optional
         entries_within : int, optional
         fields : list[str]
+        typed : bool, optional
+            Decode each item into a compact, slotted ``MBItemRecord`` rather than
+            keeping the API's dicts. Defaults to ``False``.
+        keep_raw : bool, optional
+            In typed mode, keep the decoded JSON as well. Defaults to ``False``.
+        lazy : bool, optional
+            Only build each item of the response when it is looked up. Defaults to
+            ``False``.
         """
         self._instance_logger.info("Checking region info")
         self._check_region_name(region)
@@ -302,4 +396,288 @@ class UniversalisAPIClient(UniversalisAPIWrapper):
                   'stats_within': stats_within,
                   'entries_within': entries_within,
                   'fields': fields}
-        return MBDataResponse(data, params)
+        return MBDataResponse(data, params, client=self, typed=typed,
+                              keep_raw=keep_raw, lazy=lazy)
+
+    async def iter_mb_data(self,
+                           item_ids: Iterable[int] | AsyncIterable[int],
+                           regions: APIRegion | Iterable[APIRegion], *,
+                           listings: int | None = None,
+                           entries: int | None = None,
+                           hq: bool | None = None,
+                           stats_within: int | None = None,
+                           entries_within: int | None = None,
+                           fields: list[str] | None = None,
+                           typed: bool = False,
+                           max_pending_chunks: int | None = None
+                           ) -> AsyncIterator[MBDataResponseItem]:
+        """
+        Yield the items of /``region``/``item_ids`` for every region, as they arrive.
+
+        `item_ids` is read lazily, a request's worth (100 IDs) at a time, and each
+        chunk is requested for every region, with at most
+        ``max_concurrent_requests`` requests in flight. Items are yielded as soon as
+        their chunk's response arrives, so they are not in any particular order;
+        ``region_info`` on each item names the world, DC or region it is for.
+
+        Responses wait for the consumer in a queue of `max_pending_chunks`; while it
+        is full, no new requests are sent and no more IDs are read. Memory use is
+        therefore bounded by the chunk size, whatever the number of IDs.
+
+        Parameters
+        ----------
+        item_ids : Iterable[int] or AsyncIterable[int]
+            Duplicates are only dropped within a chunk.
+        regions : APIRegion or Iterable[APIRegion]
+
+        Yields
+        ------
+        MBDataResponseItem
+
+        Raises
+        ------
+        UniversalisError
+            If a region is not valid. Request errors are raised when the consumer
+            reaches them; requests still in flight are then cancelled.
+
+        Other Parameters
+        ----------------
+        listings : int, optional
+        entries : int, optional
+        hq : bool, optional
+        stats_within : int, optional
+        entries_within : int, optional
+        fields : list[str], optional
+        typed : bool, optional
+            See ``mb_current_data``.
+        max_pending_chunks : int or None, optional
+            Defaults to ``None``, i.e. ``max_concurrent_requests``.
+
+        Examples
+        --------
+        >>> async for item in client.iter_mb_data(all_marketable_ids,
+        ...                                       ['crystal', 'aether']):
+        ...     store(item.region_info, item.item_id, item.best_price)
+        """
+        region_list = [regions] if isinstance(regions, str) else list(regions)
+        for region in region_list:
+            self._check_region_name(region)
+        request_params = self._mb_data_params(
+            listings=listings, entries=entries, hq=hq, stats_within=stats_within,
+            entries_within=entries_within, fields=fields)
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        results: asyncio.Queue = asyncio.Queue(max_pending_chunks
+                                               or self.max_concurrent_requests)
+        fetches: set[asyncio.Task] = set()
+
+        async def _fetch(region: APIRegion, chunk: list[int]) -> None:
+            try:
+                endpoint = f'/{region}/{",".join(map(str, chunk))}'
+                result: Any = await self.get_endpoint(endpoint,
+                                                      params=request_params)
+            except Exception as e:
+                result = e
+            try:
+                # holds its request slot until there is room, stopping new requests
+                await results.put((region, chunk, result))
+            finally:
+                semaphore.release()
+
+        async def _schedule() -> None:
+            try:
+                async for chunk in _iter_chunks(item_ids, self.max_items_per_request):
+                    for region in region_list:
+                        await semaphore.acquire()
+                        task = asyncio.ensure_future(_fetch(region, chunk))
+                        fetches.add(task)
+                        task.add_done_callback(fetches.discard)
+            except Exception as e:
+                # e.g. from reading item_ids
+                await results.put((None, [], e))
+                return
+            if fetches:
+                await asyncio.wait(set(fetches))
+            await results.put(None)
+
+        scheduler = asyncio.ensure_future(_schedule())
+        try:
+            while (result := await results.get()) is not None:
+                region, chunk, data = result
+                if isinstance(data, BaseException):
+                    raise data
+                response = MBDataResponse(
+                    _with_region_info(data),
+                    {'item_ids': chunk, 'region': region, 'listings': listings,
+                     'entries': entries, 'hq': hq, 'stats_within': stats_within,
+                     'entries_within': entries_within, 'fields': fields},
+                    client=self, typed=typed, lazy=True)
+                for item in response.items.values():
+                    yield item
+        finally:
+            tasks = [scheduler, *fetches]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def mb_item_data(self,
+                           item_id: int,
+                           region: APIRegion, *,
+                           listings: int | None = None,
+                           entries: int | None = None,
+                           hq: bool | None = None,
+                           stats_within: int | None = None,
+                           entries_within: int | None = None,
+                           fields: list[str] | None = None) -> MBDataResponseItem:
+        """
+        Return the ``MBDataResponseItem`` for a single item in /``region``.
+
+        Lookups for the same region and params made within ``batch_window`` seconds
+        of each other (from any number of coroutines) are sent as one
+        /``region``/``item_ids`` request, up to 100 items at a time.
+
+        Parameters
+        ----------
+        item_id : int
+        region : APIRegion
+
+        Returns
+        -------
+        item : MBDataResponseItem
+
+        Raises
+        ------
+        UniversalisError
+            If the batched request failed, or Universalis has no data for `item_id`.
+
+        Other Parameters
+        ----------------
+        listings : int, optional
+        entries : int, optional
+        hq : bool, optional
+        stats_within : int, optional
+        entries_within : int, optional
+        fields : list[str], optional
+
+        Examples
+        --------
+        >>> items = await asyncio.gather(*(client.mb_item_data(item_id, 'crystal')
+        ...                                for item_id in (5354, 5822, 11946)))
+        """
+        self._check_region_name(region)
+        params = {'listings': listings,
+                  'entries': entries,
+                  'hq': hq,
+                  'stats_within': stats_within,
+                  'entries_within': entries_within,
+                  'fields': fields}
+        key = (region, *(tuple(v) if isinstance(v, list) else v
+                         for v in params.values()))
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            # dropped once it has flushed, so one-off params don't pile up
+            batcher = MBDataBatcher(self, region, params, window=self.batch_window,
+                                    on_idle=partial(self._batchers.pop, key, None))
+            self._batchers[key] = batcher
+        return await batcher.load(item_id)
+
+    async def refresh_many(self, responses: Iterable[MBDataResponse]
+                           ) -> list[dict[int, dict]]:
+        """
+        Refresh many ``MBDataResponse`` objects with as few requests as possible.
+
+        Responses for the same region and params are grouped, and their item IDs
+        merged into one list that is fetched in chunks of up to 100. Each response is
+        then updated in place from the merged data, as by
+        ``MBDataResponse.get_price_changes``.
+
+        Parameters
+        ----------
+        responses : Iterable[MBDataResponse]
+
+        Returns
+        -------
+        price_changes : list[dict[int, dict]]
+            The changes for each response, in the same order as `responses`. See
+            ``MBDataResponse.update``.
+
+        Examples
+        --------
+        >>> responses = [await client.mb_current_data([item_id], 'crystal')
+        ...              for item_id in (5354, 5822, 11946)]
+        >>> changes = await client.refresh_many(responses)  # one request
+        """
+        responses = list(responses)
+        groups: dict[tuple, tuple[APIRegion, dict, list[MBDataResponse]]] = {}
+        for resp in responses:
+            region, params = self._refresh_params(resp)
+            key = (region, *sorted((k, tuple(v) if isinstance(v, list) else v)
+                                   for k, v in params.items()))
+            groups.setdefault(key, (region, params, []))[2].append(resp)
+
+        self._instance_logger.debug("Refreshing responses",
+                                    extra={'n_responses': len(responses),
+                                           'n_groups': len(groups)})
+        new_data = await self._gather_bounded([
+            self._get_mb_current_data(
+                sorted({item_id for resp in group
+                        for item_id in resp.params['item_ids']}),
+                region, **params)
+            for region, params, group in groups.values()
+        ])
+
+        price_changes: dict[int, dict[int, dict]] = {}
+        for (_, _, group), data in zip(groups.values(), new_data):
+            raw_items = MBDataResponse._raw_items(data)
+            extra = {k: v for k, v in data.items()
+                     if k not in ('itemIDs', 'items', 'unresolvedItems')}
+            for resp in group:
+                item_ids = resp.params['item_ids']
+                if resp.multi_item:
+                    resp_data = extra | {
+                        'itemIDs': item_ids,
+                        'items': {str(item_id): raw_items[item_id]
+                                  for item_id in item_ids if item_id in raw_items},
+                        'unresolvedItems': [item_id for item_id in item_ids
+                                            if item_id not in raw_items]}
+                else:
+                    resp_data = raw_items.get(item_ids[0], {})
+                price_changes[id(resp)] = resp.update(resp_data)
+        return [price_changes[id(resp)] for resp in responses]
+
+    @staticmethod
+    def _refresh_params(resp: MBDataResponse) -> tuple[APIRegion, dict]:
+        """Split a response's params into its region and its query params."""
+        params = {k: v for k, v in resp.params.items()
+                  if k not in ('item_ids', 'region') and v is not None}
+        return resp.params['region'], params
+
+
+async def _iter_chunks(item_ids: Iterable[int] | AsyncIterable[int],
+                       size: int) -> AsyncIterator[list[int]]:
+    """Yield `size`-long chunks of unique IDs from a sync or async iterable."""
+    chunk: dict[int, None] = {}
+    if isinstance(item_ids, AsyncIterable):
+        async for item_id in item_ids:
+            chunk[item_id] = None
+            if len(chunk) == size:
+                yield list(chunk)
+                chunk = {}
+    else:
+        for item_id in item_ids:
+            chunk[item_id] = None
+            if len(chunk) == size:
+                yield list(chunk)
+                chunk = {}
+    if chunk:
+        yield list(chunk)
+
+
+def _with_region_info(data: dict) -> dict:
+    """Copy a multi-item response's world/DC/region name into each of its items."""
+    if 'items' in data:
+        region_info = {key: data[key] for key in ('worldID', 'worldName', 'dcName',
+                                                  'regionName') if key in data}
+        for item_info in data['items'].values():
+            for key, value in region_info.items():
+                item_info.setdefault(key, value)
+    return data
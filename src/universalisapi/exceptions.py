@@ -3,3 +3,24 @@ class UniversalisError(Exception):
     Non-200 status code error
     """
     pass
+
+
+class UniversalisHTTPError(UniversalisError):
+    """
+    An error response from the Universalis API.
+
+    Parameters
+    ----------
+    message : str
+    status : int
+        The HTTP status code of the response.
+    retry_after : float or None, optional
+        Seconds the server asked us to wait before retrying (from the
+        ``Retry-After`` header), if any.
+    """
+
+    def __init__(self, message: str, *, status: int,
+                 retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
@@ -0,0 +1,224 @@
+"""
+A minimal BSON codec for Universalis' WebSocket messages.
+
+Only the types Universalis sends are supported: doubles, strings, embedded
+documents, arrays, binary data, booleans, nulls, 32- and 64-bit integers, and (for
+decoding only) ObjectIds and UTC datetimes, which decode to a hex ``str`` and to
+milliseconds since the epoch respectively.
+"""
+
+import struct
+from collections.abc import Mapping
+from typing import Any
+
+from ..exceptions import UniversalisError
+
+
+_INT32 = struct.Struct('<i')
+_INT64 = struct.Struct('<q')
+_DOUBLE = struct.Struct('<d')
+
+_DOUBLE_TYPE = 0x01
+_STRING_TYPE = 0x02
+_DOCUMENT_TYPE = 0x03
+_ARRAY_TYPE = 0x04
+_BINARY_TYPE = 0x05
+_OBJECT_ID_TYPE = 0x07
+_BOOL_TYPE = 0x08
+_DATETIME_TYPE = 0x09
+_NULL_TYPE = 0x0A
+_INT32_TYPE = 0x10
+_INT64_TYPE = 0x12
+
+
+def encode(document: Mapping[str, Any]) -> bytes:
+    """
+    Encode `document` as BSON.
+
+    Parameters
+    ----------
+    document : Mapping[str, Any]
+
+    Returns
+    -------
+    bytes
+
+    Raises
+    ------
+    UniversalisError
+        If a value has an unsupported type, or an integer doesn't fit in 64 bits.
+    """
+    buffer = bytearray()
+    _encode_document(buffer, document)
+    return bytes(buffer)
+
+
+def decode(data: bytes) -> dict[str, Any]:
+    """
+    Decode a single BSON document.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    dict[str, Any]
+
+    Raises
+    ------
+    UniversalisError
+        If `data` is not exactly one well-formed document.
+    """
+    document, end = _decode(data, 0)
+    if end != len(data):
+        raise UniversalisError("Malformed BSON: trailing data")
+    return document
+
+
+def decode_all(data: bytes) -> list[dict[str, Any]]:
+    """
+    Decode a sequence of concatenated BSON documents.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    list[dict[str, Any]]
+
+    Raises
+    ------
+    UniversalisError
+        If any document is malformed.
+    """
+    documents = []
+    offset = 0
+    while offset < len(data):
+        document, offset = _decode(data, offset)
+        documents.append(document)
+    return documents
+
+
+def _encode_document(buffer: bytearray, document: Mapping[str, Any]) -> None:
+    start = len(buffer)
+    buffer += b'\x00\x00\x00\x00'
+    for key, value in document.items():
+        _encode_element(buffer, str(key), value)
+    buffer.append(0)
+    _INT32.pack_into(buffer, start, len(buffer) - start)
+
+
+def _encode_element(buffer: bytearray, key: str, value: object) -> None:
+    name = key.encode() + b'\x00'
+    if value is None:
+        buffer.append(_NULL_TYPE)
+        buffer += name
+    elif isinstance(value, bool):
+        buffer.append(_BOOL_TYPE)
+        buffer += name
+        buffer.append(value)
+    elif isinstance(value, int):
+        if -2 ** 31 <= value < 2 ** 31:
+            buffer.append(_INT32_TYPE)
+            buffer += name
+            buffer += _INT32.pack(value)
+        elif -2 ** 63 <= value < 2 ** 63:
+            buffer.append(_INT64_TYPE)
+            buffer += name
+            buffer += _INT64.pack(value)
+        else:
+            raise UniversalisError(f"Integer too large for BSON: {value}")
+    elif isinstance(value, float):
+        buffer.append(_DOUBLE_TYPE)
+        buffer += name
+        buffer += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode()
+        buffer.append(_STRING_TYPE)
+        buffer += name
+        buffer += _INT32.pack(len(encoded) + 1)
+        buffer += encoded
+        buffer.append(0)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        buffer.append(_BINARY_TYPE)
+        buffer += name
+        buffer += _INT32.pack(len(value))
+        buffer.append(0)  # generic binary subtype
+        buffer += value
+    elif isinstance(value, Mapping):
+        buffer.append(_DOCUMENT_TYPE)
+        buffer += name
+        _encode_document(buffer, value)
+    elif isinstance(value, (list, tuple)):
+        buffer.append(_ARRAY_TYPE)
+        buffer += name
+        _encode_document(buffer, {str(i): v for i, v in enumerate(value)})
+    else:
+        raise UniversalisError(f"Cannot encode {type(value).__name__} as BSON")
+
+
+def _decode(data: bytes, offset: int) -> tuple[dict[str, Any], int]:
+    """Decode the document at `offset`; return it and the offset after it."""
+    try:
+        return _decode_document(data, offset)
+    except (struct.error, IndexError, ValueError) as e:
+        # UnicodeDecodeError is a ValueError
+        raise UniversalisError(f"Malformed BSON: {e}") from e
+
+
+def _decode_document(data: bytes, offset: int) -> tuple[dict[str, Any], int]:
+    (size,) = _INT32.unpack_from(data, offset)
+    end = offset + size
+    if size < 5 or end > len(data) or data[end - 1] != 0:
+        raise ValueError("bad document size")
+    document: dict[str, Any] = {}
+    pos = offset + 4
+    while pos < end - 1:
+        element_type = data[pos]
+        name_end = data.index(b'\x00', pos + 1, end)
+        key = data[pos + 1:name_end].decode()
+        pos = name_end + 1
+        if element_type == _STRING_TYPE:
+            (length,) = _INT32.unpack_from(data, pos)
+            if length < 1 or pos + 4 + length > end:
+                raise ValueError("bad string length")
+            value: Any = data[pos + 4:pos + 3 + length].decode()
+            pos += 4 + length
+        elif element_type == _INT32_TYPE:
+            (value,) = _INT32.unpack_from(data, pos)
+            pos += 4
+        elif element_type == _INT64_TYPE or element_type == _DATETIME_TYPE:
+            (value,) = _INT64.unpack_from(data, pos)
+            pos += 8
+        elif element_type == _DOUBLE_TYPE:
+            (value,) = _DOUBLE.unpack_from(data, pos)
+            pos += 8
+        elif element_type == _BOOL_TYPE:
+            value = data[pos] != 0
+            pos += 1
+        elif element_type == _NULL_TYPE:
+            value = None
+        elif element_type == _DOCUMENT_TYPE:
+            value, pos = _decode_document(data, pos)
+        elif element_type == _ARRAY_TYPE:
+            array_document, pos = _decode_document(data, pos)
+            value = list(array_document.values())
+        elif element_type == _BINARY_TYPE:
+            (length,) = _INT32.unpack_from(data, pos)
+            if length < 0 or pos + 5 + length > end:
+                raise ValueError("bad binary length")
+            value = data[pos + 5:pos + 5 + length]
+            pos += 5 + length
+        elif element_type == _OBJECT_ID_TYPE:
+            if pos + 12 > end:
+                raise ValueError("bad ObjectId")
+            value = data[pos:pos + 12].hex()
+            pos += 12
+        else:
+            raise ValueError(f"unsupported element type {element_type:#04x}")
+        if pos > end - 1:
+            raise ValueError("element overruns document")
+        document[key] = value
+    return document, end
@@ -0,0 +1,388 @@
+"""Response caching for ``UniversalisAPIWrapper.get_endpoint``."""
+
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from os import PathLike
+
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS: dict[str, float] = {
+    '/data-centers': 6 * 60 * 60,
+    '/worlds': 6 * 60 * 60,
+    '/extra/stats/': 5 * 60,
+    '/aggregated/': 60,
+}
+"""Default TTLs in seconds, keyed on endpoint prefix."""
+
+
+def canonical_request_key(endpoint: str, params: Mapping | None = None) -> str:
+    """
+    Return a key that is identical for equivalent requests.
+
+    Comma-separated item ID lists at the end of the endpoint (as in
+    /``region``/``item_ids`` and /aggregated/``region``/``item_ids``) are sorted
+    and deduped, and the query parameters are sorted. A list of one repeated ID
+    keeps a trailing comma, since Universalis answers it in the multi-item format
+    rather than as a single item.
+
+    Parameters
+    ----------
+    endpoint : str
+        The endpoint, relative to the API's base URL.
+    params : Mapping, optional
+        The query parameters of the request.
+
+    Returns
+    -------
+    str
+
+    Examples
+    --------
+    >>> canonical_request_key('/crystal/5822,5354,5822', {'listings': 5, 'hq': 'true'})
+    '/crystal/5354,5822?hq=true&listings=5'
+    """
+    head, sep, last = endpoint.rpartition('/')
+    ids = last.split(',')
+    if sep and all(item_id.isdigit() for item_id in ids):
+        unique = sorted(set(map(int, ids)))
+        last = ','.join(map(str, unique))
+        if len(unique) == 1 and len(ids) > 1:
+            last += ','
+        endpoint = f'{head}/{last}'
+    if not params:
+        return endpoint
+    query = '&'.join(f'{k}={params[k]}' for k in sorted(params))
+    return f'{endpoint}?{query}'
+
+
+def _ttl_for(endpoint: str, ttls: Mapping[str, float], default_ttl: float) -> float:
+    """Return the TTL of the longest prefix in `ttls` matching `endpoint`."""
+    best = None
+    for prefix in ttls:
+        if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return default_ttl if best is None else ttls[best]
+
+
+class CacheEntry:
+    """
+    A cached response body.
+
+    Parameters
+    ----------
+    body : bytes
+        The raw response body.
+    ttl : float
+        Seconds the body is considered fresh for.
+    stored_at : float, optional
+        ``time.monotonic()`` at which the body was fetched. Defaults to now.
+    """
+
+    __slots__ = ('body', 'ttl', 'stored_at')
+
+    def __init__(self, body: bytes, ttl: float, stored_at: float | None = None) -> None:
+        self.body = body
+        self.ttl = ttl
+        self.stored_at = time.monotonic() if stored_at is None else stored_at
+
+    @property
+    def age(self) -> float:
+        """Seconds since the body was fetched."""
+        return time.monotonic() - self.stored_at
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry is younger than its TTL."""
+        return self.age < self.ttl
+
+
+class ResponseCache:
+    """
+    A size-bounded, in-memory LRU cache of response bodies with per-endpoint TTLs.
+
+    Raw bodies are cached (rather than decoded JSON) so callers never share, and
+    accidentally mutate, the same ``dict``.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of responses to keep. The least recently used response is
+        evicted first. Defaults to 1024.
+    ttls : Mapping[str, float], optional
+        TTLs in seconds keyed on endpoint prefix; the longest matching prefix wins.
+        Defaults to ``DEFAULT_TTLS`` (hours for /data-centers and /worlds).
+    default_ttl : float, optional
+        TTL for endpoints that match no prefix, which includes market board data
+        at /``region``/``item_ids``. Defaults to 30 seconds.
+    stale_while_revalidate : float, optional
+        Seconds past its TTL during which a stale response is still returned
+        immediately while a fresh one is fetched in the background. Defaults to 0,
+        i.e. stale responses are never served.
+    """
+
+    _ResponseCache_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, maxsize: int = 1024, *,
+                 ttls: Mapping[str, float] | None = None,
+                 default_ttl: float = 30.0,
+                 stale_while_revalidate: float = 0.0) -> None:
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses, fresh or stale."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether `key` has a cached response, fresh or stale."""
+        return key in self._entries
+
+    def ttl_for(self, endpoint: str) -> float:
+        """
+        Return the TTL for `endpoint`.
+
+        Parameters
+        ----------
+        endpoint : str
+
+        Returns
+        -------
+        float
+        """
+        return _ttl_for(endpoint, self.ttls, self.default_ttl)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Return the entry for `key`, if it is fresh or may be served stale.
+
+        Entries that are too old to serve are evicted.
+
+        Parameters
+        ----------
+        key : str
+            A key from ``canonical_request_key``.
+
+        Returns
+        -------
+        CacheEntry or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.age >= entry.ttl + self.stale_while_revalidate:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes, endpoint: str, *, age: float = 0.0) -> None:
+        """
+        Store `body` under `key`, evicting the least recently used entries if full.
+
+        Parameters
+        ----------
+        key : str
+            A key from ``canonical_request_key``.
+        body : bytes
+        endpoint : str
+            The endpoint the body came from, used to pick its TTL.
+        age : float, optional
+            Seconds since `body` was fetched, for bodies loaded from elsewhere (e.g.
+            a ``DiskCache``). Defaults to 0.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._entries[key] = CacheEntry(body, ttl, time.monotonic() - age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self._ResponseCache_logger.debug("Evicted cached response",
+                                             extra={'key': evicted})
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        self._entries.clear()
+
+
+class DiskCache:
+    """
+    A persistent, size-capped cache of response bodies stored in SQLite.
+
+    Bodies are stored zlib-compressed alongside the wall-clock time they were
+    fetched, so they survive restarts. The database runs in WAL mode, so several
+    processes on one host can read it at once while one of them writes. Reads never
+    write; once the total compressed size exceeds `max_bytes`, the oldest responses
+    are evicted first.
+
+    Blocking methods are meant to be run in a worker thread (``get_endpoint`` uses
+    :func:`asyncio.to_thread`); a lock serializes access to the connection.
+
+    Parameters
+    ----------
+    path : str or PathLike
+        The SQLite database file. Created if it doesn't exist.
+    max_bytes : int, optional
+        Cap on the total compressed size of stored bodies. Defaults to 256 MiB.
+    ttls : Mapping[str, float], optional
+        TTLs in seconds keyed on endpoint prefix. Defaults to ``DEFAULT_TTLS``.
+    default_ttl : float, optional
+        TTL for endpoints that match no prefix. Defaults to 30 seconds.
+    compression_level : int, optional
+        zlib compression level. Defaults to 6.
+    """
+
+    _DiskCache_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, path: str | PathLike, *,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 ttls: Mapping[str, float] | None = None,
+                 default_ttl: float = 30.0,
+                 compression_level: int = 6) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, '
+                'body BLOB NOT NULL, '
+                'size INTEGER NOT NULL, '
+                'fetched_at REAL NOT NULL)')
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS responses_fetched_at '
+                'ON responses (fetched_at)')
+
+    def ttl_for(self, endpoint: str) -> float:
+        """
+        Return the TTL for `endpoint`.
+
+        Parameters
+        ----------
+        endpoint : str
+
+        Returns
+        -------
+        float
+        """
+        return _ttl_for(endpoint, self.ttls, self.default_ttl)
+
+    def get(self, key: str, endpoint: str) -> CacheEntry | None:
+        """
+        Return the fresh entry for `key`, if there is one.
+
+        Parameters
+        ----------
+        key : str
+            A key from ``canonical_request_key``.
+        endpoint : str
+            The endpoint being requested, used to pick the TTL.
+
+        Returns
+        -------
+        CacheEntry or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, fetched_at FROM responses WHERE key = ?',
+                (key,)).fetchone()
+        if row is None:
+            return None
+        body, fetched_at = row
+        ttl = self.ttl_for(endpoint)
+        age = max(0.0, time.time() - fetched_at)
+        if age >= ttl:
+            return None
+        return CacheEntry(zlib.decompress(body), ttl, time.monotonic() - age)
+
+    def set(self, key: str, body: bytes) -> None:
+        """
+        Store `body` under `key`, evicting the oldest entries if over `max_bytes`.
+
+        Parameters
+        ----------
+        key : str
+            A key from ``canonical_request_key``.
+        body : bytes
+        """
+        compressed = zlib.compress(body, self.compression_level)
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, body, size, fetched_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, compressed, len(compressed), time.time()))
+                self._evict()
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            else:
+                self._conn.execute('COMMIT')
+
+    def _evict(self) -> None:
+        """Delete the oldest entries until the total size is under `max_bytes`."""
+        total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        rows = self._conn.execute(
+            'SELECT key, size FROM responses ORDER BY fetched_at').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self._DiskCache_logger.debug("Evicted cached responses",
+                                     extra={'n_evicted': evicted})
+
+    @property
+    def size(self) -> int:
+        """
+        Total compressed size of the stored bodies, in bytes.
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def __len__(self) -> int:
+        """Return the number of stored responses, including expired ones."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
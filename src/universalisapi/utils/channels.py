@@ -0,0 +1,69 @@
+"""Names of the channels of Universalis' WebSocket feed."""
+
+import re
+from typing import Literal
+
+from ..exceptions import UniversalisError
+
+
+EventChannel = Literal['listings/add', 'listings/remove', 'sales/add', 'sales/remove']
+CHANNELS: tuple[EventChannel, ...] = ('listings/add', 'listings/remove', 'sales/add',
+                                      'sales/remove')
+
+_CHANNEL_PATTERN = re.compile(r'^([a-z/]+)(?:\{([^}]*)\})?$')
+
+
+def format_channel(channel: EventChannel, world: int | None = None) -> str:
+    """
+    Return the channel name Universalis expects, e.g. ``'listings/add{world=73}'``.
+
+    Parameters
+    ----------
+    channel : EventChannel
+    world : int or None, optional
+        Only receive events for this world.
+
+    Returns
+    -------
+    str
+
+    Raises
+    ------
+    UniversalisError
+        If `channel` is not one of ``CHANNELS``.
+    """
+    if channel not in CHANNELS:
+        raise UniversalisError(f"Unknown channel: {channel}")
+    return channel if world is None else f'{channel}{{world={world}}}'
+
+
+def parse_channel(name: str) -> tuple[str, dict[str, str]]:
+    """
+    Split a channel name into the event type and its filters.
+
+    Parameters
+    ----------
+    name : str
+        E.g. ``'listings/add{world=73}'``.
+
+    Returns
+    -------
+    tuple[str, dict[str, str]]
+        E.g. ``('listings/add', {'world': '73'})``.
+
+    Raises
+    ------
+    UniversalisError
+        If `name` is not a valid channel name.
+    """
+    match = _CHANNEL_PATTERN.match(name)
+    if match is None:
+        raise UniversalisError(f"Invalid channel: {name}")
+    channel, filters = match.groups()
+    parsed = {}
+    for part in filter(None, (filters or '').split(',')):
+        key, sep, value = part.partition('=')
+        if not sep:
+            raise UniversalisError(f"Invalid channel filter: {part}")
+        parsed[key.strip()] = value.strip()
+    return channel, parsed
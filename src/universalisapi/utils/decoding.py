@@ -0,0 +1,57 @@
+"""Pluggable JSON decoding of response bodies."""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from ..exceptions import UniversalisError
+
+
+type JSONDecoder = Callable[[bytes], Any]
+
+JSON_DECODERS = ('orjson', 'msgspec', 'json')
+"""Names accepted by ``get_json_decoder``, in the order ``'auto'`` tries them."""
+
+
+def get_json_decoder(name: str = 'auto') -> JSONDecoder:
+    """
+    Return a function that decodes a JSON ``bytes`` body.
+
+    Parameters
+    ----------
+    name : str, optional
+        One of ``'orjson'``, ``'msgspec'`` or ``'json'`` (the standard library).
+        ``'auto'`` picks the first of these that is installed. Defaults to
+        ``'auto'``.
+
+    Returns
+    -------
+    JSONDecoder
+
+    Raises
+    ------
+    UniversalisError
+        If `name` is unknown, or names a library that isn't installed.
+    """
+    if name == 'auto':
+        for candidate in JSON_DECODERS:
+            try:
+                return get_json_decoder(candidate)
+            except UniversalisError:
+                continue
+    if name == 'orjson':
+        try:
+            import orjson
+        except ImportError:
+            raise UniversalisError("orjson is not installed")
+        return orjson.loads
+    elif name == 'msgspec':
+        try:
+            import msgspec
+        except ImportError:
+            raise UniversalisError("msgspec is not installed")
+        return msgspec.json.Decoder().decode
+    elif name == 'json':
+        return json.loads
+    else:
+        raise UniversalisError(f"Unknown JSON decoder: {name}")
@@ -0,0 +1,101 @@
+"""Client-side request throttling."""
+
+import asyncio
+import logging
+import math
+import time
+
+from ..exceptions import UniversalisError
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    An asynchronous token bucket.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per second.
+    Every request takes one token; when the bucket is empty, callers wait for their
+    turn in the order they arrived.
+
+    The limiter does not use any ``asyncio`` synchronization primitives, so a single
+    instance can be shared between event loops (and therefore between clients).
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added to the bucket per second, i.e. the sustained requests/sec.
+    burst : int, optional
+        Size of the bucket, i.e. how many requests may be sent at once after a
+        quiet period. Defaults to `rate`, rounded up.
+
+    Raises
+    ------
+    UniversalisError
+        If `rate` or `burst` is not positive.
+    """
+
+    _RateLimiter_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        if rate <= 0:
+            raise UniversalisError("rate must be positive")
+        if burst is None:
+            burst = math.ceil(rate)
+        if burst <= 0:
+            raise UniversalisError("burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens: float = burst
+        self._updated = time.monotonic()
+
+    @property
+    def available(self) -> float:
+        """
+        Number of tokens currently in the bucket.
+
+        Negative values mean that many requests are already queued.
+
+        Returns
+        -------
+        float
+        """
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens: int) -> float:
+        """Take `tokens` from the bucket and return how long to wait for them."""
+        self._refill()
+        self._tokens -= tokens
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """
+        Wait until `tokens` tokens are available and take them.
+
+        If the wait is cancelled, the tokens are returned to the bucket.
+
+        Parameters
+        ----------
+        tokens : int, optional
+            Defaults to 1.
+        """
+        delay = self._reserve(tokens)
+        if delay <= 0:
+            return
+        self._RateLimiter_logger.debug("Rate limit reached, waiting",
+                                       extra={'delay': delay})
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self._tokens += tokens
+            raise
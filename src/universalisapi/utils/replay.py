@@ -0,0 +1,217 @@
+"""A local stand-in for Universalis' WebSocket server, for testing and load testing."""
+
+import asyncio
+import logging
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+from aiohttp import WSMsgType, web
+
+from ..exceptions import UniversalisError
+from . import bson
+from .channels import parse_channel
+
+
+module_logger = logging.getLogger(__name__)
+
+
+def read_events(path: str | Path) -> list[dict[str, Any]]:
+    """
+    Read recorded events from a file of concatenated BSON documents.
+
+    Parameters
+    ----------
+    path : str or Path
+
+    Returns
+    -------
+    list[dict[str, Any]]
+    """
+    return bson.decode_all(Path(path).read_bytes())
+
+
+def write_events(path: str | Path, events: Iterable[Mapping[str, Any]]) -> None:
+    """
+    Record events to a file of concatenated BSON documents.
+
+    Parameters
+    ----------
+    path : str or Path
+    events : Iterable[Mapping[str, Any]]
+        Events in Universalis' message format.
+    """
+    Path(path).write_bytes(b''.join(map(bson.encode, events)))
+
+
+class ReplayServer:
+    """
+    An in-process WebSocket server that replays recorded events.
+
+    The server speaks Universalis' protocol: clients send BSON ``subscribe`` and
+    ``unsubscribe`` messages naming a channel (optionally filtered by world), and
+    receive the BSON events matching their subscriptions. Each connection replays
+    `events` from the start once it has made `start_after` subscriptions, so
+    clients that subscribe to several channels don't miss the first events.
+
+    Parameters
+    ----------
+    events : Iterable[Mapping[str, Any]]
+        Events in Universalis' message format, e.g. from ``read_events``.
+    host : str, optional
+        Defaults to ``'127.0.0.1'``.
+    port : int, optional
+        Defaults to 0, which picks a free port.
+    batch_size : int, optional
+        How many events to send per frame, as concatenated documents. Defaults to
+        1, like Universalis.
+    rate : float or None, optional
+        Events per second to send to each connection. Defaults to ``None``, which
+        sends them as fast as the client reads them.
+    start_after : int, optional
+        Defaults to 1.
+    disconnect_after : int or None, optional
+        Drop each connection after sending it this many events, to exercise
+        reconnecting. Defaults to ``None``.
+
+    Attributes
+    ----------
+    connections : int
+        Number of connections accepted.
+    events_sent : int
+
+    Examples
+    --------
+    >>> async with ReplayServer(read_events('events.bson')) as server:
+    ...     async with UniversalisWebSocket(server.url) as ws:
+    ...         ...
+    """
+
+    _ReplayServer_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, events: Iterable[Mapping[str, Any]], *,
+                 host: str = '127.0.0.1', port: int = 0, batch_size: int = 1,
+                 rate: float | None = None, start_after: int = 1,
+                 disconnect_after: int | None = None) -> None:
+        if batch_size < 1:
+            raise UniversalisError("batch_size must be at least 1")
+        # encoded once up front, so replaying costs no more than sending
+        self._events = [(event['event'], event.get('world'), bson.encode(event))
+                        for event in events]
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.rate = rate
+        self.start_after = start_after
+        self.disconnect_after = disconnect_after
+        self.connections = 0
+        self.events_sent = 0
+        self._runner: web.AppRunner | None = None
+        self._sockets: set[web.WebSocketResponse] = set()
+
+    async def __aenter__(self) -> Self:
+        """Start serving."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None,
+                        exc_val: BaseException | None,
+                        exc_tb: TracebackType | None) -> None:
+        """Stop serving."""
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """The server's WebSocket URL."""
+        return f'ws://{self.host}:{self.port}/api/ws'
+
+    async def start(self) -> None:
+        """Start listening."""
+        app = web.Application()
+        app.router.add_get('/api/ws', self._handle)
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        # the port actually bound, if 0 was asked for
+        self.port = self._runner.addresses[0][1]
+
+    async def close(self) -> None:
+        """Stop listening and drop every connection."""
+        if self._runner is not None:
+            # open sockets would otherwise hold up shutdown
+            await asyncio.gather(*(ws.close() for ws in list(self._sockets)),
+                                 return_exceptions=True)
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self._sockets.add(ws)
+        channels: set[tuple[str, int | None]] = set()
+        subscribed = 0
+        sender: asyncio.Task | None = None
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.BINARY:
+                    continue
+                try:
+                    messages = bson.decode_all(message.data)
+                except UniversalisError:
+                    self._ReplayServer_logger.warning("Ignoring malformed message")
+                    continue
+                for data in messages:
+                    try:
+                        channel = _parse_subscription(data.get('channel', ''))
+                    except (UniversalisError, ValueError):
+                        self._ReplayServer_logger.warning(
+                            "Ignoring invalid channel",
+                            extra={'channel': data.get('channel')})
+                        continue
+                    if data.get('event') == 'subscribe':
+                        channels.add(channel)
+                        subscribed += 1
+                    elif data.get('event') == 'unsubscribe':
+                        channels.discard(channel)
+                if sender is None and subscribed >= self.start_after:
+                    sender = asyncio.ensure_future(self._replay(ws, channels))
+        finally:
+            self._sockets.discard(ws)
+            if sender is not None:
+                sender.cancel()
+                await asyncio.gather(sender, return_exceptions=True)
+        return ws
+
+    async def _replay(self, ws: web.WebSocketResponse,
+                      channels: set[tuple[str, int | None]]) -> None:
+        """Send the events matching `channels` (which may change meanwhile)."""
+        batch: list[bytes] = []
+        sent = 0
+        for event, world, encoded in self._events:
+            if (event, None) not in channels and (event, world) not in channels:
+                continue
+            batch.append(encoded)
+            if len(batch) < self.batch_size:
+                continue
+            sent += await self._send(ws, batch)
+            batch = []
+            if self.disconnect_after is not None and sent >= self.disconnect_after:
+                await ws.close()
+                return
+        if batch:
+            await self._send(ws, batch)
+
+    async def _send(self, ws: web.WebSocketResponse, batch: list[bytes]) -> int:
+        await ws.send_bytes(b''.join(batch))
+        self.events_sent += len(batch)
+        if self.rate is not None:
+            await asyncio.sleep(len(batch) / self.rate)
+        return len(batch)
+
+
+def _parse_subscription(name: str) -> tuple[str, int | None]:
+    channel, filters = parse_channel(name)
+    world = filters.get('world')
+    return channel, None if world is None else int(world)
@@ -0,0 +1,138 @@
+"""Retry policy for idempotent requests."""
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed GET request.
+
+    Delays grow exponentially (``backoff_base * 2 ** (attempt - 1)``, capped at
+    ``backoff_max``) with "full jitter", i.e. a uniformly random delay between 0
+    and that value. A ``Retry-After`` header on the response takes precedence.
+
+    Attributes
+    ----------
+    max_attempts : int
+        Total number of attempts, including the first one.
+    backoff_base : float
+        Seconds to wait (before jitter) after the first failed attempt.
+    backoff_max : float
+        Maximum seconds to wait (before jitter) between attempts.
+    max_elapsed : float
+        Give up rather than wait past this many seconds since the first attempt.
+    jitter : bool
+        Whether to randomize delays.
+    retry_statuses : frozenset[int]
+        Status codes worth retrying.
+    retry_connection_errors : bool
+        Whether to retry connection errors and timeouts.
+    """
+
+    max_attempts: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    max_elapsed: float = 60.0
+    jitter: bool = True
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    retry_connection_errors: bool = True
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay after failed attempt number `attempt` (starting at 1).
+
+        Parameters
+        ----------
+        attempt : int
+
+        Returns
+        -------
+        float
+        """
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(self, attempt: int, elapsed: float, *,
+                   retry_after: float | None = None) -> float | None:
+        """
+        Return how long to wait before the next attempt, or ``None`` to give up.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the attempt that just failed (starting at 1).
+        elapsed : float
+            Seconds since the first attempt was sent.
+        retry_after : float or None, optional
+            The server's ``Retry-After`` value, in seconds.
+
+        Returns
+        -------
+        float or None
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        if elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+
+@dataclass
+class RetryStats:
+    """
+    Running totals of what retrying has cost a client.
+
+    Keys are HTTP status codes, or the name of the exception type for connection
+    errors and timeouts.
+
+    Attributes
+    ----------
+    retries : Counter
+        Number of retried attempts, by failure.
+    exhausted : Counter
+        Number of requests that failed for good after retrying, by final failure.
+    total_delay : float
+        Total seconds spent waiting between attempts.
+    """
+
+    retries: Counter = field(default_factory=Counter)
+    exhausted: Counter = field(default_factory=Counter)
+    total_delay: float = 0.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a ``Retry-After`` header into seconds from now.
+
+    Parameters
+    ----------
+    value : str or None
+        Either a number of seconds or an HTTP date.
+
+    Returns
+    -------
+    float or None
+        ``None`` if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
@@ -0,0 +1,449 @@
+"""Adaptive polling of a market board watchlist."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+
+from .api_objects.mb_data import MBDataResponseItem
+from .exceptions import UniversalisError
+from .utils.rate_limit import RateLimiter
+from .utils.types import APIRegion
+
+if TYPE_CHECKING:
+    from .client import UniversalisAPIClient
+
+
+module_logger = logging.getLogger(__name__)
+
+_SECONDS_PER_DAY = 86400
+
+# put on the change queue to wake up a consumer when the watcher stops
+_STOPPED = object()
+
+
+@dataclass(slots=True, frozen=True)
+class MarketChange:
+    """
+    New market board data for a watched item.
+
+    Attributes
+    ----------
+    item_id : int
+    region : APIRegion
+    item : MBDataResponseItem
+        The item's new data.
+    previous_upload_time : int or None
+        The item's ``lastUploadTime`` (in milliseconds) when it was last checked, or
+        ``None`` if this is its first check.
+    """
+
+    item_id: int
+    region: APIRegion
+    item: MBDataResponseItem
+    previous_upload_time: int | None
+
+
+@dataclass(slots=True)
+class _WatchEntry:
+    """Scheduling state for one watched (item, region) pair."""
+
+    item_id: int
+    region: APIRegion
+    interval: float
+    due: float
+    last_checked: float | None = None
+    last_upload_time: int | None = None
+    sale_velocity: float = 0.0
+    change_rate: float = 0.0
+    """Smoothed changes per second seen between checks."""
+    active: bool = True
+
+
+class MarketWatcher:
+    """
+    Keeps a watchlist of (item, region) pairs up to date, busy items most often.
+
+    Each pair is checked again after an interval based on how often it is expected
+    to change: its ``regularSaleVelocity``, plus how often its ``lastUploadTime``
+    has actually changed between checks (smoothed over recent checks). The interval
+    is kept between `min_interval` and `max_interval`.
+
+    Due pairs wait in a priority queue per region, and are sent as
+    /``region``/``item_ids`` requests of up to 100 items. A request is topped up
+    with pairs that are due within `lookahead` seconds, so requests are full rather
+    than frequent. Requests are limited to `requests_per_minute` by ``budget``, on
+    top of the client's own rate limit; when the budget runs short, the most overdue
+    pairs are checked first.
+
+    Items whose ``lastUploadTime`` has changed are delivered as ``MarketChange``
+    events by iterating over the watcher. At most `max_pending_changes` events are
+    held; once that many are waiting, checks stop until they are consumed.
+    Iteration ends once the watcher is stopped and the pending events are read.
+
+    Parameters
+    ----------
+    client : UniversalisAPIClient
+        The client to send requests through.
+    watchlist : Iterable[tuple[int, APIRegion]], optional
+        (item ID, region) pairs to watch. More can be added with ``watch``.
+    requests_per_minute : float, optional
+        The request budget. Defaults to 600.
+    min_interval : float, optional
+        Seconds between checks of the busiest items. Defaults to 60.
+    max_interval : float, optional
+        Seconds between checks of items that never change. Defaults to 3600.
+    lookahead : float or None, optional
+        How early items may be checked to fill up a request, in seconds. Defaults to
+        ``None``, i.e. `min_interval`.
+    max_pending_changes : int, optional
+        Defaults to 1000.
+    smoothing : float, optional
+        Weight of the latest check in each item's change rate, between 0 and 1.
+        Defaults to 0.3.
+
+    Other Parameters
+    ----------------
+    **params
+        Passed on to ``UniversalisAPIClient.mb_current_data`` (e.g. ``listings``).
+
+    Attributes
+    ----------
+    budget : RateLimiter
+    requests_made : int
+    items_checked : int
+    changes_seen : int
+    error : BaseException or None
+        Why the watcher stopped, if it failed.
+
+    Raises
+    ------
+    UniversalisError
+        If `min_interval` is not positive or is above `max_interval`.
+
+    Examples
+    --------
+    >>> async with MarketWatcher(client, [(5057, 'crystal'), (5057, 'aether')],
+    ...                          requests_per_minute=120) as watcher:
+    ...     async for change in watcher:
+    ...         print(change.item_id, change.region, change.item.best_price)
+    """
+
+    _MarketWatcher_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, client: 'UniversalisAPIClient',
+                 watchlist: Iterable[tuple[int, APIRegion]] = (), *,
+                 requests_per_minute: float = 600.0,
+                 min_interval: float = 60.0,
+                 max_interval: float = 3600.0,
+                 lookahead: float | None = None,
+                 max_pending_changes: int = 1000,
+                 smoothing: float = 0.3,
+                 **params: Any) -> None:  # noqa: ANN401 (forwarded to the client)
+        if not 0 < min_interval <= max_interval:
+            raise UniversalisError("Intervals must satisfy 0 < min_interval <= "
+                                   "max_interval")
+        self.client = client
+        self.budget = RateLimiter(requests_per_minute / 60)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.lookahead = min_interval if lookahead is None else lookahead
+        self.smoothing = smoothing
+        self.params = params
+
+        self.requests_made = 0
+        self.items_checked = 0
+        self.changes_seen = 0
+        self.error: BaseException | None = None
+
+        self._entries: dict[tuple[int, APIRegion], _WatchEntry] = {}
+        self._queues: dict[APIRegion, list[tuple[float, int, _WatchEntry]]] = {}
+        self._counter = itertools.count()
+        self._changes: asyncio.Queue = asyncio.Queue(max_pending_changes)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopped = False
+        self._checks: set[asyncio.Task] = set()
+
+        for item_id, region in watchlist:
+            self.watch(item_id, region)
+
+    async def __aenter__(self) -> Self:
+        """Start watching."""
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None,
+                        exc_val: BaseException | None,
+                        exc_tb: TracebackType | None) -> None:
+        """Stop watching."""
+        await self.stop()
+
+    def __len__(self) -> int:
+        """Return the number of watched (item, region) pairs."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether an (item, region) pair is watched."""
+        return key in self._entries
+
+    def __aiter__(self) -> AsyncIterator[MarketChange]:
+        """Iterate over changes; see ``changes``."""
+        return self.changes()
+
+    async def changes(self) -> AsyncIterator[MarketChange]:
+        """
+        Yield changes as they are found, until the watcher is stopped.
+
+        Yields
+        ------
+        MarketChange
+
+        Raises
+        ------
+        UniversalisError
+            If the watcher stopped because it failed.
+        """
+        while True:
+            if self._stopped and self._changes.empty():
+                break
+            change = await self._changes.get()
+            if change is not _STOPPED:
+                yield change
+        if self.error is not None:
+            raise UniversalisError("MarketWatcher failed") from self.error
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher has been started and not stopped."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start checking the watchlist in the background."""
+        if not self.running:
+            self.error = None
+            self._stopped = False
+            self._task = asyncio.ensure_future(self._run())
+            self._task.add_done_callback(self._finished)
+
+    async def stop(self) -> None:
+        """
+        Stop checking the watchlist, cancelling any requests in flight.
+
+        Iteration over the watcher ends once the changes already found are read.
+        """
+        tasks = list(self._checks)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._end()
+
+    def _finished(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._MarketWatcher_logger.error("Watcher failed",
+                                             extra={'error': error})
+            self.error = error
+            for check in self._checks:
+                check.cancel()
+            self._end()
+
+    def _end(self) -> None:
+        if not self._stopped:
+            self._stopped = True
+            # only a consumer waiting on an empty queue needs waking up
+            if self._changes.empty():
+                self._changes.put_nowait(_STOPPED)
+
+    def watch(self, item_id: int, region: APIRegion) -> None:
+        """
+        Add (`item_id`, `region`) to the watchlist, to be checked right away.
+
+        Parameters
+        ----------
+        item_id : int
+        region : APIRegion
+
+        Raises
+        ------
+        UniversalisError
+            If `region` is not an ``APIRegion``.
+        """
+        if (item_id, region) in self._entries:
+            return
+        self.client._check_region_name(region)
+        entry = _WatchEntry(item_id, region, interval=self.min_interval,
+                            due=time.monotonic())
+        self._entries[item_id, region] = entry
+        self._push(entry)
+
+    def unwatch(self, item_id: int, region: APIRegion) -> bool:
+        """
+        Remove (`item_id`, `region`) from the watchlist.
+
+        Parameters
+        ----------
+        item_id : int
+        region : APIRegion
+
+        Returns
+        -------
+        bool
+            Whether the pair was being watched.
+        """
+        entry = self._entries.pop((item_id, region), None)
+        if entry is None:
+            return False
+        # left in its queue, and skipped when it comes up
+        entry.active = False
+        return True
+
+    def interval(self, item_id: int, region: APIRegion) -> float:
+        """
+        Return the current number of seconds between checks of a watched pair.
+
+        Parameters
+        ----------
+        item_id : int
+        region : APIRegion
+
+        Returns
+        -------
+        float
+
+        Raises
+        ------
+        KeyError
+            If the pair is not being watched.
+        """
+        return self._entries[item_id, region].interval
+
+    def _push(self, entry: _WatchEntry) -> None:
+        heapq.heappush(self._queues.setdefault(entry.region, []),
+                       (entry.due, next(self._counter), entry))
+        self._wakeup.set()
+
+    def _earliest(self) -> tuple[float, APIRegion] | None:
+        """Return the earliest due time of any queued pair, and its region."""
+        earliest = None
+        for region, queue in self._queues.items():
+            while queue and not queue[0][2].active:
+                heapq.heappop(queue)
+            if queue and (earliest is None or queue[0][0] < earliest[0]):
+                earliest = (queue[0][0], region)
+        return earliest
+
+    def _take_batch(self, region: APIRegion, now: float) -> list[_WatchEntry]:
+        """Pop up to a request's worth of pairs due by ``now + lookahead``."""
+        queue = self._queues[region]
+        batch: list[_WatchEntry] = []
+        while (queue and len(batch) < self.client.max_items_per_request
+               and queue[0][0] <= now + self.lookahead):
+            entry = heapq.heappop(queue)[2]
+            if entry.active:
+                batch.append(entry)
+        return batch
+
+    def _next_interval(self, entry: _WatchEntry) -> float:
+        """Return the expected seconds between changes of `entry`, within bounds."""
+        rate = entry.sale_velocity / _SECONDS_PER_DAY + entry.change_rate
+        interval = 1 / rate if rate > 0 else self.max_interval
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _observe(self, entry: _WatchEntry, item: MBDataResponseItem,
+                 now: float) -> bool:
+        """Update `entry` from a check at `now`; return whether the item changed."""
+        upload_time = item.last_upload_timestamp
+        changed = upload_time != entry.last_upload_time
+        if entry.last_checked is not None:
+            observed = (1.0 if changed else 0.0) / max(now - entry.last_checked, 1e-9)
+            entry.change_rate += self.smoothing * (observed - entry.change_rate)
+        entry.last_checked = now
+        entry.last_upload_time = upload_time
+        entry.sale_velocity = item.sale_velocity
+        entry.interval = self._next_interval(entry)
+        return changed
+
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(self.client.max_concurrent_requests)
+        while True:
+            earliest = self._earliest()
+            if earliest is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = earliest[0] - time.monotonic()
+            if delay > 0:
+                # wake up early if something new is watched
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except TimeoutError:
+                    pass
+                continue
+
+            await semaphore.acquire()
+            await self.budget.acquire()
+            # more pairs may have come due while waiting
+            earliest = self._earliest()
+            region = None if earliest is None else earliest[1]
+            batch = ([] if region is None
+                     else self._take_batch(region, time.monotonic()))
+            if region is None or not batch:
+                semaphore.release()
+                continue
+            task = asyncio.ensure_future(self._check(region, batch, semaphore))
+            self._checks.add(task)
+            task.add_done_callback(self._checks.discard)
+
+    async def _check(self, region: APIRegion, batch: list[_WatchEntry],
+                     semaphore: asyncio.Semaphore) -> None:
+        """Fetch `batch`, emit its changes and schedule its next checks."""
+        try:
+            item_ids = sorted(entry.item_id for entry in batch)
+            self.requests_made += 1
+            try:
+                resp = await self.client.mb_current_data(item_ids, region, lazy=True,
+                                                         **self.params)
+            except Exception as e:
+                self._MarketWatcher_logger.warning(
+                    "Check failed, retrying later",
+                    extra={'region': region, 'n_items': len(batch), 'error': e})
+                now = time.monotonic()
+                for entry in batch:
+                    self._reschedule(entry, now)
+                return
+
+            now = time.monotonic()
+            self.items_checked += len(batch)
+            for entry in batch:
+                item = resp.items.get(entry.item_id)
+                if item is None:
+                    # no data, so nothing is likely to change soon
+                    entry.interval = self.max_interval
+                    continue
+                previous_upload_time = entry.last_upload_time
+                if self._observe(entry, item, now) and entry.active:
+                    self.changes_seen += 1
+                    # blocks while the consumer is behind, holding up further checks
+                    await self._changes.put(MarketChange(
+                        entry.item_id, region, item, previous_upload_time))
+            for entry in batch:
+                self._reschedule(entry, now)
+        finally:
+            semaphore.release()
+
+    def _reschedule(self, entry: _WatchEntry, now: float) -> None:
+        if entry.active:
+            entry.due = now + entry.interval
+            self._push(entry)
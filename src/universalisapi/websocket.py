@@ -0,0 +1,465 @@
+"""Subscription client for Universalis' WebSocket feed of market board events."""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self
+
+import aiohttp
+
+from .exceptions import UniversalisError
+from .utils import bson
+from .utils.channels import EventChannel, format_channel
+from .utils.retry import RetryPolicy
+
+
+module_logger = logging.getLogger(__name__)
+
+_CLOSED = object()
+
+
+@dataclass(slots=True, frozen=True)
+class MarketEvent:
+    """
+    A listing or sale event from the WebSocket feed.
+
+    Attributes
+    ----------
+    event : EventChannel
+        The event type, e.g. ``'listings/add'``.
+    item_id : int
+    world_id : int
+    listings : tuple[dict, ...]
+        The listings added or removed, in the API's format. Empty for sale events.
+    sales : tuple[dict, ...]
+        The sales added or removed, in the API's format. Empty for listing events.
+    """
+
+    event: EventChannel
+    item_id: int
+    world_id: int
+    listings: tuple[dict, ...] = ()
+    sales: tuple[dict, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """
+        Create an event from a decoded message.
+
+        Parameters
+        ----------
+        data : Mapping[str, Any]
+            A message with ``event``, ``item``, ``world`` and ``listings`` or
+            ``sales`` keys.
+
+        Returns
+        -------
+        MarketEvent
+        """
+        return cls(data['event'], data['item'], data['world'],
+                   tuple(data.get('listings') or ()), tuple(data.get('sales') or ()))
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """The event in Universalis' message format."""
+        data: dict[str, Any] = {'event': self.event, 'item': self.item_id,
+                                'world': self.world_id}
+        if self.event.startswith('listings'):
+            data['listings'] = list(self.listings)
+        else:
+            data['sales'] = list(self.sales)
+        return data
+
+
+class Subscription:
+    """
+    A filtered stream of events from a ``UniversalisWebSocket``.
+
+    Created by ``UniversalisWebSocket.subscribe``, and iterated over asynchronously
+    to receive events. Iteration ends when the subscription or its socket is
+    closed.
+
+    Attributes
+    ----------
+    channel : EventChannel
+    world : int or None
+        The world events are filtered to by the server, if any.
+    items : frozenset[int] or None
+        The items events are filtered to, if any. Universalis can't filter by item,
+        so this is done by the client.
+    """
+
+    def __init__(self, socket: 'UniversalisWebSocket', channel: EventChannel,
+                 world: int | None, items: frozenset[int] | None,
+                 max_pending: int) -> None:
+        self.channel = channel
+        self.world = world
+        self.items = items
+        self._socket = socket
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._closed = False
+        self._discarded = False
+
+    def __repr__(self) -> str:
+        """Return the subscription's channel and filters."""
+        return (f'{type(self).__name__}({self.channel!r}, world={self.world!r}, '
+                f'items={self.items!r})')
+
+    @property
+    def server_channel(self) -> str:
+        """The channel name sent to Universalis."""
+        return format_channel(self.channel, self.world)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the subscription has been closed."""
+        return self._closed
+
+    def matches(self, event: MarketEvent) -> bool:
+        """
+        Return whether `event` belongs to this subscription.
+
+        Parameters
+        ----------
+        event : MarketEvent
+
+        Returns
+        -------
+        bool
+        """
+        return (event.event == self.channel
+                and (self.world is None or event.world_id == self.world)
+                and (self.items is None or event.item_id in self.items))
+
+    def __aiter__(self) -> Self:
+        """Return the subscription, which is its own iterator."""
+        return self
+
+    async def __anext__(self) -> MarketEvent:
+        """Wait for the next event."""
+        if self._closed and (self._discarded or self._queue.empty()):
+            self._raise_if_failed()
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        if event is _CLOSED:
+            self._raise_if_failed()
+            raise StopAsyncIteration
+        return event
+
+    async def close(self) -> None:
+        """Unsubscribe, discarding any pending events and ending iteration."""
+        await self._socket.unsubscribe(self)
+
+    def _close(self, discard: bool = False) -> None:
+        if not self._closed:
+            self._closed = True
+            if not self._queue.empty():
+                # nobody is waiting on a non-empty queue, but the socket may be
+                # waiting for room in it
+                if discard:
+                    self._discarded = True
+                    while not self._queue.empty():
+                        self._queue.get_nowait()
+                return
+            # wakes up a consumer waiting on the empty queue
+            self._queue.put_nowait(_CLOSED)
+
+    def _raise_if_failed(self) -> None:
+        error = self._socket.error
+        if error is not None:
+            raise UniversalisError("WebSocket connection failed") from error
+
+
+class UniversalisWebSocket:
+    """
+    Client for Universalis' WebSocket feed of listing and sale events.
+
+    Messages in both directions are BSON documents. Subscriptions are made per
+    channel (``'listings/add'``, ``'listings/remove'``, ``'sales/add'`` and
+    ``'sales/remove'``), optionally filtered to a world by the server and to a set
+    of items by the client. Subscriptions sharing a server channel share one
+    server-side subscription.
+
+    The connection is made in the background, and remade if it drops, waiting
+    between attempts according to `retry_policy`; every subscription is renewed on
+    reconnecting. Events sent while disconnected are lost.
+
+    Each subscription queues at most `max_pending_events` events. When a
+    subscription's queue is full, the socket stops reading until it is consumed, so
+    the server (or the network) holds back further events rather than the client's
+    memory filling up. A slow consumer therefore holds up every subscription on the
+    socket; use separate sockets for consumers that can't keep pace.
+
+    Parameters
+    ----------
+    url : str or None, optional
+        The WebSocket URL. Defaults to ``None``, which uses ``ws_url``.
+    session : aiohttp.ClientSession or None, optional
+        The session to connect with. A session passed in is never closed by the
+        socket. Defaults to ``None``, which creates one on ``connect``.
+    max_pending_events : int, optional
+        Defaults to 1000.
+    retry_policy : RetryPolicy or None, optional
+        When and how long to wait between connection attempts. The attempt count
+        and elapsed time reset on each successful connection. Defaults to 10
+        attempts within 5 minutes; ``None`` never reconnects.
+    heartbeat : float or None, optional
+        Seconds between pings to detect dead connections. Defaults to 30.
+
+    Attributes
+    ----------
+    connects : int
+        Number of successful connections made.
+    events_received : int
+    error : BaseException or None
+        Why the socket gave up reconnecting, if it has: the last connection or
+        receive error, including malformed messages from the server.
+
+    Examples
+    --------
+    >>> async with UniversalisWebSocket() as ws:
+    ...     sub = await ws.subscribe('listings/add', world=73, items={5057, 5058})
+    ...     async for event in sub:
+    ...         print(event.item_id, len(event.listings))
+    """
+
+    ws_url = 'wss://universalis.app/api/ws'
+
+    _UniversalisWebSocket_logger = module_logger.getChild(__qualname__)
+
+    def __init__(self, url: str | None = None, *,
+                 session: aiohttp.ClientSession | None = None,
+                 max_pending_events: int = 1000,
+                 retry_policy: RetryPolicy | None = RetryPolicy(
+                     max_attempts=10, backoff_max=30.0, max_elapsed=300.0),
+                 heartbeat: float | None = 30.0) -> None:
+        self.url = self.ws_url if url is None else url
+        self.max_pending_events = max_pending_events
+        self.retry_policy = retry_policy
+        self.heartbeat = heartbeat
+        self.connects = 0
+        self.events_received = 0
+        self.error: BaseException | None = None
+
+        self._session = session
+        self._owns_session = session is None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._task: asyncio.Task | None = None
+        self._connected = asyncio.Event()
+        self._subscriptions: list[Subscription] = []
+        self._channels: Counter[str] = Counter()
+
+    async def __aenter__(self) -> Self:
+        """Connect."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None,
+                        exc_val: BaseException | None,
+                        exc_tb: TracebackType | None) -> None:
+        """Disconnect."""
+        await self.close()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the socket is currently connected."""
+        return self._ws is not None and not self._ws.closed
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        """The open subscriptions."""
+        return list(self._subscriptions)
+
+    async def connect(self) -> None:
+        """
+        Connect, and keep reconnecting in the background until ``close``.
+
+        Raises
+        ------
+        UniversalisError
+            If no connection could be made within `retry_policy`.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        self.error = None
+        self._task = asyncio.ensure_future(self._run(self._session))
+        connected = asyncio.ensure_future(self._connected.wait())
+        await asyncio.wait((connected, self._task),
+                           return_when=asyncio.FIRST_COMPLETED)
+        connected.cancel()
+        if not self._connected.is_set():
+            raise UniversalisError(f"Could not connect to {self.url}") from self.error
+
+    async def close(self) -> None:
+        """Disconnect, ending every subscription once its pending events are read."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for subscription in self._subscriptions:
+            subscription._close()
+        self._subscriptions.clear()
+        self._channels.clear()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def subscribe(self, channel: EventChannel, *, world: int | None = None,
+                        items: Iterable[int] | None = None) -> Subscription:
+        """
+        Subscribe to a channel's events.
+
+        May be called before ``connect``, in which case the subscription is made
+        when the socket connects.
+
+        Parameters
+        ----------
+        channel : EventChannel
+        world : int or None, optional
+            Only receive events for this world ID.
+        items : Iterable[int] or None, optional
+            Only receive events for these item IDs.
+
+        Returns
+        -------
+        Subscription
+
+        Raises
+        ------
+        UniversalisError
+            If `channel` is not one of ``CHANNELS``.
+        """
+        subscription = Subscription(self, channel, world,
+                                    None if items is None else frozenset(items),
+                                    self.max_pending_events)
+        name = subscription.server_channel
+        self._subscriptions.append(subscription)
+        self._channels[name] += 1
+        if self._channels[name] == 1:
+            await self._send('subscribe', name)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Close `subscription`, unsubscribing from its channel if nothing else uses it.
+
+        Parameters
+        ----------
+        subscription : Subscription
+        """
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.remove(subscription)
+        subscription._close(discard=True)
+        name = subscription.server_channel
+        self._channels[name] -= 1
+        if not self._channels[name]:
+            del self._channels[name]
+            await self._send('unsubscribe', name)
+
+    async def _send(self, event: str, channel: str) -> None:
+        ws = self._ws
+        if ws is not None and not ws.closed:
+            await ws.send_bytes(bson.encode({'event': event, 'channel': channel}))
+
+    async def _run(self, session: aiohttp.ClientSession) -> None:
+        try:
+            await self._run_connections(session)
+        except Exception as e:
+            # subscriptions are still ended, or their consumers would wait forever
+            self._give_up(e)
+
+    async def _run_connections(self, session: aiohttp.ClientSession) -> None:
+        attempt = 0
+        lost_at = time.monotonic()
+        while True:
+            try:
+                ws = await session.ws_connect(self.url, heartbeat=self.heartbeat)
+            except (aiohttp.ClientError, OSError, TimeoutError) as e:
+                attempt += 1
+                if not await self._wait_to_reconnect(attempt, lost_at, e):
+                    return
+                continue
+
+            self._ws = ws
+            self.connects += 1
+            attempt = 0
+            self._UniversalisWebSocket_logger.debug("Connected",
+                                                    extra={'url': self.url})
+            try:
+                for name in list(self._channels):
+                    await self._send('subscribe', name)
+                self._connected.set()
+                await self._receive(ws)
+            except (aiohttp.ClientError, OSError, TimeoutError,
+                    UniversalisError) as e:
+                # a malformed message is treated like a dropped connection
+                error: BaseException = e
+            else:
+                error = ConnectionResetError("Connection closed by the server")
+            finally:
+                self._connected.clear()
+                await ws.close()
+                self._ws = None
+
+            self._UniversalisWebSocket_logger.warning(
+                "Connection lost, reconnecting", extra={'url': self.url,
+                                                        'error': error})
+            lost_at = time.monotonic()
+            attempt = 1
+            if not await self._wait_to_reconnect(attempt, lost_at, error):
+                return
+
+    async def _wait_to_reconnect(self, attempt: int, lost_at: float,
+                                 error: BaseException) -> bool:
+        """Sleep before reconnect attempt `attempt`; return ``False`` to give up."""
+        delay = None
+        if self.retry_policy is not None:
+            delay = self.retry_policy.next_delay(attempt, time.monotonic() - lost_at)
+        if delay is None:
+            self._give_up(error)
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    def _give_up(self, error: BaseException) -> None:
+        self._UniversalisWebSocket_logger.error(
+            "Giving up reconnecting", extra={'url': self.url, 'error': error})
+        self.error = error
+        for subscription in self._subscriptions:
+            subscription._close()
+        # a later connect starts afresh, rather than renewing ended subscriptions
+        self._subscriptions.clear()
+        self._channels.clear()
+
+    async def _receive(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        async for message in ws:
+            if message.type == aiohttp.WSMsgType.BINARY:
+                # a frame may hold several documents, which are decoded together
+                for data in bson.decode_all(message.data):
+                    if 'item' not in data:
+                        continue
+                    try:
+                        event = MarketEvent.from_dict(data)
+                    except (KeyError, TypeError, ValueError) as e:
+                        raise UniversalisError(f"Malformed event: {data!r}") from e
+                    await self._dispatch(event)
+            elif message.type == aiohttp.WSMsgType.ERROR:
+                error = ws.exception()
+                if error is None:
+                    raise UniversalisError("WebSocket error without an exception")
+                raise error
+
+    async def _dispatch(self, event: MarketEvent) -> None:
+        self.events_received += 1
+        for subscription in tuple(self._subscriptions):
+            if not subscription.closed and subscription.matches(event):
+                # blocks while the consumer is behind, holding up the socket
+                await subscription._queue.put(event)
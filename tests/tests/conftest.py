@@ -35,6 +35,8 @@ def mocked_worlds(mocked_response, base_url, worlds) -> None:
 def mocked_aggregated(mocked_response, base_url) -> Callable:
     """Return a function that generates mocked response of /aggregated."""
     def _mocked_aggregated_generator(item_ids, region, data) -> None:
+        # requests are sent with duplicate IDs removed
+        item_ids = ','.join(dict.fromkeys(item_ids.split(',')))
         url = f'{base_url}/aggregated/{region}/{item_ids}'
         mocked_response.get(url, status=200, payload=data)
     yield _mocked_aggregated_generator
@@ -51,6 +53,8 @@ def mocked_least_recent_items(mocked_response, base_url) -> Callable:
 def mocked_mb_current_data(mocked_response, base_url) -> Callable:
     """Return a function that generates a mocked response of /{region}/{item_ids}."""
     def _mocked_mb_current_data_generator(region, items_str, params, data):
+        # requests are sent with duplicate IDs removed
+        items_str = ','.join(dict.fromkeys(items_str.split(',')))
         url = f'{base_url}/{region}/{items_str}'
         if params:
             url += '?'
@@ -0,0 +1,123 @@
+from statistics import median
+
+import pytest
+
+from universalisapi.analysis.arbitrage import ArbitrageEngine
+from universalisapi.api_objects.listing_store import HAS_NUMPY
+from universalisapi.api_objects.mb_data import MBDataResponse
+from universalisapi.exceptions import UniversalisError
+
+NOW = 1_700_000_000
+
+
+@pytest.fixture(params=[
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY,
+                                                reason="NumPy is not installed"))
+], ids=['python', 'numpy'])
+def use_numpy(request) -> bool:
+    return request.param
+
+
+def _item(item_id: int, listings: list[tuple[int, int, int, bool]],
+          upload_times: dict[int, int]) -> dict:
+    return {
+        'itemID': item_id,
+        'lastUploadTime': NOW * 1000,
+        'listings': [{'listingID': f'{item_id}-{i}', 'worldID': world_id,
+                      'worldName': f'World{world_id}', 'pricePerUnit': price,
+                      'quantity': quantity, 'hq': hq}
+                     for i, (world_id, price, quantity, hq) in enumerate(listings)],
+        'worldUploadTimes': {str(world_id): ms for world_id, ms in upload_times.items()},
+    }
+
+
+@pytest.fixture
+def response() -> MBDataResponse:
+    items = {
+        # spread of 90 between worlds 1 and 2
+        1: _item(1, [(1, 10, 5, False), (1, 30, 1, True), (1, 20, 2, False),
+                     (2, 100, 1, False), (2, 120, 4, True)],
+                 {1: (NOW - 60) * 1000, 2: (NOW - 7200) * 1000}),
+        # spread of 5 across three worlds, world 3 has no upload time
+        2: _item(2, [(1, 50, 1, True), (2, 55, 3, True), (3, 52, 10, False)],
+                 {1: (NOW - 10) * 1000, 2: (NOW - 10) * 1000}),
+        # a single world
+        3: _item(3, [(1, 5, 1, False)], {1: NOW * 1000}),
+    }
+    data = {'itemIDs': list(items), 'items': {str(k): v for k, v in items.items()},
+            'dcName': 'Test', 'unresolvedItems': []}
+    return MBDataResponse(data, {})
+
+
+@pytest.mark.unittest
+class TestArbitrageEngine:
+
+    def test_quotes(self, response, use_numpy):
+        engine = ArbitrageEngine(response, use_numpy=use_numpy, now=NOW)
+        assert set(engine.quotes) == {1, 2, 3}
+        quote = engine.quotes[1][1]
+        assert quote.world_name == 'World1'
+        assert quote.min_price == 10
+        assert quote.median_price == 20
+        assert quote.depth == 8
+        assert quote.listings == 3
+        assert quote.age == pytest.approx(60)
+        assert engine.quotes[1][2].median_price == 110
+        assert engine.quotes[2][3].upload_time is None
+        assert engine.quotes[2][3].age is None
+
+    def test_hq(self, response, use_numpy):
+        engine = ArbitrageEngine(response, hq=True, use_numpy=use_numpy, now=NOW)
+        assert set(engine.quotes) == {1, 2}
+        assert engine.quotes[1][1].min_price == 30
+        assert set(engine.quotes[2]) == {1, 2}
+
+    def test_spreads(self, response, use_numpy):
+        engine = ArbitrageEngine(response, use_numpy=use_numpy, now=NOW)
+        spreads = engine.spreads()
+        assert [s.item_id for s in spreads] == [1, 2]
+        assert spreads[0].buy.world_id == 1
+        assert spreads[0].sell.world_id == 2
+        assert spreads[0].spread == 90
+        assert spreads[0].ratio == 9
+        assert (spreads[1].buy.world_id, spreads[1].sell.world_id) == (1, 2)
+        assert [s.item_id for s in engine.spreads(limit=1)] == [1]
+
+    def test_spread_filters(self, response, use_numpy):
+        engine = ArbitrageEngine(response, use_numpy=use_numpy, now=NOW)
+        # world 2 of item 1 is two hours old
+        assert [s.item_id for s in engine.spreads(max_age=3600)] == [2]
+        # only world 2 and 3 of item 2 have 3 units
+        spreads = engine.spreads(min_depth=3)
+        assert spreads[1].item_id == 2
+        assert (spreads[1].buy.world_id, spreads[1].sell.world_id) == (3, 2)
+
+    def test_world_response(self, use_numpy):
+        data = _item(1, [(1, 10, 1, False)], {})
+        for listing in data['listings']:
+            del listing['worldID'], listing['worldName']
+        with pytest.raises(UniversalisError):
+            ArbitrageEngine(MBDataResponse(data, {}), use_numpy=use_numpy)
+
+    def test_recorded(self, mb_data_data_objs, use_numpy):
+        data, resp = mb_data_data_objs
+        if 'worldName' in data:
+            with pytest.raises(UniversalisError):
+                ArbitrageEngine(resp, use_numpy=use_numpy)
+            return
+        engine = ArbitrageEngine(resp, use_numpy=use_numpy)
+        for item_id, item in resp.items.items():
+            by_world = {}
+            for listing in item.listings:
+                by_world.setdefault(listing['worldID'], []).append(listing)
+            quotes = engine.quotes.get(item_id, {})
+            assert set(quotes) == set(by_world)
+            for world_id, listings in by_world.items():
+                prices = [l['pricePerUnit'] for l in listings]
+                assert quotes[world_id].min_price == min(prices)
+                assert quotes[world_id].median_price == median(prices)
+                assert quotes[world_id].depth == sum(l['quantity'] for l in listings)
+        spreads = engine.spreads()
+        assert [s.spread for s in spreads] == sorted((s.spread for s in spreads),
+                                                     reverse=True)
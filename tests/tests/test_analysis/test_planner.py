@@ -0,0 +1,126 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from universalisapi.analysis.planner import PurchasePlanner
+from universalisapi.api_objects.mb_data import MBDataResponseItem
+from universalisapi.exceptions import UniversalisError
+
+WORLDS = {1: 'Alpha', 2: 'Beta', 3: 'Gamma'}
+
+
+def _listing(listing_id: str, price: int, quantity: int, hq: bool = False,
+             world_id: int = 1) -> dict:
+    return {'listingID': listing_id, 'pricePerUnit': price, 'quantity': quantity,
+            'hq': hq, 'tax': price * quantity // 20, 'worldID': world_id,
+            'worldName': WORLDS[world_id]}
+
+
+def _random_listings(seed: int, n: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [_listing(str(i), rng.randint(1, 30), rng.randint(1, 12),
+                     rng.random() < 0.4, rng.choice(list(WORLDS)))
+            for i in range(n)]
+
+
+def _brute_force(listings: list[dict], quantity: int) -> int | None:
+    """Return the cost of the cheapest subset with at least `quantity` units."""
+    best = None
+    for k in range(1, len(listings) + 1):
+        for subset in combinations(listings, k):
+            if sum(l['quantity'] for l in subset) >= quantity:
+                cost = sum(l['pricePerUnit'] * l['quantity'] for l in subset)
+                best = cost if best is None else min(best, cost)
+    return best
+
+
+@pytest.mark.unittest
+class TestPurchasePlanner:
+
+    def test_greedy_takes_cheapest(self):
+        listings = [_listing('a', 10, 5), _listing('b', 5, 5), _listing('c', 20, 5)]
+        plan = PurchasePlanner(listings).plan(8)
+        assert [l['listingID'] for l in plan.listings] == ['b', 'a']
+        assert plan.fulfilled
+        assert plan.quantity == 10
+        assert plan.cost == 75
+        assert plan.tax == sum(l['tax'] for l in listings[:2])
+        assert plan.total == plan.cost + plan.tax
+
+    def test_greedy_drops_unneeded(self):
+        # 'a' and 'b' are covered by 'c' once 'c' is taken
+        listings = [_listing('a', 1, 5), _listing('b', 2, 1), _listing('c', 3, 10)]
+        plan = PurchasePlanner(listings).plan(10)
+        assert [l['listingID'] for l in plan.listings] == ['c']
+        assert plan.quantity == 10
+
+    def test_exact_beats_greedy(self):
+        # greedy ends up with the 10 stack at 4 each; 'a' and 'b' together are cheaper
+        listings = [_listing('a', 1, 4), _listing('b', 5, 6), _listing('c', 4, 10)]
+        planner = PurchasePlanner(listings)
+        assert planner.plan(10).cost == 40
+        plan = planner.plan(10, exact=True)
+        assert [l['listingID'] for l in plan.listings] == ['a', 'b']
+        assert plan.cost == 34
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_exact_is_optimal(self, seed):
+        listings = _random_listings(seed, 10)
+        planner = PurchasePlanner(listings)
+        for quantity in (1, 7, 20, 40):
+            best = _brute_force(listings, quantity)
+            plan = planner.plan(quantity, exact=True)
+            greedy = planner.plan(quantity)
+            assert plan.fulfilled == greedy.fulfilled == (best is not None)
+            if best is not None:
+                assert plan.cost == best
+                assert plan.quantity >= quantity
+                assert greedy.cost >= best
+
+    def test_unfulfilled(self):
+        listings = [_listing('a', 1, 5), _listing('b', 2, 5)]
+        for exact in (False, True):
+            plan = PurchasePlanner(listings).plan(20, exact=exact)
+            assert not plan.fulfilled
+            assert plan.quantity == 10
+            assert len(plan.listings) == 2
+
+    def test_hq_and_worlds(self):
+        listings = _random_listings(0, 60)
+        planner = PurchasePlanner(listings)
+        for worlds in ([2], ['beta', 3], ['Alpha', 'Gamma', 99]):
+            world_ids = {w if isinstance(w, int) else
+                         next(i for i, n in WORLDS.items() if n.lower() == w.lower())
+                         for w in worlds if w != 99}
+            for hq in (None, True, False):
+                eligible = [l for l in listings if l['worldID'] in world_ids
+                            and (hq is None or l['hq'] == hq)]
+                plan = planner.plan(15, hq=hq, worlds=worlds, exact=True)
+                assert all(l in eligible for l in plan.listings)
+                expected = PurchasePlanner(eligible).plan(15, exact=True)
+                assert plan.cost == expected.cost
+                assert set(plan.by_world) <= {WORLDS[i] for i in world_ids}
+
+    def test_no_listings(self):
+        plan = PurchasePlanner([]).plan(1, worlds=['Alpha'])
+        assert not plan.fulfilled
+        assert plan.listings == []
+
+    def test_invalid_quantity(self):
+        with pytest.raises(UniversalisError):
+            PurchasePlanner([]).plan(0)
+
+    @pytest.mark.parametrize('typed', [False, True])
+    def test_from_item(self, mb_data_data, typed):
+        data = mb_data_data['dcName_crystal_42884']
+        item = MBDataResponseItem(data, typed=typed)
+        planner = PurchasePlanner(item)
+        assert planner.index is item.price_index
+        quantity = sum(l['quantity'] for l in data['listings']) // 2
+        plan = planner.plan(quantity, exact=True)
+        assert plan.fulfilled
+        assert plan.cost <= planner.plan(quantity).cost
+        world = data['listings'][0]['worldName']
+        plan = planner.plan(1, worlds=[world])
+        assert list(plan.by_world) == [world]
@@ -0,0 +1,83 @@
+import math
+
+import pytest
+
+from universalisapi.api_objects.aggregated import AggregatedResponse
+from universalisapi.api_objects.listing_store import HAS_NUMPY
+from universalisapi.client import UniversalisAPIClient
+from universalisapi.exceptions import UniversalisError
+
+
+@pytest.fixture(params=[
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY,
+                                                reason="NumPy is not installed"))
+], ids=['array', 'numpy'])
+def use_numpy(request) -> bool:
+    return request.param
+
+
+def _expected(result: dict, stat: str, hq: bool) -> float | None:
+    """Select a value the way ``current_average_item_price`` always has."""
+    hq_info = result['hq'][stat]
+    nq_info = result['nq'][stat]
+    info = hq_info if hq and hq_info else nq_info
+    if not info:
+        return None
+    best = UniversalisAPIClient.parse_region_data(info)
+    return best.get('price', best.get('quantity'))
+
+
+@pytest.mark.unittest
+class TestAggregatedResponse:
+
+    def test_data(self, aggregate_data_parametrized, use_numpy):
+        _, data = aggregate_data_parametrized
+        resp = AggregatedResponse(data, use_numpy=use_numpy)
+        assert resp.data == data
+        assert resp.failed_items == data['failedItems']
+        assert list(resp) == [result['itemId'] for result in data['results']]
+        for result in data['results']:
+            assert resp[result['itemId']].item_id == result['itemId']
+
+    @pytest.mark.parametrize('hq', [True, False])
+    def test_select(self, aggregate_data_parametrized, use_numpy, hq):
+        _, data = aggregate_data_parametrized
+        resp = AggregatedResponse(data, use_numpy=use_numpy)
+        for stat in ('minListing', 'recentPurchase', 'averageSalePrice',
+                     'dailySaleVelocity'):
+            expected = {result['itemId']: _expected(result, stat, hq)
+                        for result in data['results']}
+            assert resp.select(stat, hq=hq) == expected
+
+    def test_values(self, aggregate_data_parametrized, use_numpy):
+        _, data = aggregate_data_parametrized
+        resp = AggregatedResponse(data, use_numpy=use_numpy)
+        values = resp.values('minListing', hq=False)
+        assert values is resp.values('minListing', hq=False)
+        assert len(values) == len(data['results'])
+        for value, result in zip(values, data['results']):
+            assert math.isnan(value) == (not result['nq']['minListing'])
+        with pytest.raises(KeyError):
+            resp.values('foo', hq=False)
+
+    @pytest.mark.parametrize('hq', [True, False])
+    def test_average_sale_prices(self, aggregate_data_parametrized, use_numpy, hq):
+        _, data = aggregate_data_parametrized
+        resp = AggregatedResponse(data, use_numpy=use_numpy)
+        prices = resp.average_sale_prices(hq=hq)
+        for result in data['results']:
+            price = _expected(result, 'averageSalePrice', hq)
+            assert prices[result['itemId']] == (-1 if price is None else round(price))
+
+    def test_empty(self, use_numpy):
+        resp = AggregatedResponse({'results': [], 'failedItems': [1]},
+                                  use_numpy=use_numpy)
+        assert len(resp) == 0
+        assert resp.select('minListing') == {}
+        assert resp.failed_items == [1]
+
+    def test_numpy_missing(self, mocker):
+        mocker.patch('universalisapi.api_objects.aggregated.np', None)
+        with pytest.raises(UniversalisError):
+            AggregatedResponse({}, use_numpy=True)
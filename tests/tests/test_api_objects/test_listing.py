@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from universalisapi.api_objects.listing import UniversalisListing
+from universalisapi.api_objects.listing_store import HAS_NUMPY, ListingStore
+
+
+@pytest.fixture(params=[
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY,
+                                                reason="NumPy is not installed"))
+], ids=['array', 'numpy'])
+def listings_store(request, mb_data_data) -> tuple[list[dict], ListingStore]:
+    listings = mb_data_data['dcName_crystal_42884']['listings']
+    return listings, ListingStore(listings, use_numpy=request.param)
+
+
+@pytest.mark.unittest
+class TestUniversalisListing:
+
+    def test_accessors(self, listings_store):
+        listings, store = listings_store
+        for listing, view in zip(listings, store):
+            assert isinstance(view, UniversalisListing)
+            assert view.listing_id == listing['listingID']
+            assert view.price_per_unit == listing['pricePerUnit']
+            assert type(view.price_per_unit) is int
+            assert view.quantity == listing['quantity']
+            assert view.total == listing['total']
+            assert view.hq is listing['hq']
+            assert view.world_id == listing['worldID']
+            assert view.world_name == listing['worldName']
+            assert view.retainer_name == listing['retainerName']
+            assert view.last_review_timestamp == listing['lastReviewTime']
+            assert view.last_review_time == datetime.fromtimestamp(
+                listing['lastReviewTime'])
+
+    def test_api_keys(self, listings_store):
+        listings, store = listings_store
+        view = store[0]
+        for key, value in listings[0].items():
+            assert view[key] == value
+        assert view.get('notAKey', 1) == 1
+        assert view.to_dict() == listings[0]
+
+    def test_is_a_view(self, listings_store):
+        listings, store = listings_store
+        view = store[3]
+        assert view.store is store
+        assert view.row == 3
+        assert not hasattr(view, '__dict__')
+
+    def test_indexing(self, listings_store):
+        listings, store = listings_store
+        assert store[-1].to_dict() == listings[-1]
+        with pytest.raises(IndexError):
+            store[len(listings)]
+
+    def test_slicing(self, listings_store):
+        listings, store = listings_store
+        sliced = store[2:7]
+        assert isinstance(sliced, ListingStore)
+        assert [view.to_dict() for view in sliced] == listings[2:7]
+        assert list(sliced.row_ids) == list(range(2, 7))
+
+    def test_filtered_views(self, listings_store):
+        listings, store = listings_store
+        hq = [listing for listing in listings if listing['hq']]
+        assert [view.listing_id for view in store.hq_only()] == [
+            listing['listingID'] for listing in hq]
+
+    def test_missing_world(self):
+        store = ListingStore([{'listingID': 'a', 'pricePerUnit': 1}])
+        assert store[0].world_id is None
+        assert store[0].world_name is None
+
+    def test_equality(self, listings_store):
+        listings, store = listings_store
+        assert store[1] == store[1:2][0]
+        assert store[0] != store[1]
@@ -0,0 +1,117 @@
+import pytest
+
+from universalisapi.api_objects.listing_store import HAS_NUMPY, ListingStore, SaleStore
+from universalisapi.api_objects.records import MBItemRecord
+from universalisapi.exceptions import UniversalisError
+
+
+def _items(data: dict) -> list[dict]:
+    if 'items' in data:
+        return list(data['items'].values())
+    return [data]
+
+
+@pytest.fixture(params=[
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY,
+                                                reason="NumPy is not installed"))
+], ids=['array', 'numpy'])
+def use_numpy(request) -> bool:
+    return request.param
+
+
+@pytest.mark.unittest
+class TestListingStore:
+
+    def test_to_dicts(self, mb_data_data_parametrized, use_numpy):
+        _, data = mb_data_data_parametrized
+        for item in _items(data):
+            store = ListingStore(item['listings'], use_numpy=use_numpy)
+            assert len(store) == len(item['listings'])
+            assert store.to_dicts() == item['listings']
+
+    def test_row(self, mb_data_data, use_numpy):
+        listings = mb_data_data['dcName_crystal_42884']['listings']
+        store = ListingStore(listings, use_numpy=use_numpy)
+        for i, listing in enumerate(listings):
+            assert store.row(i) == listing
+
+    def test_filter(self, mb_data_data_parametrized, use_numpy):
+        _, data = mb_data_data_parametrized
+        for item in _items(data):
+            listings = item['listings']
+            if not listings:
+                continue
+            store = ListingStore(listings, use_numpy=use_numpy)
+            price = listings[len(listings) // 2]['pricePerUnit']
+            world = listings[0].get('worldID')
+            expected = [l for l in listings
+                        if l['pricePerUnit'] < price and l['hq']
+                        and (world is None or l['worldID'] == world)]
+            result = store.filter(max_price=price, hq=True, world=world)
+            assert result.to_dicts() == expected
+            assert [listings[i] for i in result.row_ids] == expected
+
+    def test_shortcuts(self, mb_data_data, use_numpy):
+        listings = mb_data_data['dcName_crystal_42884']['listings']
+        store = ListingStore(listings, use_numpy=use_numpy)
+        price = listings[-1]['pricePerUnit']
+        world = listings[0]['worldName']
+        assert store.cheaper_than(price).to_dicts() == [
+            l for l in listings if l['pricePerUnit'] < price]
+        assert store.hq_only().to_dicts() == [l for l in listings if l['hq']]
+        assert store.on_world(world).to_dicts() == [
+            l for l in listings if l['worldName'] == world]
+        assert store.on_world(world).values('worldID') == store.on_world(
+            listings[0]['worldID']).values('worldID')
+
+    def test_filter_chained(self, mb_data_data, use_numpy):
+        listings = mb_data_data['dcName_crystal_42884']['listings']
+        store = ListingStore(listings, use_numpy=use_numpy)
+        price = listings[-1]['pricePerUnit']
+        chained = store.hq_only().cheaper_than(price)
+        assert chained.to_dicts() == store.filter(max_price=price, hq=True).to_dicts()
+        assert [listings[i] for i in chained.row_ids] == chained.to_dicts()
+
+    def test_missing_column(self, use_numpy):
+        store = ListingStore([{'listingID': 'a', 'pricePerUnit': 5}],
+                             use_numpy=use_numpy)
+        assert 'worldID' not in store
+        assert len(store.on_world(1)) == 0
+        assert store.to_dicts() == [{'listingID': 'a', 'pricePerUnit': 5}]
+
+    def test_empty(self, use_numpy):
+        store = ListingStore([], use_numpy=use_numpy)
+        assert len(store) == 0
+        assert store.to_dicts() == []
+        assert len(store.cheaper_than(100)) == 0
+
+    def test_records(self, mb_data_data, use_numpy):
+        item = mb_data_data['dcName_crystal_42884']
+        record = MBItemRecord.from_dict(item)
+        store = ListingStore(record.listings, use_numpy=use_numpy)
+        assert store.values('pricePerUnit') == [l['pricePerUnit']
+                                                for l in item['listings']]
+        assert store.values('worldName') == [l['worldName'] for l in item['listings']]
+
+    def test_numpy_missing(self, mocker):
+        mocker.patch('universalisapi.api_objects.listing_store.HAS_NUMPY', False)
+        with pytest.raises(UniversalisError):
+            ListingStore([], use_numpy=True)
+
+
+@pytest.mark.unittest
+class TestSaleStore:
+
+    def test_to_dicts(self, mb_data_data_parametrized, use_numpy):
+        _, data = mb_data_data_parametrized
+        for item in _items(data):
+            store = SaleStore(item['recentHistory'], use_numpy=use_numpy)
+            assert store.to_dicts() == item['recentHistory']
+
+    def test_filter(self, mb_data_data, use_numpy):
+        sales = mb_data_data['dcName_crystal_42884']['recentHistory']
+        store = SaleStore(sales, use_numpy=use_numpy)
+        since = sales[len(sales) // 2]['timestamp']
+        assert store.filter(since=since, hq=False).to_dicts() == [
+            s for s in sales if s['timestamp'] >= since and not s['hq']]
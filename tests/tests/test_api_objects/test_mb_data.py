@@ -1,10 +1,13 @@
 from pathlib import Path
+from datetime import datetime
 import json
+import logging
 import random
 
 import pytest
 
 from universalisapi.api_objects.mb_data import MBDataResponse, MBDataResponseItem
+from universalisapi.api_objects.records import MBItemRecord
 from universalisapi.client import UniversalisAPIClient
 from universalisapi.exceptions import UniversalisError
 
@@ -56,6 +59,35 @@ class TestMBDataResponseItem:
             best_price = item_data['minPrice']
             assert best_price == item_obj.best_price
 
+    def test_lightweight(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        n_loggers = len(logging.Logger.manager.loggerDict)
+        item_obj = MBDataResponseItem(next(iter(data)))
+        assert len(logging.Logger.manager.loggerDict) == n_loggers
+        assert not hasattr(item_obj, '__dict__')
+        assert not hasattr(item_obj, 'session')
+
+    def test_lazy_fields(self):
+        item_obj = MBDataResponseItem({'itemID': 1, 'minPrice': 10})
+        assert item_obj.best_price == 10
+        assert item_obj.world_upload_times == {}
+        with pytest.raises(KeyError):
+            item_obj.listings
+
+    def test_world_upload_times(self):
+        item_obj = MBDataResponseItem({'itemID': 1, 'worldUploadTimes': {
+            '73': 1700000000000, '74': 1700000001000}})
+        assert item_obj.world_upload_times == {
+            73: datetime.fromtimestamp(1700000000),
+            74: datetime.fromtimestamp(1700000001)}
+
+    def test_derived_fields_cached(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        for item_obj in item_objs:
+            assert item_obj.last_upload_time is item_obj.last_upload_time
+            assert item_obj.histograms is item_obj.histograms
+            assert item_obj.world_upload_times is item_obj.world_upload_times
+
     def test_listing_ids_property(self, mb_data_data_items):
         data, item_objs = mb_data_data_items
         for item_data, item_obj in zip(data, item_objs):
@@ -96,6 +128,42 @@ class TestMBDataResponse:
             assert isinstance(item_obj, MBDataResponseItem)
             assert item.item_id == item_obj.item_id
 
+    def test_params_and_multi_item(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        assert resp.params == resp._params
+        assert resp.multi_item == ('items' in data)
+        with pytest.raises(TypeError):
+            resp.params['region'] = 'aether'
+
+    def test_lightweight(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        n_loggers = len(logging.Logger.manager.loggerDict)
+        resp = MBDataResponse(data, resp._params)
+        assert len(logging.Logger.manager.loggerDict) == n_loggers
+        assert not hasattr(resp, '__dict__')
+
+    def test_lazy_items(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        lazy_resp = MBDataResponse(data, resp._params, lazy=True)
+        assert lazy_resp.items._built == {}
+        assert list(lazy_resp.items) == list(resp.items)
+        assert len(lazy_resp.items) == len(resp.items)
+        item_id = next(iter(resp.items))
+        assert item_id in lazy_resp.items
+        assert lazy_resp.items[item_id].data is resp.items[item_id].data
+        assert list(lazy_resp.items._built) == [item_id]
+        assert lazy_resp.items[item_id] is lazy_resp.items[item_id]
+        assert lazy_resp.items.get(-1) is None
+
+    def test_lazy_response(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        lazy_resp = MBDataResponse(data, resp._params, lazy=True)
+        assert lazy_resp.best_prices == resp.best_prices
+        assert lazy_resp.listing_ids == resp.listing_ids
+        assert lazy_resp.data is data
+        typed_resp = MBDataResponse(data, resp._params, lazy=True, typed=True)
+        assert typed_resp.data == data
+
     def test_items_property_set(self):
         with pytest.raises(UniversalisError):
             obj = MBDataResponse({}, {})
@@ -128,6 +196,22 @@ class TestMBDataResponse:
 
         assert resp.listing_ids == listing_ids
 
+    @pytest.mark.asyncio
+    async def test_get_price_changes_without_client(self, mb_data_data,
+                                                    mocked_mb_current_data):
+        data = mb_data_data['dcName_crystal_42884']
+        params = {'item_ids': [42884], 'region': 'crystal', 'listings': None,
+                  'entries': None, 'hq': None, 'stats_within': None,
+                  'entries_within': None, 'fields': None}
+        resp = MBDataResponse(data, params)
+        new_data = data | {'lastUploadTime': data['lastUploadTime'] + 1,
+                           'minPrice': data['minPrice'] - 1}
+        mocked_mb_current_data('crystal', '42884', {}, new_data)
+        price_changes = await resp.get_price_changes()
+        assert price_changes[42884]['old_price'] == data['minPrice']
+        assert price_changes[42884]['new_price'] == data['minPrice'] - 1
+        assert resp.data == new_data
+
     @pytest.mark.asyncio
     @pytest.mark.skip
     async def test_get_price_changes(self,
@@ -146,3 +230,191 @@ class TestMBDataResponse:
         price_changes = await old_resp_obj.get_price_changes()
 
         assert new_resp_obj.data == old_resp_obj.data
+
+
+@pytest.mark.unittest
+class TestTypedMode:
+
+    @pytest.fixture
+    def typed_items(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        return data, item_objs, [MBDataResponseItem(item_data, typed=True)
+                                 for item_data in data]
+
+    def test_matches_untyped(self, typed_items):
+        _, item_objs, typed_objs = typed_items
+        for item_obj, typed_obj in zip(item_objs, typed_objs):
+            assert typed_obj.record is not None
+            assert typed_obj.item_id == item_obj.item_id
+            assert typed_obj.prices == item_obj.prices
+            assert typed_obj.best_price == item_obj.best_price
+            assert typed_obj.listing_ids == item_obj.listing_ids
+            assert typed_obj.histograms == item_obj.histograms
+            assert typed_obj.region_info == item_obj.region_info
+            assert typed_obj.world_upload_times == item_obj.world_upload_times
+
+    def test_raw_data_dropped(self, typed_items):
+        data, _, typed_objs = typed_items
+        for item_data, typed_obj in zip(data, typed_objs):
+            assert typed_obj._data is None
+            assert typed_obj.data == item_data
+
+    def test_keep_raw(self, mb_data_data_items):
+        data, _ = mb_data_data_items
+        for item_data in data:
+            typed_obj = MBDataResponseItem(item_data, typed=True, keep_raw=True)
+            assert typed_obj.data is item_data
+
+    def test_prices_cached(self, typed_items):
+        _, _, typed_objs = typed_items
+        for typed_obj in typed_objs:
+            assert typed_obj.prices is typed_obj.prices
+
+    def test_get_better_listings(self, typed_items):
+        data, _, typed_objs = typed_items
+        for item_data, typed_obj in zip(data, typed_objs):
+            price = item_data['minPrice'] + 1
+            expected = [l['listingID'] for l in item_data['listings']
+                        if l['pricePerUnit'] < price]
+            better = typed_obj.get_better_listings(price)
+            assert [l.listing_id for l in better] == expected
+
+    def test_from_record(self, mb_data_data_items):
+        data, _ = mb_data_data_items
+        for item_data in data:
+            record = MBItemRecord.from_dict(item_data)
+            assert MBDataResponseItem(record).record is record
+
+    def test_response(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        typed_resp = MBDataResponse(data, resp._params, typed=True)
+        assert typed_resp._data is None
+        assert typed_resp.data == data
+        assert typed_resp.best_prices == resp.best_prices
+        assert typed_resp.listing_ids == resp.listing_ids
+        assert typed_resp.unresolved_items == resp.unresolved_items
+
+    def test_response_keep_raw(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        typed_resp = MBDataResponse(data, resp._params, typed=True, keep_raw=True)
+        assert typed_resp.data is data
+
+
+@pytest.mark.unittest
+class TestColumnStores:
+
+    def test_listing_store(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        for item_data, item_obj in zip(data, item_objs):
+            assert item_obj.listing_store is item_obj.listing_store
+            assert item_obj.listing_store.to_dicts() == item_data['listings']
+
+    def test_sale_store(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        for item_data, item_obj in zip(data, item_objs):
+            assert item_obj.sale_store.to_dicts() == item_data['recentHistory']
+
+    def test_better_listings_are_originals(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        for item_data, item_obj in zip(data, item_objs):
+            price = item_data['minPrice'] + 1
+            better = item_obj.get_better_listings(price)
+            expected = [l for l in item_data['listings'] if l['pricePerUnit'] < price]
+            assert sorted(map(id, better)) == sorted(map(id, expected))
+
+
+def _reuploaded(item: dict, **changes) -> dict:
+    return item | {'lastUploadTime': item['lastUploadTime'] + 1000} | changes
+
+
+@pytest.mark.unittest
+class TestUpdate:
+
+    @pytest.fixture(params=[{}, {'lazy': True}, {'typed': True},
+                            {'typed': True, 'keep_raw': True}],
+                    ids=['default', 'lazy', 'typed', 'typed_keep_raw'])
+    def resp_kwargs(self, request) -> dict:
+        return request.param
+
+    @pytest.fixture
+    def multi_data(self, mb_data_data) -> dict:
+        template = mb_data_data['dcName_crystal_42884']
+        items = {str(i): template | {'itemID': i} for i in (1, 2, 3)}
+        return {'itemIDs': [1, 2, 3], 'items': items, 'dcName': 'Crystal',
+                'unresolvedItems': []}
+
+    def test_unchanged_items_skipped(self, multi_data, resp_kwargs):
+        resp = MBDataResponse(multi_data, {}, **resp_kwargs)
+        item = resp.items[1]
+        assert resp.update(multi_data) == {}
+        assert resp.items[1] is item
+
+    def test_listing_diff(self, multi_data, resp_kwargs):
+        resp = MBDataResponse(multi_data, {}, **resp_kwargs)
+        old_item = multi_data['items']['2']
+        listings = [dict(listing) for listing in old_item['listings']]
+        removed = listings.pop(0)
+        listings[0]['pricePerUnit'] -= 10
+        added = listings[1] | {'listingID': 'new-listing', 'pricePerUnit': 1}
+        listings.append(added)
+        new_item = _reuploaded(old_item, listings=listings, minPrice=1)
+        new_data = multi_data | {'items': multi_data['items'] | {'2': new_item}}
+
+        changes = resp.update(new_data)
+
+        assert set(changes) == {2}
+        change = changes[2]
+        assert change['old_price'] == old_item['minPrice']
+        assert change['new_price'] == 1
+        assert [l['listingID'] for l in change['removed']] == [removed['listingID']]
+        assert [l['listingID'] for l in change['added']] == ['new-listing']
+        assert [(old['listingID'], new['pricePerUnit'])
+                for old, new in change['repriced']] == [
+                    (listings[0]['listingID'], listings[0]['pricePerUnit'])]
+        assert 'new-listing' in [l['listingID'] for l in change['listings']]
+
+    def test_in_place(self, multi_data, resp_kwargs):
+        resp = MBDataResponse(multi_data, {}, **resp_kwargs)
+        untouched = resp.items[1]
+        new_item = _reuploaded(multi_data['items']['3'], minPrice=5)
+        new_data = multi_data | {'items': multi_data['items'] | {'3': new_item}}
+        resp.update(new_data)
+        assert resp.items[1] is untouched
+        assert resp.items[3].best_price == 5
+        assert resp.best_prices[3] == 5
+        assert resp.data['items']['3'] == new_item
+        # the dict the response was created from is left alone
+        assert multi_data['items']['3'] is not new_item
+
+    def test_reordered_and_missing_items(self, multi_data, resp_kwargs):
+        resp = MBDataResponse(multi_data, {}, **resp_kwargs)
+        items = multi_data['items']
+        new_items = {'3': _reuploaded(items['3'], minPrice=3),
+                     '1': _reuploaded(items['1'], minPrice=1)}
+        new_data = {'itemIDs': [1, 2, 3], 'items': new_items, 'dcName': 'Crystal',
+                    'unresolvedItems': [2]}
+        changes = resp.update(new_data)
+        assert set(changes) == {1, 3}
+        assert changes[1]['new_price'] == 1
+        assert changes[3]['new_price'] == 3
+        assert resp.items[2].best_price == items['2']['minPrice']
+        assert resp.unresolved_items == [2]
+
+    def test_new_item(self, multi_data, resp_kwargs):
+        resp = MBDataResponse(multi_data, {}, **resp_kwargs)
+        new_item = multi_data['items']['1'] | {'itemID': 4}
+        new_data = multi_data | {'items': multi_data['items'] | {'4': new_item}}
+        changes = resp.update(new_data)
+        assert set(changes) == {4}
+        assert changes[4]['old_price'] is None
+        assert len(changes[4]['added']) == len(new_item['listings'])
+        assert 4 in resp.items
+
+    def test_price_index(self, mb_data_data_items):
+        data, item_objs = mb_data_data_items
+        for item_data, item_obj in zip(data, item_objs):
+            assert item_obj.price_index is item_obj.price_index
+            assert len(item_obj.price_index) == len(item_data['listings'])
+            if item_data['listings']:
+                assert item_obj.price_index.best_price == min(
+                    l['pricePerUnit'] for l in item_data['listings'])
@@ -0,0 +1,170 @@
+import random
+from collections import Counter
+from itertools import groupby
+
+import pytest
+
+from universalisapi.api_objects.mb_data import MBDataResponse
+from universalisapi.api_objects.order_book import OrderBook, OrderBooks
+from universalisapi.exceptions import UniversalisError
+from universalisapi.websocket import MarketEvent
+
+
+def _listing(listing_id: str, price: int, quantity: int = 1, hq: bool = False) -> dict:
+    return {'listingID': listing_id, 'pricePerUnit': price, 'quantity': quantity,
+            'hq': hq}
+
+
+def _expected_levels(listings, hq=None) -> list[tuple[int, int]]:
+    units = Counter()
+    for listing in listings:
+        if hq is None or listing['hq'] == hq:
+            units[listing['pricePerUnit']] += listing['quantity']
+    return sorted(units.items())
+
+
+def _check(book: OrderBook, listings: list[dict]) -> None:
+    assert len(book) == len(listings)
+    assert book.units == sum(l['quantity'] for l in listings)
+    for hq in (None, True, False):
+        levels = _expected_levels(listings, hq)
+        assert book.top(len(levels) + 1, hq=hq) == levels
+        assert book.top(3, hq=hq) == levels[:3]
+        assert book.best_price(hq) == (levels[0][0] if levels else None)
+        for price, units in levels[:5]:
+            assert book.depth_at(price, hq) == units
+
+
+@pytest.fixture
+def listings() -> list[dict]:
+    rng = random.Random(0)
+    return [_listing(str(i + 1), rng.randint(1, 50), rng.randint(1, 99),
+                     rng.random() < 0.3)
+            for i in range(200)]
+
+
+@pytest.mark.unittest
+class TestOrderBook:
+
+    def test_seed(self, listings):
+        book = OrderBook(1, 73, listings)
+        _check(book, listings)
+        assert '1' in book and 1 in book and 'x' not in book and None not in book
+        assert book.depth_at(1000) == 0
+
+    def test_empty(self):
+        book = OrderBook(1, 73)
+        assert not book
+        assert book.best_price() is None
+        assert book.top(5) == []
+
+    def test_deltas(self, listings):
+        rng = random.Random(1)
+        book = OrderBook(1, 73, listings[:100])
+        current = {l['listingID']: l for l in listings[:100]}
+        pending = listings[100:]
+        for _ in range(500):
+            action = rng.random()
+            if action < 0.4 and pending:
+                listing = pending.pop()
+                book.add(listing)
+                current[listing['listingID']] = listing
+            elif action < 0.7 and current:
+                listing_id = rng.choice(list(current))
+                assert book.remove(listing_id)
+                del current[listing_id]
+            elif current:
+                listing_id = rng.choice(list(current))
+                price = rng.randint(1, 60)
+                assert book.reprice(listing_id, price)
+                current[listing_id] = current[listing_id] | {'pricePerUnit': price}
+            _check(book, list(current.values()))
+        assert not book.remove('missing')
+        assert not book.reprice('missing', 1)
+
+    def test_add_replaces(self):
+        book = OrderBook(1, 73, [_listing('1', 10, 5)])
+        book.add(_listing('1', 20, 3, hq=True))
+        assert len(book) == 1
+        assert book.top(5) == [(20, 3)]
+        assert book.top(5, hq=False) == []
+
+    @pytest.mark.parametrize("listing_id", ['007', 'abc123', 12])
+    def test_listing_ids(self, listing_id):
+        book = OrderBook(1, 73, [_listing(listing_id, 10)])
+        assert listing_id in book
+        assert '7' not in book
+        assert book.remove(listing_id)
+
+    @pytest.mark.parametrize("listing", [_listing('1', 10, -1),
+                                         _listing('1', 10, 2 ** 20),
+                                         _listing('1', -10)])
+    def test_invalid(self, listing):
+        with pytest.raises(UniversalisError):
+            OrderBook(1, 73, [listing])
+
+
+@pytest.mark.unittest
+class TestOrderBooks:
+
+    def test_from_response(self, mb_data_data_objs):
+        data, resp = mb_data_data_objs
+        books = OrderBooks.from_response(resp)
+        for item in resp.items.values():
+            key = lambda l: l.get('worldID') or item.world_id
+            for world_id, group in groupby(sorted(item.listings, key=key), key=key):
+                group = list(group)
+                book = books[item.item_id, world_id]
+                assert len(book) == len({l['listingID'] for l in group})
+                assert book.best_price() == min(l['pricePerUnit'] for l in group)
+        assert sum(map(len, books.values())) == sum(
+            len({l['listingID'] for l in item.listings})
+            for item in resp.items.values())
+
+    def test_no_world(self):
+        resp = MBDataResponse({'itemID': 1, 'listings': [_listing('1', 10)]}, {})
+        with pytest.raises(UniversalisError):
+            OrderBooks.from_response(resp)
+
+    def test_seed_replaces_worlds(self, mb_data_data):
+        resp = MBDataResponse(mb_data_data['dcName_crystal_42884'], {})
+        books = OrderBooks.from_response(resp)
+        world_id = resp.items[42884].listings[0]['worldID']
+        books.add(42884, world_id, _listing('stale', 10))
+        books.add(42884, 9999, _listing('1', 10))
+        books.add(1, 73, _listing('2', 10))
+        books.seed(resp.items[42884])
+        assert 'stale' not in books[42884, world_id]
+        # worlds the response doesn't cover are kept
+        assert (42884, 9999) in books
+        assert (1, 73) in books
+
+    def test_seed_worlds_in_turn(self):
+        books = OrderBooks()
+        for world_id in (73, 74):
+            books.seed(MBDataResponse({'itemID': 5057, 'worldID': world_id,
+                                       'listings': [_listing('1', world_id)]}, {}))
+        assert set(books) == {(5057, 73), (5057, 74)}
+        assert books[5057, 73].best_price() == 73
+        # a world with no listings left is dropped, and only that world
+        books.seed(MBDataResponse({'itemID': 5057, 'worldID': 73, 'listings': []},
+                                  {}))
+        assert set(books) == {(5057, 74)}
+        books.seed(MBDataResponse({'itemID': 5057, 'worldUploadTimes': {'74': 0},
+                                   'listings': []}, {}))
+        assert not books
+
+    def test_apply(self):
+        books = OrderBooks()
+        books.apply(MarketEvent('listings/add', 1, 73,
+                                listings=(_listing('1', 10), _listing('2', 5))))
+        books.apply(MarketEvent('sales/add', 1, 73, sales=({'pricePerUnit': 5},)))
+        assert books[1, 73].top(5) == [(5, 1), (10, 1)]
+        books.apply(MarketEvent('listings/add', 1, 73, listings=(_listing('1', 4),)))
+        assert books[1, 73].top(5) == [(4, 1), (5, 1)]
+        books.apply(MarketEvent('listings/remove', 1, 73,
+                                listings=(_listing('1', 4), _listing('2', 5))))
+        # empty books are dropped
+        assert (1, 73) not in books
+        assert not books.remove(1, 73, '1')
+        assert not books.reprice(1, 73, '1', 5)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from universalisapi.api_objects.price_index import PriceIndex
+from universalisapi.api_objects.records import ListingRecord
+
+
+def _listing(listing_id: str, price: int, quantity: int = 1, hq: bool = False) -> dict:
+    return {'listingID': listing_id, 'pricePerUnit': price, 'quantity': quantity,
+            'hq': hq}
+
+
+@pytest.fixture
+def listings() -> list[dict]:
+    rng = random.Random(0)
+    return [_listing(str(i), rng.randint(1, 50), rng.randint(1, 99),
+                     rng.random() < 0.3)
+            for i in range(200)]
+
+
+@pytest.mark.unittest
+class TestPriceIndex:
+
+    def test_sorted(self, listings):
+        index = PriceIndex(listings)
+        prices = [listing['pricePerUnit'] for listing in index]
+        assert prices == sorted(prices)
+        assert len(index) == len(listings)
+        assert index.best_price == min(l['pricePerUnit'] for l in listings)
+
+    @pytest.mark.parametrize('price', [0, 1, 10, 25, 50, 51])
+    def test_thresholds(self, listings, price):
+        index = PriceIndex(listings)
+        below = [l for l in listings if l['pricePerUnit'] < price]
+        at_most = [l for l in listings if l['pricePerUnit'] <= price]
+        assert sorted(map(id, index.better_than(price))) == sorted(map(id, below))
+        assert sorted(map(id, index.at_most(price))) == sorted(map(id, at_most))
+        assert index.quantity_below(price) == sum(l['quantity'] for l in below)
+        assert index.quantity_at_most(price) == sum(l['quantity'] for l in at_most)
+
+    def test_cheapest(self, listings):
+        index = PriceIndex(listings)
+        cheapest = index.cheapest(10)
+        assert [l['pricePerUnit'] for l in cheapest] == sorted(
+            l['pricePerUnit'] for l in listings)[:10]
+
+    def test_hq_nq(self, listings):
+        index = PriceIndex(listings)
+        assert all(l['hq'] for l in index.hq)
+        assert not any(l['hq'] for l in index.nq)
+        assert len(index.hq) + len(index.nq) == len(index)
+        assert index.hq.quantity_below(30) == sum(
+            l['quantity'] for l in listings if l['hq'] and l['pricePerUnit'] < 30)
+        assert len(index.hq.nq) == 0
+
+    def test_add_remove(self, listings):
+        index = PriceIndex(listings[:100])
+        hq = index.hq
+        assert index.quantity_below(100)
+        for listing in listings[100:]:
+            index.add(listing)
+        for listing in listings[:50]:
+            assert index.remove(listing['listingID'])
+        expected = PriceIndex(listings[50:])
+        assert [l['pricePerUnit'] for l in index] == [
+            l['pricePerUnit'] for l in expected]
+        assert index.quantity_below(25) == expected.quantity_below(25)
+        assert hq.quantity_below(25) == expected.hq.quantity_below(25)
+        assert '0' not in index
+        assert not index.remove('0')
+
+    def test_add_replaces(self):
+        index = PriceIndex([_listing('a', 10, hq=True), _listing('b', 20)])
+        index.hq
+        index.add(_listing('a', 30, quantity=5))
+        assert [l['listingID'] for l in index] == ['b', 'a']
+        assert len(index.hq) == 0
+        assert index.nq.quantity_at_most(30) == 6
+
+    def test_add_after_sub_index(self, listings):
+        index = PriceIndex(listings[:100])
+        hq, hq_nq, nq_hq = index.hq, index.hq.nq, index.nq.hq
+        for listing in listings[100:]:
+            index.add(listing)
+        assert len(hq_nq) == len(nq_hq) == 0
+        assert all(l['hq'] for l in hq)
+        assert len(hq) == len(PriceIndex(listings, hq=True))
+        hq_nq.add(_listing('x', 1, hq=True))
+        assert len(hq_nq) == 0
+
+    def test_records(self, mb_data_data):
+        item = mb_data_data['dcName_crystal_42884']
+        records = [ListingRecord.from_dict(l) for l in item['listings']]
+        index = PriceIndex(records)
+        assert index.best_price == item['minPrice']
+
+    def test_empty(self):
+        index = PriceIndex()
+        assert index.best_price is None
+        assert index.better_than(100) == []
+        assert index.quantity_below(100) == 0
@@ -0,0 +1,123 @@
+import dataclasses
+
+import pytest
+
+from universalisapi.api_objects.records import (AggregatedItemRecord, ListingRecord,
+                                                MBItemRecord, SaleRecord)
+
+
+def _items(data: dict) -> list[dict]:
+    if 'items' in data:
+        return list(data['items'].values())
+    return [data]
+
+
+@pytest.mark.unittest
+class TestMBItemRecord:
+
+    def test_round_trip(self, mb_data_data_parametrized):
+        _, data = mb_data_data_parametrized
+        for item_data in _items(data):
+            assert MBItemRecord.from_dict(item_data).to_dict() == item_data
+
+    def test_fields(self, mb_data_data_parametrized):
+        _, data = mb_data_data_parametrized
+        for item_data in _items(data):
+            record = MBItemRecord.from_dict(item_data)
+            assert record.item_id == item_data['itemID']
+            assert record.min_price == item_data['minPrice']
+            assert record.units_for_sale == item_data['unitsForSale']
+            assert len(record.listings) == len(item_data['listings'])
+            assert all(isinstance(listing, ListingRecord)
+                       for listing in record.listings)
+            assert all(isinstance(sale, SaleRecord)
+                       for sale in record.recent_history)
+
+    def test_api_keys(self, mb_data_data_parametrized):
+        _, data = mb_data_data_parametrized
+        for item_data in _items(data):
+            record = MBItemRecord.from_dict(item_data)
+            for key, value in item_data.items():
+                if key in ('listings', 'recentHistory'):
+                    continue
+                assert record[key] == value
+                assert record.get(key) == value
+            for listing, listing_data in zip(record.listings, item_data['listings']):
+                assert listing['pricePerUnit'] == listing_data['pricePerUnit']
+                assert listing['listingID'] == listing_data['listingID']
+
+    def test_unknown_key(self):
+        record = MBItemRecord.from_dict({'itemID': 1})
+        with pytest.raises(KeyError):
+            record['notAKey']
+        assert record.get('notAKey', 0) == 0
+        assert 'itemID' in record
+        assert 'notAKey' not in record
+
+    def test_missing_fields(self):
+        record = MBItemRecord.from_dict({'itemID': 1, 'minPrice': 10})
+        assert record.min_price == 10
+        assert record.listings == ()
+        assert record.dc_name is None
+        assert 'dcName' not in record.to_dict()
+
+    def test_narrowed_fields(self):
+        # e.g. a response requested with ``fields=``
+        data = {'itemID': 1, 'minPrice': 10,
+                'listings': [{'pricePerUnit': 10, 'sellerID': None}]}
+        record = MBItemRecord.from_dict(data)
+        assert record.to_dict() == data
+        assert 'unitsSold' not in record
+        assert record.get('unitsSold', 0) == 0
+        assert record.units_sold is None
+        assert 'sellerID' in record.listings[0]
+        assert 'listingID' not in record.listings[0]
+
+    def test_slotted(self):
+        record = MBItemRecord.from_dict({'itemID': 1})
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.item_id = 2
+
+
+@pytest.mark.unittest
+class TestListingRecord:
+
+    def test_materia(self):
+        listing = ListingRecord.from_dict(
+            {'listingID': '1', 'materia': [{'slotID': 0, 'materiaID': 5}]})
+        assert listing.materia == ((0, 5),)
+        assert listing.to_dict()['materia'] == [{'slotID': 0, 'materiaID': 5}]
+
+    def test_keeps_null_values(self):
+        listing = ListingRecord.from_dict({'listingID': '1', 'creatorID': None})
+        data = listing.to_dict()
+        assert data['creatorID'] is None
+        assert 'worldName' not in data
+
+
+@pytest.mark.unittest
+class TestAggregatedItemRecord:
+
+    def test_round_trip(self, aggregate_data_parametrized):
+        _, data = aggregate_data_parametrized
+        for result in data['results']:
+            assert AggregatedItemRecord.from_dict(result).to_dict() == result
+
+    def test_fields(self, aggregate_data_parametrized):
+        _, data = aggregate_data_parametrized
+        for result in data['results']:
+            record = AggregatedItemRecord.from_dict(result)
+            assert record.item_id == result['itemId']
+            min_listing = result['nq']['minListing']
+            if 'dc' in min_listing:
+                assert record.nq.min_listing.dc.price == min_listing['dc']['price']
+                assert record.nq.min_listing['dc']['worldId'] == \
+                    min_listing['dc']['worldId']
+            if not min_listing:
+                assert record.nq.min_listing.best is None
+            velocity = result['hq']['dailySaleVelocity']
+            if velocity:
+                best = record.hq.daily_sale_velocity.best
+                assert best.value == best.quantity
+                assert best.price is None
@@ -0,0 +1,149 @@
+import pytest
+
+from universalisapi.api_objects.mb_data import MBDataResponse, MBDataResponseItem
+from universalisapi.api_objects.snapshot import MBDataSnapshot, write_snapshot
+from universalisapi.exceptions import UniversalisError
+
+
+def _item(item_id: int, listings: list[dict] | None = None, **fields) -> dict:
+    item = {'itemID': item_id, 'lastUploadTime': 1700000000000 + item_id}
+    if listings is not None:
+        item['listings'] = listings
+    return item | fields
+
+
+@pytest.mark.unittest
+class TestMBDataSnapshot:
+
+    def test_round_trip(self, mb_data_data_parametrized, tmp_path):
+        _, data = mb_data_data_parametrized
+        path = tmp_path / 'data.snap'
+        size = write_snapshot(path, data, {'region': 'crystal'})
+        assert size == path.stat().st_size
+        with MBDataSnapshot(path) as snapshot:
+            assert snapshot.data == data
+            assert snapshot.params == {'region': 'crystal'}
+            assert snapshot.multi_item == ('items' in data)
+
+    def test_lazy_reads(self, mb_data_data, tmp_path):
+        data = mb_data_data['dcName_crystal_42884']
+        path = tmp_path / 'data.snap'
+        write_snapshot(path, data)
+        with MBDataSnapshot(path) as snapshot:
+            assert len(snapshot) == len(snapshot.items) == 1
+            assert list(snapshot.items) == [42884]
+            assert snapshot.listings(42884) == data['listings']
+            assert snapshot.sales(42884) == data['recentHistory']
+            prices = snapshot.column('listings', 'pricePerUnit')
+            assert prices.format == 'q'
+            assert prices.tolist() == [l['pricePerUnit'] for l in data['listings']]
+            worlds = snapshot.column('listings', 'worldName')
+            assert ([snapshot.string(i) for i in worlds]
+                    == [l['worldName'] for l in data['listings']])
+            assert snapshot.row('listings', 0) == data['listings'][0]
+            with pytest.raises(IndexError):
+                snapshot.row('listings', len(data['listings']))
+            with pytest.raises(KeyError):
+                snapshot.column('listings', 'nope')
+
+    def test_irregular_values(self, tmp_path):
+        data = {'items': {
+            '1': _item(1, [{'pricePerUnit': 10, 'hq': True, 'tax': 1.5},
+                           {'pricePerUnit': None, 'hq': 'yes', 'tax': 2},
+                           {'hq': False, 'materia': [{'slotID': 0}], 'name': 'ü'}]),
+            '2': _item(2, [], stackSize=2 ** 70, tags={'a': [1, None]}),
+            '3': _item(3)},
+            'itemIDs': [1, 2, 3], 'unresolvedItems': [], 'worldName': None}
+        path = tmp_path / 'data.snap'
+        write_snapshot(path, data)
+        with MBDataSnapshot(path) as snapshot:
+            assert snapshot.data == data
+            assert snapshot.item(3) == data['items']['3']
+            assert 'listings' not in snapshot.item(3)
+
+    @pytest.mark.parametrize('data', [{}, {'items': {}}])
+    def test_empty(self, data, tmp_path):
+        path = tmp_path / 'data.snap'
+        write_snapshot(path, data)
+        with MBDataSnapshot(path) as snapshot:
+            assert snapshot.data == data
+            assert not snapshot.items
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / 'data.json'
+        path.write_bytes(b'{"itemID": 1}')
+        with pytest.raises(UniversalisError):
+            MBDataSnapshot(path)
+        write_snapshot(path, _item(1))
+        path.write_bytes(path.read_bytes()[:-8])
+        with pytest.raises(UniversalisError):
+            MBDataSnapshot(path)
+
+
+@pytest.mark.unittest
+class TestMBDataResponseSnapshot:
+
+    @pytest.mark.parametrize('lazy', [True, False])
+    @pytest.mark.parametrize('typed', [True, False])
+    def test_save_load(self, mb_data_data_objs, tmp_path, lazy, typed):
+        data, response = mb_data_data_objs
+        path = tmp_path / 'data.snap'
+        response.save(path)
+        loaded = MBDataResponse.load(path, typed=typed, lazy=lazy)
+        assert loaded.data == data
+        assert loaded._params == response._params
+        assert loaded.unresolved_items == response.unresolved_items
+        assert loaded.best_prices == response.best_prices
+        assert loaded.listing_ids == response.listing_ids
+
+    def test_lazy_update(self, tmp_path):
+        listings = [{'listingID': str(i), 'pricePerUnit': 100 + i, 'quantity': 1,
+                     'hq': False} for i in range(3)]
+        old_data = {'items': {'1': _item(1, listings, minPrice=100),
+                              '2': _item(2, listings, minPrice=100)}}
+        path = tmp_path / 'data.snap'
+        MBDataResponse(old_data, {'item_ids': [1, 2]}).save(path)
+        new_item = _item(1, listings[1:], minPrice=101,
+                         lastUploadTime=1800000000000)
+        new_data = {'items': {'1': new_item, '2': old_data['items']['2']}}
+        loaded = MBDataResponse.load(path)
+        changes = loaded.update(new_data)
+        assert list(changes) == [1]
+        assert changes[1]['removed'] == [listings[0]]
+        assert loaded.data == new_data
+        # the file is left as it was
+        assert MBDataResponse.load(path).data == old_data
+
+    def test_close(self, tmp_path):
+        path = tmp_path / 'data.snap'
+        write_snapshot(path, {'items': {'1': _item(1), '2': _item(2)}})
+        with MBDataResponse.load(path) as loaded:
+            item = loaded.items[1]
+        assert loaded._snapshot.closed
+        # items looked up before closing stay usable
+        assert loaded.items[1] is item
+        assert item.item_id == 1
+        with pytest.raises(UniversalisError):
+            loaded.items[2]
+        # eagerly loaded responses have nothing to close
+        with MBDataResponse.load(path, lazy=False) as loaded:
+            pass
+        assert loaded.items[2].item_id == 2
+
+    def test_item_save_load(self, mb_data_data_items, tmp_path):
+        item_data, items = mb_data_data_items
+        for data, item in zip(item_data, items):
+            path = tmp_path / f'{item.item_id}.snap'
+            item.save(path)
+            assert MBDataResponseItem.load(path).data == data
+            loaded = MBDataResponseItem.load(path, item.item_id, typed=True)
+            assert loaded.best_price == item.best_price
+
+    def test_item_load_errors(self, tmp_path):
+        path = tmp_path / 'data.snap'
+        write_snapshot(path, {'items': {'1': _item(1), '2': _item(2)}})
+        assert MBDataResponseItem.load(path, 2).item_id == 2
+        with pytest.raises(UniversalisError):
+            MBDataResponseItem.load(path)
+        with pytest.raises(UniversalisError):
+            MBDataResponseItem.load(path, 3)
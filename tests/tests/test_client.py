@@ -1,14 +1,17 @@
+import asyncio
 import random
 
 import pytest
 
+from universalisapi.api_objects.aggregated import AggregatedResponse
+from universalisapi.api_objects.mb_data import MBDataResponse
 from universalisapi.client import UniversalisAPIClient
 from universalisapi.exceptions import UniversalisError
 
 
 @pytest.mark.unittest
 class TestUniversalisAPIClient:
-    client = UniversalisAPIClient()
+    client = UniversalisAPIClient(requests_per_second=None)
 
     @pytest.mark.asyncio
     async def test_data_centers(self, mocked_data_centers, data_centers):
@@ -49,6 +52,32 @@ class TestUniversalisAPIClient:
         resp_data = await self.client.current_item_price_data(region, item_ids)
         assert resp_data == data
 
+    @pytest.mark.asyncio
+    async def test_current_item_price_data_chunked(self, mocked_aggregated,
+                                                   aggregate_data):
+        template = next(iter(aggregate_data.values()))['results'][0]
+        item_ids = list(range(1, 151))
+        region = 'crystal'
+        for chunk in (item_ids[:75], item_ids[75:]):
+            data = {'results': [template | {'itemId': i} for i in chunk[:-1]],
+                    'failedItems': chunk[-1:]}
+            mocked_aggregated(','.join(map(str, chunk)), region, data)
+        resp_data = await self.client.current_item_price_data(region, item_ids)
+        assert [result['itemId'] for result in resp_data['results']] == \
+            [i for i in item_ids if i not in (75, 150)]
+        assert resp_data['failedItems'] == [75, 150]
+
+    @pytest.mark.asyncio
+    async def test_aggregated_price_data(self, mocked_aggregated,
+                                         aggregate_data_parametrized):
+        stem, data = aggregate_data_parametrized
+        region, item_ids = stem.split('_')
+        mocked_aggregated(item_ids, region, data)
+        item_ids = list(map(int, item_ids.split(',')))
+        resp = await self.client.aggregated_price_data(region, item_ids)
+        assert isinstance(resp, AggregatedResponse)
+        assert resp.data == data
+
     @pytest.mark.parametrize("test,expected",
                              [({'world': 1, 'dc': 2, 'region': 3}, 1),
                               ({'dc': 2, 'region': 3}, 2),
@@ -110,6 +139,25 @@ class TestUniversalisAPIClient:
         resp = await self.client.mb_current_data(item_ids, region)
         assert resp.data == data
 
+    @pytest.mark.asyncio
+    async def test_mb_current_data_typed(self, mb_data_data_parser,
+                                         mocked_mb_current_data):
+        w_d_r, region, items_str, item_ids, data = mb_data_data_parser
+        mocked_mb_current_data(region, items_str, {}, data)
+        resp = await self.client.mb_current_data(item_ids, region, typed=True)
+        assert all(item.record is not None for item in resp.items.values())
+        assert resp.data == data
+
+    @pytest.mark.asyncio
+    async def test_mb_current_data_lazy(self, mb_data_data_parser,
+                                        mocked_mb_current_data):
+        w_d_r, region, items_str, item_ids, data = mb_data_data_parser
+        mocked_mb_current_data(region, items_str, {}, data)
+        resp = await self.client.mb_current_data(item_ids, region, lazy=True)
+        assert not resp.items._built
+        assert resp.best_prices == {item.item_id: item.best_price
+                                    for item in resp.items.values()}
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("l,e,hq,s_w,e_w,f",
                              [
@@ -141,3 +189,208 @@ class TestUniversalisAPIClient:
                                                  stats_within=s_w, entries_within=e_w,
                                                  fields=f)
         assert data == resp.data
+
+    @pytest.mark.asyncio
+    async def test_mb_current_data_chunked(self, mocked_mb_current_data, mb_data_data):
+        template = mb_data_data['dcName_crystal_42884']
+        item_ids = list(range(1, 151))
+        region = 'crystal'
+        for chunk in (item_ids[:75], item_ids[75:]):
+            data = {
+                'itemIDs': chunk,
+                'items': {str(i): template | {'itemID': i} for i in chunk[:-1]},
+                'dcName': 'Crystal',
+                'unresolvedItems': chunk[-1:]
+            }
+            mocked_mb_current_data(region, ','.join(map(str, chunk)), {}, data)
+        resp = await self.client.mb_current_data(item_ids, region)
+        assert resp.unresolved_items == [75, 150]
+        assert resp.data['itemIDs'] == item_ids
+        assert len(resp.data['items']) == 148
+        assert set(resp.items) == set(item_ids) - {75, 150}
+
+    @pytest.mark.asyncio
+    async def test_refresh_many(self, mocked_response, mocked_mb_current_data,
+                                mb_data_data):
+        template = mb_data_data['dcName_crystal_42884']
+        old_items = {i: template | {'itemID': i} for i in range(1, 6)}
+        new_items = {i: item | {'lastUploadTime': item['lastUploadTime'] + 1,
+                                'minPrice': i}
+                     for i, item in old_items.items()}
+        params = {'listings': None, 'entries': None, 'hq': None,
+                  'stats_within': None, 'entries_within': None, 'fields': None}
+        # two single-item responses and an overlapping multi-item response
+        single = [MBDataResponse(old_items[i], params | {'item_ids': [i],
+                                                         'region': 'crystal'},
+                                 client=self.client)
+                  for i in (1, 2)]
+        multi = MBDataResponse(
+            {'itemIDs': [2, 3, 4], 'dcName': 'Crystal', 'unresolvedItems': [],
+             'items': {str(i): old_items[i] for i in (2, 3, 4)}},
+            params | {'item_ids': [2, 3, 4], 'region': 'crystal'},
+            client=self.client)
+        # a response with different params is fetched separately
+        hq = MBDataResponse(old_items[5], {'item_ids': [5], 'region': 'crystal',
+                                           'hq': True}, client=self.client)
+        mocked_mb_current_data('crystal', '1,2,3,4', {}, {
+            'itemIDs': [1, 2, 3, 4], 'dcName': 'Crystal', 'unresolvedItems': [],
+            'items': {str(i): new_items[i] for i in (1, 2, 3, 4)}})
+        mocked_mb_current_data('crystal', '5', {'hq': 'true'}, new_items[5])
+
+        changes = await self.client.refresh_many([*single, multi, hq])
+
+        assert len(mocked_response.requests) == 2
+        assert [set(c) for c in changes] == [{1}, {2}, {2, 3, 4}, {5}]
+        assert changes[2][4]['new_price'] == 4
+        assert single[0].best_prices == {1: 1}
+        assert multi.best_prices == {2: 2, 3: 3, 4: 4}
+        assert multi.data['itemIDs'] == [2, 3, 4]
+        assert hq.best_prices == {5: 5}
+
+    @pytest.mark.asyncio
+    async def test_refresh_many_unresolved(self, mocked_mb_current_data,
+                                           mb_data_data):
+        template = mb_data_data['dcName_crystal_42884']
+        old_items = {i: template | {'itemID': i} for i in (1, 2)}
+        resp = MBDataResponse(
+            {'itemIDs': [1, 2], 'dcName': 'Crystal', 'unresolvedItems': [],
+             'items': {str(i): item for i, item in old_items.items()}},
+            {'item_ids': [1, 2], 'region': 'crystal'}, client=self.client)
+        new_item = old_items[1] | {'lastUploadTime': 0}
+        mocked_mb_current_data('crystal', '1,2', {}, {
+            'itemIDs': [1, 2], 'dcName': 'Crystal', 'unresolvedItems': [2],
+            'items': {'1': new_item}})
+        [changes] = await self.client.refresh_many([resp])
+        assert set(changes) == {1}
+        assert resp.unresolved_items == [2]
+
+    @pytest.mark.asyncio
+    async def test_mb_item_data_batched(self, mocked_mb_current_data, mb_data_data):
+        data = mb_data_data['dcName_crystal_42884,2']
+        mocked_mb_current_data('crystal', '42884,2', {'listings': 5}, data)
+        item_a, item_b = await asyncio.gather(
+            self.client.mb_item_data(42884, 'crystal', listings=5),
+            self.client.mb_item_data(2, 'crystal', listings=5))
+        assert item_a.item_id == 42884
+        assert item_b.item_id == 2
+
+    @pytest.mark.asyncio
+    async def test_mb_item_data_drops_idle_batchers(self, mocked_mb_current_data,
+                                                    mb_data_data):
+        data = mb_data_data['dcName_crystal_42884']
+        for listings in range(1, 4):
+            mocked_mb_current_data('crystal', '42884', {'listings': listings}, data)
+            await self.client.mb_item_data(42884, 'crystal', listings=listings)
+        await asyncio.sleep(0)
+        assert self.client._batchers == {}
+
+    @pytest.mark.asyncio
+    async def test_mb_item_data_single(self, mocked_mb_current_data, mb_data_data):
+        data = mb_data_data['dcName_crystal_42884']
+        mocked_mb_current_data('crystal', '42884', {}, data)
+        item = await self.client.mb_item_data(42884, 'crystal')
+        assert item.data == data
+
+    @pytest.mark.asyncio
+    async def test_mb_item_data_unresolved(self, mocked_mb_current_data, mb_data_data):
+        data = mb_data_data['dcName_crystal_42884,2'] | {'unresolvedItems': [3]}
+        mocked_mb_current_data('crystal', '42884,3', {}, data)
+        results = await asyncio.gather(self.client.mb_item_data(42884, 'crystal'),
+                                       self.client.mb_item_data(3, 'crystal'),
+                                       return_exceptions=True)
+        assert results[0].item_id == 42884
+        assert isinstance(results[1], UniversalisError)
+
+
+def _multi(template: dict, item_ids: list[int], dc_name: str) -> dict:
+    items = {str(i): template | {'itemID': i} for i in item_ids}
+    return {'itemIDs': item_ids, 'items': items, 'dcName': dc_name,
+            'unresolvedItems': []}
+
+
+@pytest.mark.unittest
+class TestIterMBData:
+
+    @pytest.fixture
+    def template(self, mb_data_data) -> dict:
+        template = dict(mb_data_data['dcName_crystal_42884'])
+        del template['dcName']
+        return template
+
+    @pytest.fixture
+    def mock_chunks(self, mocked_mb_current_data, template):
+        def _mock(item_ids: list[int], regions: list[str]) -> None:
+            for start in range(0, len(item_ids), 100):
+                chunk = item_ids[start:start + 100]
+                for region in regions:
+                    mocked_mb_current_data(region, ','.join(map(str, chunk)), {},
+                                           _multi(template, chunk, region.title()))
+        return _mock
+
+    @pytest.mark.asyncio
+    async def test_iter(self, mock_chunks):
+        item_ids = list(range(1, 251))
+        mock_chunks(item_ids, ['crystal', 'aether'])
+        async with UniversalisAPIClient(requests_per_second=None) as client:
+            # duplicates within a chunk are dropped
+            items = [item async for item in client.iter_mb_data(
+                item_ids[:50] + [1, 2] + item_ids[50:], ['crystal', 'aether'])]
+        assert sorted((item.region_info, item.item_id) for item in items) == sorted(
+            (region, i) for region in ('Aether', 'Crystal') for i in item_ids)
+
+    @pytest.mark.asyncio
+    async def test_async_source(self, mock_chunks):
+        async def _ids():
+            for i in range(1, 151):
+                yield i
+        mock_chunks(list(range(1, 151)), ['crystal'])
+        async with UniversalisAPIClient(requests_per_second=None) as client:
+            items = [item async for item in client.iter_mb_data(_ids(), 'crystal',
+                                                                typed=True)]
+        assert sorted(item.item_id for item in items) == list(range(1, 151))
+        assert all(item.record is not None for item in items)
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, mock_chunks, mocked_response):
+        pulled = 0
+
+        async def _ids():
+            nonlocal pulled
+            for i in range(1, 1001):
+                pulled += 1
+                yield i
+        mock_chunks(list(range(1, 1001)), ['crystal'])
+        async with UniversalisAPIClient(requests_per_second=None,
+                                        max_concurrent_requests=1) as client:
+            items = client.iter_mb_data(_ids(), 'crystal', max_pending_chunks=1)
+            await anext(items)
+            await asyncio.sleep(0.2)
+            # one chunk being consumed, one queued, and one waiting for room
+            assert sum(map(len, mocked_response.requests.values())) == 3
+            assert pulled <= 400
+            await items.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors(self, mock_chunks, mocked_response, base_url):
+        item_ids = list(range(1, 201))
+        mock_chunks(item_ids[:100], ['crystal'])
+        mocked_response.get(f'{base_url}/crystal/{",".join(map(str, item_ids[100:]))}',
+                            status=404)
+        async with UniversalisAPIClient(requests_per_second=None,
+                                        retry_policy=None) as client:
+            with pytest.raises(UniversalisError):
+                async for _ in client.iter_mb_data(item_ids, 'crystal'):
+                    pass
+            with pytest.raises(UniversalisError):
+                async for _ in client.iter_mb_data(item_ids, 'blah'):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_source_error(self):
+        async def _ids():
+            yield 1
+            raise ValueError("bad source")
+        async with UniversalisAPIClient(requests_per_second=None) as client:
+            with pytest.raises(ValueError):
+                async for _ in client.iter_mb_data(_ids(), 'crystal'):
+                    pass
@@ -0,0 +1,54 @@
+import pytest
+
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils import bson
+
+
+DOCUMENT = {'event': 'listings/add', 'item': 5057, 'world': 73, 'big': 2 ** 40,
+            'price': 1.5, 'hq': True, 'retainer': None, 'blob': b'\x00\x01',
+            'listings': [{'pricePerUnit': 100, 'materia': []}, {'name': 'ü'}],
+            'nested': {'a': {'b': -1}}}
+
+
+@pytest.mark.unittest
+class TestBSON:
+
+    def test_round_trip(self):
+        assert bson.decode(bson.encode(DOCUMENT)) == DOCUMENT
+
+    def test_known_encoding(self):
+        # from the BSON specification
+        assert bson.encode({'hello': 'world'}) == (
+            b'\x16\x00\x00\x00\x02hello\x00\x06\x00\x00\x00world\x00\x00')
+
+    def test_decode_all(self):
+        documents = [{'i': i} for i in range(5)]
+        data = b''.join(map(bson.encode, documents))
+        assert bson.decode_all(data) == documents
+        assert bson.decode_all(b'') == []
+
+    def test_round_trip_mb_data(self, mb_data_data_parametrized):
+        _, data = mb_data_data_parametrized
+        assert bson.decode(bson.encode(data)) == data
+
+    def test_decoding_only_types(self):
+        object_id = bytes(range(12))
+        data = (b'\x00\x00\x00\x00' + b'\x07id\x00' + object_id
+                + b'\x09at\x00' + (1234).to_bytes(8, 'little') + b'\x00')
+        data = len(data).to_bytes(4, 'little') + data[4:]
+        assert bson.decode(data) == {'id': object_id.hex(), 'at': 1234}
+
+    @pytest.mark.parametrize("value", [object(), 2 ** 64, {1, 2}])
+    def test_unencodable(self, value):
+        with pytest.raises(UniversalisError):
+            bson.encode({'value': value})
+
+    @pytest.mark.parametrize("data", [
+        b'', b'\x05\x00\x00', b'\x05\x00\x00\x00\x01',
+        bson.encode({'a': 1})[:-1], bson.encode({'a': 1}) + b'\x00',
+        b'\x0c\x00\x00\x00\x7fa\x00\x00\x00\x00\x00\x00',
+        b'\x0d\x00\x00\x00\x02a\x00\xff\x00\x00\x00\x00\x00',
+    ])
+    def test_malformed(self, data):
+        with pytest.raises(UniversalisError):
+            bson.decode(data)
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from universalisapi._wrapper import UniversalisAPIWrapper
+from universalisapi.utils.cache import DiskCache, ResponseCache, canonical_request_key
+
+
+@pytest.mark.unittest
+class TestCanonicalRequestKey:
+
+    @pytest.mark.parametrize("endpoint,params,expected", [
+        ('/worlds', None, '/worlds'),
+        ('/crystal/3,1,2,1', {}, '/crystal/1,2,3'),
+        # a multi-item response, unlike /crystal/5
+        ('/crystal/5,5', None, '/crystal/5,'),
+        ('/aggregated/crystal/10,9', None, '/aggregated/crystal/9,10'),
+        ('/crystal/5', {'listings': 5, 'hq': 'true'}, '/crystal/5?hq=true&listings=5'),
+        ('/extra/stats/least-recently-updated', {'world': 'coeurl'},
+         '/extra/stats/least-recently-updated?world=coeurl'),
+    ])
+    def test_canonical_request_key(self, endpoint, params, expected):
+        assert canonical_request_key(endpoint, params) == expected
+
+
+@pytest.mark.unittest
+class TestResponseCache:
+
+    def test_ttl_for(self):
+        cache = ResponseCache(ttls={'/a': 1, '/a/b': 2}, default_ttl=3)
+        assert cache.ttl_for('/a/c') == 1
+        assert cache.ttl_for('/a/b/c') == 2
+        assert cache.ttl_for('/crystal/5354') == 3
+        assert ResponseCache().ttl_for('/worlds') >= 60 * 60
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2)
+        cache.set('a', b'1', '/a')
+        cache.set('b', b'2', '/b')
+        assert cache.get('a') is not None
+        cache.set('c', b'3', '/c')
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+
+    def test_expiry(self):
+        cache = ResponseCache(default_ttl=10)
+        cache.set('a', b'1', '/a')
+        cache._entries['a'].stored_at -= 11
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_stale_window(self):
+        cache = ResponseCache(default_ttl=10, stale_while_revalidate=10)
+        cache.set('a', b'1', '/a')
+        cache._entries['a'].stored_at -= 15
+        entry = cache.get('a')
+        assert entry is not None and not entry.fresh
+
+    @pytest.mark.asyncio
+    async def test_get_endpoint_cached(self, mocked_worlds, worlds):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None,
+                                        cache=ResponseCache())
+        first = await wrapper.get_endpoint('/worlds')
+        # the mocked endpoint only answers once, so this must come from the cache
+        second = await wrapper.get_endpoint('/worlds')
+        assert first == second == worlds
+        assert first is not second
+        assert wrapper.cache.hits == 1
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_get_endpoint_stale_while_revalidate(self, mocked_response,
+                                                       base_url):
+        cache = ResponseCache(default_ttl=10, stale_while_revalidate=60)
+        wrapper = UniversalisAPIWrapper(requests_per_second=None, cache=cache)
+        mocked_response.get(f'{base_url}/crystal/1,2', payload={'n': 1})
+        mocked_response.get(f'{base_url}/crystal/1,2', payload={'n': 2})
+        assert await wrapper.get_endpoint('/crystal/1,2') == {'n': 1}
+        cache._entries['/crystal/1,2'].stored_at -= 11
+        # stale value comes back immediately, refresh happens in the background
+        assert await wrapper.get_endpoint('/crystal/1,2') == {'n': 1}
+        await asyncio.gather(*wrapper._revalidations.values())
+        assert await wrapper.get_endpoint('/crystal/1,2') == {'n': 2}
+        await wrapper.close()
+
+
+@pytest.mark.unittest
+class TestDiskCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = DiskCache(tmp_path / 'cache.sqlite')
+        cache.set('/crystal/1,2', b'{"a": 1}')
+        entry = cache.get('/crystal/1,2', '/crystal/1,2')
+        assert entry.body == b'{"a": 1}'
+        assert entry.fresh
+        assert cache.get('/crystal/3', '/crystal/3') is None
+        cache.close()
+
+    def test_ttl(self, tmp_path):
+        cache = DiskCache(tmp_path / 'cache.sqlite', default_ttl=10)
+        cache.set('a', b'1')
+        cache._conn.execute('UPDATE responses SET fetched_at = fetched_at - 11')
+        assert cache.get('a', '/crystal/1') is None
+        # /worlds has a longer TTL, so the same row is still fresh for it
+        assert cache.get('a', '/worlds') is not None
+        cache.close()
+
+    def test_compressed_and_capped(self, tmp_path):
+        body = b'x' * 10000
+        cache = DiskCache(tmp_path / 'cache.sqlite', max_bytes=70)
+        for key in 'abcdef':
+            cache.set(key, body)
+        assert cache.size <= 70
+        assert 0 < len(cache) < 6
+        # the newest response survives eviction
+        assert cache.get('f', '/worlds').body == body
+        assert cache.get('a', '/worlds') is None
+        cache.close()
+
+    def test_shared_between_connections(self, tmp_path):
+        writer = DiskCache(tmp_path / 'cache.sqlite')
+        reader = DiskCache(tmp_path / 'cache.sqlite')
+        writer.set('a', b'1')
+        assert reader.get('a', '/worlds').body == b'1'
+        writer.close()
+        reader.close()
+
+    @pytest.mark.asyncio
+    async def test_get_endpoint_survives_restart(self, tmp_path, mocked_worlds, worlds):
+        path = tmp_path / 'cache.sqlite'
+        wrapper = UniversalisAPIWrapper(requests_per_second=None,
+                                        disk_cache=DiskCache(path))
+        assert await wrapper.get_endpoint('/worlds') == worlds
+        wrapper.disk_cache.close()
+        await wrapper.close()
+
+        # the mocked endpoint only answers once, so this must come from disk
+        restarted = UniversalisAPIWrapper(requests_per_second=None,
+                                          cache=ResponseCache(),
+                                          disk_cache=DiskCache(path))
+        assert await restarted.get_endpoint('/worlds') == worlds
+        assert '/worlds' in restarted.cache
+        restarted.disk_cache.close()
+        await restarted.close()
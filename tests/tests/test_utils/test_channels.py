@@ -0,0 +1,28 @@
+import pytest
+
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils.channels import format_channel, parse_channel
+
+
+@pytest.mark.unittest
+class TestChannels:
+
+    def test_format(self):
+        assert format_channel('sales/add') == 'sales/add'
+        assert format_channel('listings/add', 73) == 'listings/add{world=73}'
+        with pytest.raises(UniversalisError):
+            format_channel('blah')
+
+    @pytest.mark.parametrize("name,expected", [
+        ('sales/add', ('sales/add', {})),
+        ('listings/add{world=73}', ('listings/add', {'world': '73'})),
+        ('listings/add{world=73, item=5}', ('listings/add',
+                                            {'world': '73', 'item': '5'})),
+    ])
+    def test_parse(self, name, expected):
+        assert parse_channel(name) == expected
+
+    @pytest.mark.parametrize("name", ['', 'sales/add{world}', 'Sales{', 'x{a=1}}'])
+    def test_parse_invalid(self, name):
+        with pytest.raises(UniversalisError):
+            parse_channel(name)
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from universalisapi._wrapper import UniversalisAPIWrapper
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils.decoding import JSON_DECODERS, get_json_decoder
+
+
+def _available_decoders() -> list[str]:
+    available = []
+    for name in JSON_DECODERS:
+        try:
+            get_json_decoder(name)
+        except UniversalisError:
+            continue
+        available.append(name)
+    return available
+
+
+@pytest.mark.unittest
+class TestJSONDecoders:
+
+    @pytest.mark.parametrize("name", _available_decoders())
+    def test_decoders_agree(self, name, mb_data_data):
+        decode = get_json_decoder(name)
+        for data in mb_data_data.values():
+            body = json.dumps(data).encode()
+            assert decode(body) == data
+
+    def test_auto(self):
+        assert get_json_decoder('auto') is not None
+
+    def test_unknown(self):
+        with pytest.raises(UniversalisError):
+            get_json_decoder('yaml')
+
+    @pytest.mark.asyncio
+    async def test_custom_decoder(self, mocked_worlds, worlds):
+        calls = []
+
+        def _loads(body: bytes):
+            calls.append(body)
+            return json.loads(body)
+
+        wrapper = UniversalisAPIWrapper(requests_per_second=None, json_decoder=_loads)
+        assert await wrapper.get_endpoint('/worlds') == worlds
+        assert len(calls) == 1
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_raw(self, mocked_worlds, worlds):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        body = await wrapper.get_endpoint('/worlds', raw=True)
+        assert isinstance(body, bytes)
+        assert json.loads(body) == worlds
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_json(self, mocked_response, base_url):
+        mocked_response.get(f'{base_url}/worlds', body='not json',
+                            content_type='application/json')
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        with pytest.raises(UniversalisError):
+            await wrapper.get_endpoint('/worlds')
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_not_json(self, mocked_response, base_url):
+        mocked_response.get(f'{base_url}/worlds', body='<html></html>',
+                            content_type='text/html')
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        with pytest.raises(UniversalisError):
+            await wrapper.get_endpoint('/worlds')
+        await wrapper.close()
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+
+from universalisapi._wrapper import UniversalisAPIWrapper
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils.rate_limit import RateLimiter
+
+
+@pytest.mark.unittest
+class TestRateLimiter:
+
+    @pytest.mark.parametrize("rate,burst", [(0, 1), (-1, 1), (1, 0)])
+    def test_invalid(self, rate, burst):
+        with pytest.raises(UniversalisError):
+            RateLimiter(rate, burst)
+
+    def test_default_burst(self):
+        assert RateLimiter(2.5).burst == 3
+
+    @pytest.mark.asyncio
+    async def test_burst_is_immediate(self):
+        limiter = RateLimiter(1, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_throttles_after_burst(self):
+        limiter = RateLimiter(50, burst=2)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(7)))
+        # 2 immediately, the other 5 at 50/s
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancel_refunds_tokens(self):
+        limiter = RateLimiter(1, burst=1)
+        await limiter.acquire()
+        task = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert limiter.available > -0.5
+
+    @pytest.mark.asyncio
+    async def test_get_endpoint_uses_limiter(self, mocked_worlds, mocker):
+        wrapper = UniversalisAPIWrapper(requests_per_second=10, burst=3)
+        acquire = mocker.spy(wrapper.rate_limiter, 'acquire')
+        await wrapper.get_endpoint('/worlds')
+        assert acquire.call_count == 1
+        await wrapper.close()
+
+    def test_disabled(self):
+        assert UniversalisAPIWrapper(requests_per_second=None).rate_limiter is None
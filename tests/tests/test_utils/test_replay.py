@@ -0,0 +1,35 @@
+import aiohttp
+import pytest
+
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils import bson
+from universalisapi.utils.replay import ReplayServer, read_events, write_events
+
+EVENTS = [{'event': 'listings/add', 'item': i, 'world': 73 + i % 2,
+           'listings': [{'pricePerUnit': i}]} for i in range(10)]
+
+
+@pytest.mark.unittest
+class TestReplayServer:
+
+    def test_recording_round_trip(self, tmp_path):
+        write_events(tmp_path / 'events.bson', EVENTS)
+        assert read_events(tmp_path / 'events.bson') == EVENTS
+
+    def test_invalid(self):
+        with pytest.raises(UniversalisError):
+            ReplayServer(EVENTS, batch_size=0)
+
+    @pytest.mark.asyncio
+    async def test_batches_and_filters(self):
+        async with ReplayServer(EVENTS, batch_size=3) as server, \
+                aiohttp.ClientSession() as session, \
+                session.ws_connect(server.url) as ws:
+            await ws.send_bytes(b'not bson')
+            await ws.send_bytes(bson.encode({'event': 'subscribe',
+                                             'channel': 'listings/add{world=74}'}))
+            frames = [bson.decode_all(await ws.receive_bytes()) for _ in range(2)]
+        assert [len(frame) for frame in frames] == [3, 2]
+        assert sum(frames, []) == [e for e in EVENTS if e['world'] == 74]
+        assert server.connections == 1
+        assert server.events_sent == 5
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from universalisapi._wrapper import UniversalisAPIWrapper
+from universalisapi.exceptions import UniversalisError, UniversalisHTTPError
+from universalisapi.utils.retry import RetryPolicy, parse_retry_after
+
+
+FAST_POLICY = RetryPolicy(max_attempts=3, backoff_base=0.001, backoff_max=0.01)
+
+
+@pytest.mark.unittest
+class TestRetryPolicy:
+
+    @pytest.mark.parametrize("attempt", [1, 2, 3, 10])
+    def test_backoff_without_jitter(self, attempt):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+        assert policy.backoff(attempt) == min(5, 2 ** (attempt - 1))
+
+    def test_backoff_with_jitter(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+        assert all(0 <= policy.backoff(4) <= 5 for _ in range(50))
+
+    def test_next_delay_attempt_cap(self):
+        policy = RetryPolicy(max_attempts=2, jitter=False)
+        assert policy.next_delay(1, 0) == policy.backoff_base
+        assert policy.next_delay(2, 0) is None
+
+    def test_next_delay_time_cap(self):
+        policy = RetryPolicy(max_elapsed=10, jitter=False)
+        assert policy.next_delay(1, 9.9) is None
+
+    def test_next_delay_retry_after(self):
+        policy = RetryPolicy(jitter=False)
+        assert policy.next_delay(1, 0, retry_after=7) == 7
+
+    @pytest.mark.parametrize("value,expected", [(None, None), ('', None), ('3', 3),
+                                                ('1.5', 1.5), ('-1', 0),
+                                                ('garbage', None)])
+    def test_parse_retry_after(self, value, expected):
+        assert parse_retry_after(value) == expected
+
+    def test_parse_retry_after_date(self):
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 < parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+
+@pytest.mark.unittest
+class TestWrapperRetries:
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self, mocked_response, base_url, worlds):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None,
+                                        retry_policy=FAST_POLICY)
+        mocked_response.get(f'{base_url}/worlds', status=503)
+        mocked_response.get(f'{base_url}/worlds', status=429,
+                            headers={'Retry-After': '0'})
+        mocked_response.get(f'{base_url}/worlds', status=200, payload=worlds)
+        assert await wrapper.get_endpoint('/worlds') == worlds
+        assert wrapper.retry_stats.retries == {503: 1, 429: 1}
+        assert not wrapper.retry_stats.exhausted
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_gives_up(self, mocked_response, base_url):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None,
+                                        retry_policy=FAST_POLICY)
+        for _ in range(3):
+            mocked_response.get(f'{base_url}/worlds', status=502)
+        with pytest.raises(UniversalisHTTPError) as e:
+            await wrapper.get_endpoint('/worlds')
+        assert e.value.status == 502
+        assert wrapper.retry_stats.retries == {502: 2}
+        assert wrapper.retry_stats.exhausted == {502: 1}
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_no_retry_on_client_error(self, mocked_response, base_url):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None,
+                                        retry_policy=FAST_POLICY)
+        mocked_response.get(f'{base_url}/worlds', status=404)
+        with pytest.raises(UniversalisError):
+            await wrapper.get_endpoint('/worlds')
+        assert not wrapper.retry_stats.retries
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_retries_only_failed_chunk(self, mocked_mb_current_data,
+                                             mocked_response, base_url):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None,
+                                        retry_policy=FAST_POLICY)
+        item_ids = list(range(1, 201))
+        first, second = item_ids[:100], item_ids[100:]
+        mocked_mb_current_data('coeurl', ','.join(map(str, first)), {},
+                               {'itemIDs': first, 'items': {}})
+        mocked_response.get(f'{base_url}/coeurl/{",".join(map(str, second))}',
+                            status=503)
+        mocked_mb_current_data('coeurl', ','.join(map(str, second)), {},
+                               {'itemIDs': second, 'items': {}})
+        resp = await wrapper._get_mb_current_data(item_ids, 'coeurl')
+        assert resp['itemIDs'] == item_ids
+        assert wrapper.retry_stats.retries == {503: 1}
+        await wrapper.close()
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from universalisapi.client import UniversalisAPIClient
+from universalisapi.exceptions import UniversalisError
+from universalisapi.watcher import MarketWatcher
+
+PAIRS = [(1, 'crystal'), (2, 'crystal')]
+
+
+def _multi(template: dict, item_ids: list[int], upload_time: int = 1,
+           velocity: float = 0.0) -> dict:
+    items = {str(i): template | {'itemID': i, 'lastUploadTime': upload_time,
+                                 'regularSaleVelocity': velocity}
+             for i in item_ids}
+    return {'itemIDs': item_ids, 'items': items, 'dcName': 'Crystal',
+            'unresolvedItems': []}
+
+
+async def _take(watcher: MarketWatcher, n: int) -> list:
+    changes = []
+    async for change in watcher:
+        changes.append(change)
+        if len(changes) == n:
+            return changes
+
+
+@pytest.mark.unittest
+class TestMarketWatcher:
+
+    @pytest.fixture
+    def client(self) -> UniversalisAPIClient:
+        return UniversalisAPIClient(requests_per_second=None, retry_policy=None)
+
+    @pytest.fixture
+    def template(self, mb_data_data) -> dict:
+        return mb_data_data['dcName_crystal_42884']
+
+    def test_invalid(self, client):
+        with pytest.raises(UniversalisError):
+            MarketWatcher(client, min_interval=10, max_interval=5)
+        watcher = MarketWatcher(client)
+        with pytest.raises(UniversalisError):
+            watcher.watch(1, 'blah')
+
+    def test_watchlist(self, client):
+        watcher = MarketWatcher(client, [(1, 'crystal'), (2, 'aether')],
+                                requests_per_minute=120)
+        assert len(watcher) == 2
+        assert (1, 'crystal') in watcher
+        assert watcher.budget.rate == 2
+        assert watcher.unwatch(1, 'crystal')
+        assert not watcher.unwatch(1, 'crystal')
+        assert (1, 'crystal') not in watcher
+
+    @pytest.mark.asyncio
+    async def test_packs_requests(self, client, mocked_mb_current_data, template):
+        crystal = list(range(1, 151))
+        aether = [1, 2, 3]
+        for chunk in (crystal[:100], crystal[100:]):
+            mocked_mb_current_data('crystal', ','.join(map(str, chunk)), {},
+                                   _multi(template, chunk))
+        mocked_mb_current_data('aether', '1,2,3', {}, _multi(template, aether))
+        pairs = [(i, 'crystal') for i in crystal] + [(i, 'aether') for i in aether]
+        async with client, MarketWatcher(client, pairs) as watcher:
+            changes = await asyncio.wait_for(_take(watcher, len(pairs)), 5)
+        assert {(c.item_id, c.region) for c in changes} == set(pairs)
+        assert all(c.previous_upload_time is None for c in changes)
+        assert watcher.requests_made == 3
+        assert watcher.items_checked == len(pairs)
+
+    @pytest.mark.asyncio
+    async def test_intervals(self, client, mocked_mb_current_data, template):
+        # 2880 sales a day is one every 30 seconds
+        data = _multi(template, [1, 2])
+        data['items']['2']['regularSaleVelocity'] = 2880
+        mocked_mb_current_data('crystal', '1,2', {}, data)
+        watcher = MarketWatcher(client, PAIRS, min_interval=10, max_interval=600)
+        async with client, watcher:
+            await asyncio.wait_for(_take(watcher, 2), 5)
+        assert watcher.interval(1, 'crystal') == 600
+        assert watcher.interval(2, 'crystal') == pytest.approx(30)
+
+    @pytest.mark.asyncio
+    async def test_only_changes(self, client, mocked_mb_current_data, template):
+        for upload_time in (1, 1, 1, 2):
+            mocked_mb_current_data('crystal', '1,2', {},
+                                   _multi(template, [1, 2], upload_time))
+        watcher = MarketWatcher(client, PAIRS, min_interval=0.01, max_interval=0.01)
+        async with client, watcher:
+            changes = await asyncio.wait_for(_take(watcher, 4), 5)
+        assert watcher.requests_made == 4
+        assert watcher.changes_seen == 4
+        assert [c.previous_upload_time for c in changes] == [None, None, 1, 1]
+        assert all(c.item.last_upload_timestamp == 2 for c in changes[2:])
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, mocked_mb_current_data, template):
+        client = UniversalisAPIClient(requests_per_second=None, retry_policy=None,
+                                      max_concurrent_requests=1)
+        for upload_time in range(1, 11):
+            mocked_mb_current_data('crystal', '1,2', {},
+                                   _multi(template, [1, 2], upload_time))
+        watcher = MarketWatcher(client, PAIRS, min_interval=0.01, max_interval=0.01,
+                                max_pending_changes=1)
+        async with client, watcher:
+            await asyncio.sleep(0.2)
+            # the first check is stuck on its second change
+            assert watcher.requests_made == 1
+            await asyncio.wait_for(_take(watcher, 4), 5)
+            assert watcher.requests_made >= 2
+
+    @pytest.mark.asyncio
+    async def test_failed_check(self, client, mocked_mb_current_data, mocked_response,
+                                base_url, template):
+        mocked_response.get(f'{base_url}/crystal/1,2', status=404)
+        mocked_mb_current_data('crystal', '1,2', {}, _multi(template, [1, 2]))
+        watcher = MarketWatcher(client, PAIRS, min_interval=0.01)
+        async with client, watcher:
+            changes = await asyncio.wait_for(_take(watcher, 2), 5)
+        assert watcher.requests_made == 2
+        assert {c.item_id for c in changes} == {1, 2}
+
+    @pytest.mark.asyncio
+    async def test_stop_ends_iteration(self, client, mocked_mb_current_data,
+                                       template):
+        mocked_mb_current_data('crystal', '1,2', {}, _multi(template, [1, 2]))
+        watcher = MarketWatcher(client, PAIRS)
+        received = []
+
+        async def _consume():
+            async for change in watcher:
+                received.append(change)
+
+        async with client:
+            watcher.start()
+            consuming = asyncio.ensure_future(_consume())
+            await asyncio.sleep(0.1)
+            await watcher.stop()
+            await asyncio.wait_for(consuming, 5)
+        assert {c.item_id for c in received} == {1, 2}
+        assert watcher.error is None
+
+    @pytest.mark.asyncio
+    async def test_failure_ends_iteration(self, client, monkeypatch):
+        watcher = MarketWatcher(client, PAIRS)
+
+        def _fail():
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(watcher, '_earliest', _fail)
+        async with client, watcher:
+            with pytest.raises(UniversalisError) as info:
+                await asyncio.wait_for(_take(watcher, 1), 5)
+        assert isinstance(info.value.__cause__, RuntimeError)
+        assert watcher.error is info.value.__cause__
+        assert not watcher.running
@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+
+from universalisapi.exceptions import UniversalisError
+from universalisapi.utils.replay import ReplayServer
+from universalisapi.utils.retry import RetryPolicy
+from universalisapi.websocket import MarketEvent, UniversalisWebSocket
+
+FAST_POLICY = RetryPolicy(max_attempts=3, backoff_base=0.001, backoff_max=0.01)
+
+
+async def _take(subscription, n: int) -> list[MarketEvent]:
+    events = []
+    async for event in subscription:
+        events.append(event)
+        if len(events) == n:
+            break
+    return events
+
+
+@pytest.fixture
+def events(mb_data_data) -> list[dict]:
+    """One listings/add event per listing, and a sales/add event per sale."""
+    data = mb_data_data['dcName_crystal_42884']
+    events = [{'event': 'listings/add', 'item': 42884, 'world': listing['worldID'],
+               'listings': [listing]} for listing in data['listings']]
+    events += [{'event': 'sales/add', 'item': 42884, 'world': sale['worldID'],
+                'sales': [sale]} for sale in data['recentHistory']]
+    return events
+
+
+@pytest.mark.unittest
+class TestMarketEvent:
+
+    def test_round_trip(self, events):
+        for data in (events[0], events[-1]):
+            assert MarketEvent.from_dict(data).data == data
+
+
+@pytest.mark.unittest
+class TestUniversalisWebSocket:
+
+    @pytest.mark.asyncio
+    async def test_subscribe(self, events):
+        n_listings = sum(e['event'] == 'listings/add' for e in events)
+        async with ReplayServer(events) as server, \
+                UniversalisWebSocket(server.url) as ws:
+            sub = await ws.subscribe('listings/add')
+            received = await asyncio.wait_for(_take(sub, n_listings), 5)
+        assert [e.data for e in received] == events[:n_listings]
+        assert ws.connects == 1
+
+    @pytest.mark.asyncio
+    async def test_filters(self, events):
+        world = events[-1]['world']
+        expected = [e for e in events
+                    if e['event'] == 'sales/add' and e['world'] == world]
+        async with ReplayServer(events, batch_size=7, start_after=3) as server:
+            ws = UniversalisWebSocket(server.url)
+            by_world = await ws.subscribe('sales/add', world=world)
+            other_item = await ws.subscribe('sales/add', items={1})
+            listings = await ws.subscribe('listings/add', world=world, items={42884})
+            async with ws:
+                received = await asyncio.wait_for(_take(by_world, len(expected)), 5)
+                await asyncio.wait_for(_take(listings, 1), 5)
+                assert other_item._queue.empty()
+        assert [e.data for e in received] == expected
+        assert all(e.world_id == world for e in received)
+
+    @pytest.mark.asyncio
+    async def test_shared_channel(self, events):
+        async with ReplayServer(events) as server, \
+                UniversalisWebSocket(server.url) as ws:
+            first = await ws.subscribe('listings/add')
+            second = await ws.subscribe('listings/add')
+            assert ws._channels == {'listings/add': 2}
+            a, b = await asyncio.wait_for(
+                asyncio.gather(_take(first, 3), _take(second, 3)), 5)
+            assert a == b
+            await first.close()
+            assert ws._channels == {'listings/add': 1}
+            assert [event async for event in first] == []
+            await second.close()
+            assert not ws._channels
+
+    @pytest.mark.asyncio
+    async def test_reconnect(self, events):
+        async with ReplayServer(events, disconnect_after=5) as server, \
+                UniversalisWebSocket(server.url, retry_policy=FAST_POLICY) as ws:
+            sub = await ws.subscribe('listings/add')
+            received = await asyncio.wait_for(_take(sub, 12), 5)
+        # each connection replays from the start
+        assert [e.data for e in received] == (events[:5] * 3)[:12]
+        assert ws.connects == 3
+        assert server.connections == 3
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, events):
+        async with ReplayServer(events) as server, \
+                UniversalisWebSocket(server.url, max_pending_events=2) as ws:
+            sub = await ws.subscribe('listings/add')
+            await asyncio.sleep(0.1)
+            # the socket waits with one event in hand until there is room
+            assert sub._queue.qsize() == 2
+            assert ws.events_received == 3
+            await asyncio.wait_for(_take(sub, 3), 5)
+            await asyncio.sleep(0.1)
+            assert ws.events_received == 6
+
+    @pytest.mark.asyncio
+    async def test_close_ends_iteration(self, events):
+        async with ReplayServer(events[:3]) as server:
+            ws = UniversalisWebSocket(server.url)
+            sub = await ws.subscribe('listings/add')
+            await ws.connect()
+            waiting = asyncio.ensure_future(_take(sub, 10))
+            await asyncio.sleep(0.1)
+            await ws.close()
+            received = await asyncio.wait_for(waiting, 5)
+        assert len(received) == 3
+        assert sub.closed
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_while_full(self, events):
+        async with ReplayServer(events) as server, \
+                UniversalisWebSocket(server.url, max_pending_events=1) as ws:
+            full = await ws.subscribe('listings/add')
+            other = await ws.subscribe('listings/add')
+            await asyncio.sleep(0.1)
+            await full.close()
+            # the socket is no longer held up by the closed subscription
+            await asyncio.wait_for(_take(other, 5), 5)
+            assert [event async for event in full] == []
+
+    @pytest.mark.asyncio
+    async def test_cannot_connect(self):
+        async with ReplayServer([]) as server:
+            url = server.url
+        ws = UniversalisWebSocket(url, retry_policy=FAST_POLICY)
+        sub = await ws.subscribe('sales/add')
+        with pytest.raises(UniversalisError):
+            await ws.connect()
+        with pytest.raises(UniversalisError):
+            await anext(sub)
+        await ws.close()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_reconnecting(self, events):
+        policy = RetryPolicy(max_attempts=1)
+        async with ReplayServer(events, disconnect_after=2) as server, \
+                UniversalisWebSocket(server.url, retry_policy=policy) as ws:
+            sub = await ws.subscribe('listings/add')
+            with pytest.raises(UniversalisError):
+                await asyncio.wait_for(_take(sub, 10), 5)
+            assert isinstance(ws.error, ConnectionResetError)
+            assert not ws.subscriptions
+            assert not ws._channels
+            # reconnecting doesn't renew the ended subscription
+            await ws.connect()
+            assert not ws._channels
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('frame', [
+        b'\x05\x00\x00',
+        b'\x06\x00\x00\x00\x00',
+        # a well-formed document that isn't an event
+        b'\x0f\x00\x00\x00\x10item\x00\x01\x00\x00\x00\x00',
+    ], ids=['truncated', 'bad length', 'no event'])
+    async def test_malformed_frame(self, events, frame):
+        async with ReplayServer(events) as server:
+            name, world, _ = server._events[2]
+            server._events[2] = (name, world, frame)
+            async with UniversalisWebSocket(server.url, retry_policy=None) as ws:
+                sub = await ws.subscribe('listings/add')
+                with pytest.raises(UniversalisError):
+                    await asyncio.wait_for(_take(sub, 10), 5)
+                assert isinstance(ws.error, UniversalisError)
+                assert sub.closed
+
+    @pytest.mark.asyncio
+    async def test_reconnect_after_malformed_frame(self, events):
+        async with ReplayServer(events) as server:
+            name, world, _ = server._events[2]
+            server._events[2] = (name, world, b'\x05\x00\x00')
+            async with UniversalisWebSocket(server.url,
+                                            retry_policy=FAST_POLICY) as ws:
+                sub = await ws.subscribe('listings/add')
+                received = await asyncio.wait_for(_take(sub, 4), 5)
+                assert [e.data for e in received] == events[:2] * 2
+                assert ws.connects == 2
+                assert ws.error is None
@@ -1,7 +1,9 @@
+import asyncio
 import random
 
 import aiohttp
 import pytest
+from aioresponses import CallbackResult
 
 from universalisapi.exceptions import UniversalisError
 from universalisapi._wrapper import UniversalisAPIWrapper
@@ -10,12 +12,55 @@ from universalisapi._wrapper import UniversalisAPIWrapper
 @pytest.mark.unittest
 class TestUniversalisAPIWrapper:
 
-    wrapper = UniversalisAPIWrapper()
+    wrapper = UniversalisAPIWrapper(requests_per_second=None)
 
     @pytest.mark.asyncio
     async def test_session(self):
         assert isinstance(self.wrapper.session, aiohttp.ClientSession)
 
+    @pytest.mark.asyncio
+    async def test_session_reused(self):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        session = wrapper.session
+        assert wrapper.session is session
+        await wrapper.close()
+        assert session.closed
+        assert wrapper.session is not session
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_session_pool_options(self):
+        wrapper = UniversalisAPIWrapper(connection_limit=7, connection_limit_per_host=3)
+        connector = wrapper.session.connector
+        assert connector.limit == 7
+        assert connector.limit_per_host == 3
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_context_manager(self, mocked_response):
+        url = f'{UniversalisAPIWrapper.base_url}/data-centers'
+        mocked_response.head(url, status=200)
+        mocked_response.head(url, status=200)
+        async with UniversalisAPIWrapper(warm_up_connections=2) as wrapper:
+            session = wrapper.session
+            assert not session.closed
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_external_session_not_closed(self):
+        async with aiohttp.ClientSession() as external:
+            async with UniversalisAPIWrapper(session=external) as wrapper:
+                assert wrapper.session is external
+            assert not external.closed
+
+    @pytest.mark.asyncio
+    async def test_get_endpoint_keeps_session_open(self, mocked_worlds, worlds):
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        resp = await wrapper.get_endpoint('/worlds')
+        assert resp == worlds
+        assert not wrapper.session.closed
+        await wrapper.close()
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("code", [random.randint(201,500) for _ in range(10)])
     async def test__process_response_failures(self, code, mocked_response):
@@ -52,16 +97,45 @@ class TestUniversalisAPIWrapper:
         resp = await self.wrapper._get_mb_current_data(item_ids, region)
         assert resp == data
 
+    @pytest.mark.parametrize("n,sizes", [(0, []),
+                                         (1, [1]),
+                                         (100, [100]),
+                                         (101, [51, 50]),
+                                         (250, [84, 83, 83]),
+                                         (3000, [100] * 30)])
+    def test__chunk_item_ids(self, n, sizes):
+        item_ids = list(range(n))
+        chunks = self.wrapper._chunk_item_ids(item_ids + item_ids[:10])
+        assert list(map(len, chunks)) == sizes
+        assert [i for chunk in chunks for i in chunk] == item_ids
+
     @pytest.mark.asyncio
     async def test__get_mb_current_data_too_many_items(self, mocked_mb_current_data):
-        data = {'success': True}
-        item_ids = list(range(200))
+        item_ids = list(range(1, 201))
         region = 'coeurl'
-        req_item_ids = list(range(100))
-        mocked_mb_current_data(region, ','.join(map(str, req_item_ids)), {}, data)
-        resp_data = await self.wrapper._get_mb_current_data(item_ids, region)
-
-        assert resp_data == data
+        for chunk in (item_ids[:100], item_ids[100:]):
+            data = {
+                'itemIDs': chunk,
+                'items': {str(i): {'itemID': i} for i in chunk[1:]},
+                'worldID': 408,
+                'worldName': 'Coeurl',
+                'unresolvedItems': chunk[:1]
+            }
+            mocked_mb_current_data(region, ','.join(map(str, chunk)), {}, data)
+        resp_data = await self.wrapper._get_mb_current_data(item_ids + [5, 6], region)
+
+        assert resp_data['itemIDs'] == item_ids
+        assert resp_data['worldName'] == 'Coeurl'
+        assert resp_data['unresolvedItems'] == [1, 101]
+        assert set(resp_data['items']) == {str(i) for i in item_ids} - {'1', '101'}
+
+    def test__merge_mb_data_single_item_chunk(self, mb_data_data):
+        single = mb_data_data['dcName_crystal_42884']
+        multi = mb_data_data['dcName_crystal_42884,2']
+        merged = self.wrapper._merge_mb_data([[42884], [42884, 2]], [single, multi])
+        assert merged['dcName'] == 'Crystal'
+        assert set(merged['items']) == set(multi['items'])
+        assert merged['itemIDs'] == [42884, 42884, 2]
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize("l,e,hq,s_w,e_w,f",
@@ -95,3 +169,82 @@ class TestUniversalisAPIWrapper:
             stats_within=s_w, entries_within=e_w, fields=f)
 
         assert data == resp_data
+
+
+@pytest.mark.unittest
+class TestSingleFlight:
+
+    @staticmethod
+    def _gated_mock(mocked_response, url, payload, gate, calls):
+        async def _callback(url, **kwargs):
+            calls.append(url)
+            await gate.wait()
+            return CallbackResult(payload=payload)
+        mocked_response.get(url, callback=_callback, repeat=True)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_coalesced(self, mocked_response, base_url,
+                                                 worlds):
+        gate, calls = asyncio.Event(), []
+        self._gated_mock(mocked_response, f'{base_url}/worlds', worlds, gate, calls)
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        tasks = [asyncio.ensure_future(wrapper.get_endpoint('/worlds'))
+                 for _ in range(10)]
+        await asyncio.sleep(0.01)
+        gate.set()
+        results = await asyncio.gather(*tasks)
+        assert len(calls) == 1
+        assert all(r == worlds for r in results)
+        # every caller gets its own copy
+        assert len({id(r) for r in results}) == 10
+        assert not wrapper._in_flight
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_response_shapes_not_coalesced(self, mocked_response, base_url):
+        gate, calls = asyncio.Event(), []
+        single, multi = {'itemID': 5}, {'items': {'5': {'itemID': 5}}}
+        self._gated_mock(mocked_response, f'{base_url}/crystal/5', single, gate,
+                         calls)
+        self._gated_mock(mocked_response, f'{base_url}/crystal/5,5', multi, gate,
+                         calls)
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        tasks = [asyncio.ensure_future(wrapper.get_endpoint(endpoint))
+                 for endpoint in ('/crystal/5', '/crystal/5,5')]
+        await asyncio.sleep(0.01)
+        gate.set()
+        assert await asyncio.gather(*tasks) == [single, multi]
+        assert len(calls) == 2
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter(self, mocked_response, base_url, worlds):
+        gate, calls = asyncio.Event(), []
+        self._gated_mock(mocked_response, f'{base_url}/worlds', worlds, gate, calls)
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        first = asyncio.ensure_future(wrapper.get_endpoint('/worlds'))
+        second = asyncio.ensure_future(wrapper.get_endpoint('/worlds'))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        assert await second == worlds
+        assert first.cancelled()
+        assert len(calls) == 1
+        await wrapper.close()
+
+    @pytest.mark.asyncio
+    async def test_all_waiters_cancelled(self, mocked_response, base_url, worlds):
+        gate, calls = asyncio.Event(), []
+        self._gated_mock(mocked_response, f'{base_url}/worlds', worlds, gate, calls)
+        wrapper = UniversalisAPIWrapper(requests_per_second=None)
+        task = asyncio.ensure_future(wrapper.get_endpoint('/worlds'))
+        await asyncio.sleep(0.01)
+        in_flight = wrapper._in_flight['/worlds']
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        with pytest.raises(asyncio.CancelledError):
+            await in_flight.task
+        assert not wrapper._in_flight
+        await wrapper.close()